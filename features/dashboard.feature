@@ -0,0 +1,15 @@
+Feature: Dashboard
+  As a logged-in user
+  I want to land on my dashboard
+  So that I can start working right away
+
+  @smoke @login
+  Scenario: Open the dashboard with a cached login
+    Given I am logged in as "testuser@example.com" with password "Test@123"
+    Then I should see the dashboard
+    And I should see "Dashboard"
+
+  @login @no_auth_cache
+  Scenario: Open the dashboard after logging in through the form
+    Given I am logged in as "admin@example.com" with password "Admin@123"
+    Then I should see the dashboard
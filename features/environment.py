@@ -3,96 +3,491 @@ Behave Environment Configuration
 Setup and teardown for tests
 """
 import os
-from playwright.sync_api import sync_playwright
+import sys
+import copy
+import json
+from behave.model import ScenarioOutline, Tag
+from playwright.sync_api import sync_playwright, Error as PlaywrightError
 from pathlib import Path
+sys.path.append('.')
+from utils.tracing_policy import TracingPolicy
+from utils.instrumentation import timeline
+from utils.context_factory import (
+    default_context_options, open_browser_context, close_browser_context, context_setup
+)
+from utils.context_pool import ContextPool
+from utils.network_mode import NetworkMode
+from utils.resource_blocking import ResourceBlocker, format_summary
+from utils.local_app import LocalApp
+from utils.visual_regression import VisualRegression
+from utils.artifacts import ArtifactPipeline
+from utils.auth_cache import AuthStateCache
+from utils.retry_controller import RetryController
+from utils.page_metrics import PerformanceRecorder, series_key
+from utils.reporting import report_formatters
 
+
+class BrowserSession:
+    """
+    Owns the Playwright driver and one browser process.
+
+    In reuse mode a single session lives for the whole run and every
+    scenario only gets a fresh BrowserContext. In strict isolation mode a
+    session is created and torn down around each scenario.
+    """
+
+    def __init__(self, browser_name: str, headless: bool, slow_mo: int):
+        self.browser_name = browser_name
+        self.headless = headless
+        self.slow_mo = slow_mo
+        self.playwright = None
+        self.browser = None
+        self.launch_count = 0
+
+    def _launch(self):
+        """Launch the configured browser type"""
+        if self.browser_name == 'firefox':
+            browser_type = self.playwright.firefox
+        elif self.browser_name == 'webkit':
+            browser_type = self.playwright.webkit
+        else:
+            browser_type = self.playwright.chromium
+
+        with timeline.span(f"{self.browser_name}.launch", 'browser'):
+            self.browser = browser_type.launch(
+                headless=self.headless,
+                slow_mo=self.slow_mo
+            )
+        self.launch_count += 1
+        return self.browser
+
+    def ensure_browser(self):
+        """Return a connected browser, (re)launching only when needed"""
+        if self.playwright is None:
+            self.playwright = sync_playwright().start()
+
+        if self.browser is not None and self.browser.is_connected():
+            return self.browser
+
+        if self.browser is not None:
+            print(f"⚠️  Browser '{self.browser_name}' disconnected, relaunching")
+        return self._launch()
+
+    def new_context(self, **options):
+        """Create a BrowserContext, relaunching once if the browser died"""
+        browser = self.ensure_browser()
+        try:
+            return browser.new_context(**options)
+        except PlaywrightError:
+            if browser.is_connected():
+                raise
+            return self.ensure_browser().new_context(**options)
+
+    def close(self):
+        """Close the browser and stop Playwright"""
+        if self.browser is not None:
+            try:
+                self.browser.close()
+            except PlaywrightError:
+                pass
+            self.browser = None
+        if self.playwright is not None:
+            self.playwright.stop()
+            self.playwright = None
+
+
+def _create_session() -> BrowserSession:
+    """Build a browser session from environment configuration"""
+    return BrowserSession(
+        browser_name=os.getenv('BROWSER', 'chromium'),
+        headless=os.getenv('HEADLESS', 'false').lower() == 'true',
+        slow_mo=int(os.getenv('SLOW_MO', '0'))
+    )
+
+
+def _parse_locales(value: str) -> list:
+    """Parse a comma separated LOCALES value"""
+    return [locale.strip() for locale in value.split(',') if locale.strip()]
+
+
+def _has_locale_column(scenario) -> bool:
+    """True for outlines whose Examples already pin a locale per row"""
+    return isinstance(scenario, ScenarioOutline) and all(
+        examples.table is not None and 'locale' in examples.table.headings
+        for examples in scenario.examples
+    )
+
+
+def _load_locale_assignment() -> dict:
+    """
+    `file:line` -> locales this process runs, written by parallel_runner when
+    it splits (scenario, locale) pairs across workers. Empty outside workers.
+    """
+    path = os.getenv('LOCALE_ASSIGNMENT')
+    if not path:
+        return {}
+    return json.loads(Path(path).read_text(encoding='utf-8'))
+
+
+def _location(scenario) -> str:
+    return f"{Path(scenario.filename).as_posix()}:{scenario.line}"
+
+
+def _fan_out_scenarios(feature, locales: list, assignment: dict = None):
+    """
+    Replace every @i18n scenario with one copy per locale.
+    Each copy is renamed "<name> [<locale>]" so it is reported as its own
+    test case, and tagged @locale:<locale> for before_scenario to pick up.
+    Outlines with a `locale` column are left alone; their rows are filtered
+    against LOCALES instead.
+    With an assignment, a scenario (or outline row) listed in it only gets
+    copies for its assigned locales; the other pairs run in other workers.
+    """
+    assignment = assignment or {}
+    expanded = []
+    for scenario in feature.scenarios:
+        if 'i18n' not in scenario.effective_tags or _has_locale_column(scenario):
+            expanded.append(scenario)
+            continue
+
+        for locale in locales:
+            if locale not in assignment.get(_location(scenario), locales):
+                continue
+            memo = {id(feature): feature, id(feature.background): feature.background}
+            # Tags are immutable but deepcopy cannot rebuild them (Tag() needs a line)
+            for tag in list(scenario.tags) + [tag for examples in getattr(scenario, 'examples', [])
+                                              for tag in examples.tags]:
+                memo[id(tag)] = tag
+            clone = copy.deepcopy(scenario, memo=memo)
+            clone.name = f"{scenario.name} [{locale}]"
+            clone.tags = list(scenario.tags) + [Tag(f'locale:{locale}', scenario.line)]
+            if isinstance(clone, ScenarioOutline):
+                clone._scenarios = []  # regenerate rows with the new name/tags
+                if assignment:
+                    clone._scenarios = [row for row in clone.scenarios
+                                        if locale in assignment.get(_location(row), locales)]
+                    if not clone._scenarios:
+                        continue
+            expanded.append(clone)
+    feature.scenarios = expanded
+
+
+def _scenario_locale(scenario) -> str:
+    """Locale for a scenario: fan-out tag, then LOCALE, then en-US"""
+    for tag in scenario.effective_tags:
+        if tag.startswith('locale:'):
+            return tag.split(':', 1)[1]
+    return os.getenv('LOCALE', 'en-US')
+
+
+def _prewarm_contexts(context, feature):
+    """
+    Create one idle context per locale the feature's outlines and fan-out
+    copies will ask for, so each row finds its context already in the pool.
+    """
+    wanted = {}
+    for scenario in feature.scenarios:
+        locales = []
+        if _has_locale_column(scenario):
+            locales = [row.get('locale') for examples in scenario.examples for row in examples.table]
+            if context.fan_out_locales:
+                locales = [locale for locale in locales if locale in context.fan_out_locales]
+        elif any(tag.startswith('locale:') for tag in scenario.tags):
+            locales = [_scenario_locale(scenario)]
+        categories = frozenset(context.resource_blocker.categories_for(scenario.effective_tags))
+        for locale in locales:
+            wanted.setdefault((locale, categories), None)
+
+    session = context.browser_session
+    for locale, categories in wanted:
+        context.context_pool.prewarm(
+            session, [default_context_options(locale)],
+            context_setup(context, categories), extra=categories
+        )
+
+
+@timeline.timed('before_all')
 def before_all(context):
     """Runs once before all tests"""
     print("🚀 Starting test suite...")
-    
+
     # Create directories
-    Path("screenshots").mkdir(exist_ok=True)
     Path("reports").mkdir(exist_ok=True)
-    Path("traces").mkdir(exist_ok=True)
-    
+
     # Load environment variables
     from dotenv import load_dotenv
     load_dotenv()
 
+    # HTML report and streamed results next to the console output (REPORTS=false
+    # keeps ad-hoc runs from overwriting them); added here so REPORT_SUFFIX from .env applies
+    context.results_formatter = None
+    if os.getenv('REPORTS', 'true').lower() == 'true':
+        formatters = report_formatters(context.config)
+        context._runner.formatters.extend(formatters)
+        context.results_formatter = formatters[-1]
+
+    # LOCAL_APP=true serves the bundled stand-in app and points BASE_URL at it
+    context.local_app = None
+    if os.getenv('LOCAL_APP', 'false').lower() == 'true':
+        context.local_app = LocalApp(port=int(os.getenv('LOCAL_APP_PORT', '0'))).start()
+        os.environ['BASE_URL'] = context.local_app.url
+        print(f"🌐 Local app running at {context.local_app.url}")
+
+    # INSTRUMENT=true records hook/step/Playwright call timings
+    if os.getenv('INSTRUMENT', 'false').lower() == 'true':
+        timeline.enable()
+        print("⏱️  Instrumentation enabled")
+
+    # BROWSER_REUSE=false restores strict per-scenario browser isolation
+    context.browser_reuse = os.getenv('BROWSER_REUSE', 'true').lower() == 'true'
+    context.browser_session = _create_session() if context.browser_reuse else None
+    if context.browser_reuse:
+        print("♻️  Browser reuse enabled (one browser, fresh context per scenario)")
+
+    # LOCALES=en-US,de-DE,... runs each @i18n scenario once per locale
+    context.fan_out_locales = _parse_locales(os.getenv('LOCALES', ''))
+    if context.fan_out_locales:
+        print(f"🌍 Locale fan-out: {', '.join(context.fan_out_locales)}")
+    context.locale_assignment = _load_locale_assignment()
+
+    # TRACE_MODE decides which scenarios are traced and which traces are kept
+    context.tracing_policy = TracingPolicy.from_env()
+    print(f"📊 Tracing mode: {context.tracing_policy.mode}")
+
+    # NETWORK_MODE=record|replay captures or serves traffic from HAR archives
+    context.network_mode = NetworkMode.from_env()
+    if context.network_mode.mode != 'live':
+        print(f"🌐 Network mode: {context.network_mode.mode} ({context.network_mode.har_dir})")
+    # Parallel workers share one record run; the runner clears and merges its parts
+    if not os.getenv('WORKER_ID'):
+        context.network_mode.clear_parts()
+
+    # BLOCK_PROFILE=minimal|no-media|full skips assets assertions never need
+    context.resource_blocker = ResourceBlocker.from_env()
+
+    # AUTH_CACHE=true reuses logged-in storage states across scenarios
+    context.auth_cache = AuthStateCache.from_env()
+
+    # Failure screenshots, traces, console logs and HTML are written in the background
+    context.artifacts = ArtifactPipeline.from_env()
+
+    # RETRIES=N re-runs failed scenarios in-process; flaky ones are tracked and quarantined
+    context.retry_controller = RetryController.from_env()
+    if context.retry_controller.max_retries:
+        print(f"🔁 Retrying failed scenarios up to {context.retry_controller.max_retries} times "
+              f"(quarantine: {context.retry_controller.quarantine_mode})")
+
+    # Navigation timing, paint/LCP and CDP metrics per scenario, locale and viewport
+    # (@performance scenarios only, unless PERF_METRICS=true)
+    context.perf_recorder = PerformanceRecorder.from_env()
+
+    # Visual baselines per browser, locale and viewport (VISUAL_UPDATE=true to create/refresh,
+    # VISUAL_STRICT=true to fail screenshots without one)
+    context.visual_regression = VisualRegression.from_env()
+
+    # CONTEXT_POOL=true reuses reset contexts keyed by their options (opt-in:
+    # the reset is partial; needs browser reuse; HAR recording opts out)
+    context.context_pool = None
+    if (context.browser_reuse and context.network_mode.mode != 'record'
+            and os.getenv('CONTEXT_POOL', 'false').lower() == 'true'):
+        context.context_pool = ContextPool.from_env()
+        print(f"🏊 Context pool enabled (max {context.context_pool.max_size} idle contexts)")
+
+@timeline.timed('before_feature')
+def before_feature(context, feature):
+    """Runs before each feature"""
+    if context.fan_out_locales:
+        _fan_out_scenarios(feature, context.fan_out_locales, context.locale_assignment)
+
+    if context.context_pool is not None:
+        _prewarm_contexts(context, feature)
+
+    context.retry_controller.patch(feature.scenarios)
+
+@timeline.timed('before_scenario')
 def before_scenario(context, scenario):
     """Runs before each scenario"""
-    # Get configuration from environment
-    browser_name = os.getenv('BROWSER', 'chromium')
-    headless = os.getenv('HEADLESS', 'false').lower() == 'true'
-    slow_mo = int(os.getenv('SLOW_MO', '0'))
-    
-    # Start Playwright
-    context.playwright = sync_playwright().start()
-    
-    # Launch browser
-    if browser_name == 'firefox':
-        context.browser = context.playwright.firefox.launch(
-            headless=headless,
-            slow_mo=slow_mo
-        )
-    elif browser_name == 'webkit':
-        context.browser = context.playwright.webkit.launch(
-            headless=headless,
-            slow_mo=slow_mo
-        )
-    else:
-        context.browser = context.playwright.chromium.launch(
-            headless=headless,
-            slow_mo=slow_mo
-        )
-    
-    # Get locale from environment or use default
-    locale = os.getenv('LOCALE', 'en-US')
-    timezone = os.getenv('TIMEZONE', 'America/New_York')
-    
-    # Create context with locale and timezone
-    context.browser_context = context.browser.new_context(
-        locale=locale,
-        timezone_id=timezone,
-        viewport={'width': 1920, 'height': 1080}
-    )
-    
-    # Start tracing
-    context.browser_context.tracing.start(screenshots=True, snapshots=True)
-    
-    # Create page
-    context.page = context.browser_context.new_page()
-    
+    # Outline rows pinned to a locale outside LOCALES are not part of this run
+    row = getattr(scenario, '_row', None)
+    if context.fan_out_locales and row is not None and 'locale' in row.headings:
+        if row.get('locale') not in context.fan_out_locales:
+            scenario.skip(f"locale {row.get('locale')} not in LOCALES")
+            return
+
+    # Quarantined scenarios run in their own non-blocking job (QUARANTINE_MODE=only)
+    quarantine = context.retry_controller.quarantine_reason(scenario)
+    if quarantine:
+        scenario.skip(quarantine)
+        return
+
+    # Reuse the run-wide browser session, or start a private one
+    session = context.browser_session or _create_session()
+    context.scenario_session = session
+
+    # Get locale from fan-out tag, environment or default
+    locale = _scenario_locale(scenario)
+
     # Store scenario info
     context.scenario_name = scenario.name
     context.current_locale = locale
-    
+
+    # Retry attempt (0 on the first run) set by the retry controller
+    context.retry_attempt = getattr(scenario, 'retry_attempt', 0)
+
+    # Decide tracing (only for scenarios selected by the tracing policy)
+    context.trace_active = context.tracing_policy.should_trace(
+        f"{scenario.filename}:{scenario.name}",
+        context.retry_attempt
+    )
+
+    # Resource blocking profile plus @block:/@allow: tags
+    context.block_categories = context.resource_blocker.categories_for(scenario.effective_tags)
+
+    # Page metrics for @performance scenarios (every scenario with PERF_METRICS=true)
+    context.perf_active = context.perf_recorder.collects(scenario.effective_tags)
+
+    # Create context with locale, timezone and viewport, then the page
+    open_browser_context(context, default_context_options(locale))
+    context.playwright = session.playwright
+    context.browser = session.browser
+
     print(f"✓ Started scenario: {scenario.name} (Locale: {locale})")
 
+def before_step(context, step):
+    """Runs before each step"""
+    timeline.begin(step)
+
+def after_step(context, step):
+    """Runs after each step"""
+    timeline.end(
+        step, f"{step.keyword} {step.name}", 'step',
+        scenario=context.scenario_name,
+        status=getattr(step.status, 'name', str(step.status))
+    )
+
+@timeline.timed('after_scenario')
 def after_scenario(context, scenario):
     """Runs after each scenario"""
-    # Take screenshot on failure
-    if scenario.status == "failed":
-        screenshot_path = f"screenshots/{scenario.name.replace(' ', '_')}.png"
-        context.page.screenshot(path=screenshot_path)
-        print(f"📸 Screenshot saved: {screenshot_path}")
-        
-        # Save trace
-        trace_path = f"traces/{scenario.name.replace(' ', '_')}.zip"
-        context.browser_context.tracing.stop(path=trace_path)
-        print(f"📊 Trace saved: {trace_path}")
-    else:
-        context.browser_context.tracing.stop()
-    
-    # Clean up
-    context.page.close()
-    context.browser_context.close()
-    context.browser.close()
-    context.playwright.stop()
-    
+    try:
+        _finish_scenario(context, scenario)
+    finally:
+        # Stream the result now rather than when the next scenario starts
+        if context.results_formatter is not None:
+            context.results_formatter.scenario_finished(scenario, hook_failed=sys.exc_info()[1] is not None)
+
+def _finish_scenario(context, scenario):
+    """Failure artifacts, metrics and traces of a scenario, then its context"""
+    if not hasattr(context, 'page'):
+        return
+
+    failed = scenario.status == "failed"
+    case = context.artifacts.test_case(
+        scenario, context.current_locale, getattr(context, 'retry_attempt', 0)
+    )
+
+    # Capture failure evidence here; compressing and writing happens in the background
+    if failed:
+        try:
+            context.artifacts.submit(case, 'screenshot', context.page.screenshot())
+            context.artifacts.submit(case, 'html', context.page.content().encode('utf-8'))
+        except PlaywrightError as e:
+            print(f"⚠️  Failure capture incomplete: {e}")
+        context.artifacts.submit(case, 'console', '\n'.join(context.console_log).encode('utf-8'))
+        print(f"📸 Failure artifacts queued: {case['dir']}")
+
+    # Final page metrics of passing scenarios feed the performance history
+    if not failed and context.page_metrics is not None and context.page.url != 'about:blank':
+        try:
+            context.perf_recorder.record(
+                series_key(scenario.name, context.current_locale, context.page.viewport_size),
+                context.page_metrics.collect()
+            )
+        except PlaywrightError as e:
+            print(f"⚠️  Page metrics unavailable: {e}")
+
+    # Keep the trace if the tracing policy says so
+    trace_path = context.tracing_policy.stop(
+        context.browser_context, failed, str(context.artifacts.staging_path(case, 'trace'))
+    )
+    if trace_path:
+        context.artifacts.submit(case, 'trace', source=Path(trace_path))
+        print(f"📊 Trace queued: {case['dir']}")
+
+    # Clean up (the browser itself survives in reuse mode)
+    try:
+        close_browser_context(context)
+    except PlaywrightError as e:
+        print(f"⚠️  Context cleanup failed: {e}")
+
+    if not context.browser_reuse:
+        context.scenario_session.close()
+
     status_icon = "✅" if scenario.status == "passed" else "❌"
     print(f"{status_icon} Finished scenario: {scenario.name} - {scenario.status}")
 
+@timeline.timed('after_all')
 def after_all(context):
     """Runs once after all tests"""
+    if context.context_pool is not None:
+        stats = context.context_pool.stats()
+        print(f"🏊 Context pool: {stats['hits']} reused, {stats['misses']} created, "
+              f"{stats['evictions']} evicted")
+        context.context_pool.close_all()
+
+    if not os.getenv('WORKER_ID'):
+        for har_path in context.network_mode.finalize():
+            print(f"🌐 HAR archive saved: {har_path}")
+
+    worker_id = os.getenv('WORKER_ID')
+    blocking_report = context.resource_blocker.write_summary(
+        Path(f"reports/blocking{f'-worker-{worker_id}' if worker_id else ''}.json")
+    )
+    if blocking_report:
+        print(f"🚫 {format_summary(context.resource_blocker.summary())}")
+
+    if context.browser_session is not None:
+        print(f"♻️  Browser launches this run: {context.browser_session.launch_count}")
+        context.browser_session.close()
+
+    if context.local_app is not None:
+        context.local_app.stop()
+
+    junit_dir = Path(context.config.junit_directory) if context.config.junit else None
+    outcomes = context.retry_controller.finish(junit_dir)
+    for name in outcomes['flaky']:
+        print(f"⚠️  Flaky (passed on retry): {name}")
+    if outcomes['flaky'] or outcomes['failed']:
+        print(f"🔁 Outcomes: {len(outcomes['passed'])} passed, {len(outcomes['flaky'])} flaky, "
+              f"{len(outcomes['failed'])} failed")
+
+    artifacts = context.artifacts.close()
+    if artifacts['testcases']:
+        print(f"📦 Artifacts: {artifacts['stored_bytes'] / 1024:.0f} KB stored, "
+              f"{artifacts['deduplicated']} deduplicated, {artifacts['dropped']} over budget "
+              f"(index: {context.artifacts.index_path})")
+
+    visual = context.visual_regression.finish(
+        Path(f"reports/visual/visual_regression{f'-worker-{worker_id}' if worker_id else ''}.json")
+    )
+    if visual['compared']:
+        for name in visual['failed']:
+            print(f"❌ Visual mismatch: {name} ({visual['results'][name]['reason']})")
+        print(f"🖼️  Visual comparisons: {visual['compared']}, mismatches: {len(visual['failed'])}, "
+              f"without baseline: {len(visual['missing'])}")
+
+    perf = context.perf_recorder.finish(
+        Path(f"reports/perf/page_metrics{f'-worker-{worker_id}' if worker_id else ''}.json")
+    )
+    if perf['samples']:
+        print(f"🚀 Page metrics: {perf['samples']} samples saved ({perf['report']})")
+
+    if timeline.enabled:
+        paths = timeline.write('reports', f"-worker-{worker_id}" if worker_id else '')
+        print(timeline.summary())
+        print(f"⏱️  Timeline saved: {', '.join(str(p) for p in paths)}")
     print("🎉 Test suite completed!")
+
+    # Deferred comparisons finish after their steps passed: a hook error makes
+    # behave exit non-zero, so mismatches still fail the run
+    if context.visual_regression.deferred and visual['failed']:
+        raise AssertionError(f"{len(visual['failed'])} deferred visual mismatches: {', '.join(visual['failed'])}")
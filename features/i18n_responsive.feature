@@ -1,4 +1,4 @@
-@i18n @responsive
+@i18n @responsive @allow:fonts
 Feature: Responsive i18n Testing
   Test translations across different viewport sizes
 
@@ -9,6 +9,7 @@ Feature: Responsive i18n Testing
     Then text does not overflow containers
     And all translation keys are loaded
     And navigation text should be in <locale>
+    And the page should match the visual baseline ignoring ".date"
 
     Examples:
       | locale  | width | height |
@@ -18,3 +19,18 @@ Feature: Responsive i18n Testing
       | de-DE   | 768   | 1024   |
       | en-US   | 375   | 667    |
       | de-DE   | 375   | 667    |
+
+  @performance
+  Scenario Outline: Responsive page stays within the performance budget
+    Given locale is "<locale>"
+    And I set viewport to <width>x<height>
+    When I visit the homepage
+    Then the page should load within the load budget
+    And layout count should be within the layout budget
+
+    Examples:
+      | locale  | width | height |
+      | en-US   | 1920  | 1080   |
+      | de-DE   | 1920  | 1080   |
+      | en-US   | 375   | 667    |
+      | de-DE   | 375   | 667    |
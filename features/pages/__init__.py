@@ -1,4 +1,20 @@
 from .base_page import BasePage
 from .login_page import LoginPage
+from .todomvc_page import TodoMvcPage
+from .wait_strategies import (
+    WaitStrategy,
+    NoWait,
+    LoadStateWait,
+    SelectorWait,
+    DomConditionWait,
+    AppReadyWait,
+    ResponseWait,
+    NavigationCommitWait,
+    bounded_wait,
+)
 
-__all__ = ['BasePage', 'LoginPage']
+__all__ = [
+    'BasePage', 'LoginPage', 'TodoMvcPage',
+    'WaitStrategy', 'NoWait', 'LoadStateWait', 'SelectorWait', 'DomConditionWait',
+    'AppReadyWait', 'ResponseWait', 'NavigationCommitWait', 'bounded_wait',
+]
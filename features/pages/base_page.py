@@ -2,20 +2,72 @@
 Base Page Object
 Common functionality for all page objects
 """
+from typing import Callable, Dict, List, Optional, Sequence
 from playwright.sync_api import Page, expect
+from .wait_strategies import WaitStrategy, LoadStateWait
+
+# Reads requested fields of each element in one browser call
+_READ_ELEMENTS_JS = """
+(elements, { fields, attributes }) => elements.map((el) => {
+    const record = {};
+    if (fields.includes('text')) record.text = el.textContent;
+    if (fields.includes('classes')) record.classes = Array.from(el.classList);
+    if (fields.includes('visible')) {
+        const rect = el.getBoundingClientRect();
+        record.visible = rect.width > 0 && rect.height > 0
+            && getComputedStyle(el).visibility !== 'hidden';
+    }
+    if (fields.includes('value')) record.value = 'value' in el ? el.value : null;
+    if (attributes.length) {
+        record.attributes = Object.fromEntries(attributes.map((name) => [name, el.getAttribute(name)]));
+    }
+    return record;
+})
+"""
+
+# Same reads for several CSS selectors at once
+_SNAPSHOT_JS = """
+({ queries, fields, attributes }) => {
+    const read = %s;
+    const result = {};
+    for (const [name, selector] of Object.entries(queries)) {
+        result[name] = read(Array.from(document.querySelectorAll(selector)), { fields, attributes });
+    }
+    return result;
+}
+""" % _READ_ELEMENTS_JS.strip()
+
+DEFAULT_FIELDS = ('text', 'classes', 'visible')
 
 class BasePage:
+    # Readiness condition after navigation; page objects override this
+    READY: WaitStrategy = LoadStateWait('load')
+
     def __init__(self, page: Page):
         self.page = page
+        self.last_wait_ms = 0.0
     
     def navigate(self, url: str):
-        """Navigate to URL"""
-        self.page.goto(url)
+        """Navigate to URL and wait until the page is ready"""
+        self.page.goto(url, wait_until='commit')
+        self.wait_until_ready()
     
-    def wait_for_load(self, state: str = "networkidle"):
+    def wait_for_load(self, state: str = "load"):
         """Wait for page to load"""
         self.page.wait_for_load_state(state)
     
+    def wait_until_ready(self, strategy: Optional[WaitStrategy] = None,
+                         timeout: Optional[float] = None) -> float:
+        """Block until the page's readiness condition holds; returns ms blocked"""
+        self.last_wait_ms = (strategy or self.READY).perform(self.page, timeout=timeout)
+        return self.last_wait_ms
+    
+    def perform(self, action: Callable, strategy: WaitStrategy,
+                timeout: Optional[float] = None) -> float:
+        """Run an action and wait for its outcome; returns ms blocked after the action"""
+        self.last_wait_ms = strategy.perform(self.page, action, timeout=timeout)
+        return self.last_wait_ms
+    
     def click(self, selector: str):
         """Click element"""
         self.page.click(selector)
@@ -43,3 +95,38 @@ class BasePage:
     def screenshot(self, path: str):
         """Take screenshot"""
         self.page.screenshot(path=path)
+    
+    def read_all(self, selector: str, fields: Sequence[str] = DEFAULT_FIELDS,
+                 attributes: Sequence[str] = ()) -> List[Dict]:
+        """Read fields (text, classes, visible, value) and attributes of every match in one call"""
+        return self.page.locator(selector).evaluate_all(
+            _READ_ELEMENTS_JS, {'fields': list(fields), 'attributes': list(attributes)}
+        )
+    
+    def get_texts(self, selector: str) -> List[str]:
+        """Text content of every match"""
+        return [r['text'] for r in self.read_all(selector, fields=('text',))]
+    
+    def get_attributes(self, selector: str, attribute: str) -> List[Optional[str]]:
+        """One attribute of every match"""
+        return [r['attributes'][attribute] for r in self.read_all(selector, fields=(), attributes=(attribute,))]
+    
+    def get_classes(self, selector: str) -> List[List[str]]:
+        """Class list of every match"""
+        return [r['classes'] for r in self.read_all(selector, fields=('classes',))]
+    
+    def get_visibility(self, selector: str) -> List[bool]:
+        """Visibility of every match"""
+        return [r['visible'] for r in self.read_all(selector, fields=('visible',))]
+    
+    def snapshot(self, queries: Dict[str, str], fields: Sequence[str] = DEFAULT_FIELDS,
+                 attributes: Sequence[str] = ()) -> Dict[str, List[Dict]]:
+        """
+        Read several CSS selectors in a single browser call, e.g.
+        snapshot({'items': '.todo-list li', 'count': '.todo-count strong'})
+        """
+        return self.page.evaluate(_SNAPSHOT_JS, {
+            'queries': queries,
+            'fields': list(fields),
+            'attributes': list(attributes),
+        })
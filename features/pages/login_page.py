@@ -1,7 +1,9 @@
 """
 Login Page Object
 """
+from typing import Dict, Optional
 from .base_page import BasePage
+from .wait_strategies import DomConditionWait, SelectorWait
 from playwright.sync_api import expect
 
 class LoginPage(BasePage):
@@ -11,16 +13,32 @@ class LoginPage(BasePage):
     LOGIN_BUTTON = "button[type='submit']"
     ERROR_MESSAGE = ".error-message"
     TITLE = "h1"
+    DASHBOARD_URL = "/dashboard"
     FORGOT_PASSWORD = "a.forgot-password"
     
-    def __init__(self, page):
+    # Ready once the form is usable
+    READY = SelectorWait(USERNAME_INPUT)
+    # A submit has settled when we left /login or an error is shown
+    # (wait_for_function is re-evaluated across the navigation)
+    SUBMITTED = DomConditionWait(
+        "() => !location.pathname.endsWith('/login') || !!document.querySelector('.error-message')"
+    )
+    
+    # Post-login marker: the dashboard is shown and the login form is gone
+    LOGGED_IN_JS = "() => location.pathname.endsWith('/dashboard') && !document.querySelector('#username')"
+    
+    def __init__(self, page, base_url: str = 'http://localhost:3000'):
         super().__init__(page)
+        self.base_url = base_url.rstrip('/')
         self.url = "/login"
     
     def navigate_to_login(self):
         """Navigate to login page"""
-        base_url = self.page.context.browser.contexts[0]._impl_obj._options.get('baseURL', 'http://localhost:3000')
-        self.navigate(f"{base_url}{self.url}")
+        self.navigate(f"{self.base_url}{self.url}")
+    
+    def open_dashboard(self):
+        """Open the dashboard; a rejected session ends up on the login page"""
+        self.page.goto(f"{self.base_url}{self.DASHBOARD_URL}", wait_until='load')
     
     def enter_username(self, username: str):
         """Enter username"""
@@ -31,9 +49,8 @@ class LoginPage(BasePage):
         self.fill(self.PASSWORD_INPUT, password)
     
     def click_login(self):
-        """Click login button"""
-        self.click(self.LOGIN_BUTTON)
-        self.wait_for_load()
+        """Click login button and wait for the outcome (dashboard or error)"""
+        self.perform(lambda: self.click(self.LOGIN_BUTTON), self.SUBMITTED)
     
     def login(self, username: str, password: str):
         """Complete login action"""
@@ -41,9 +58,18 @@ class LoginPage(BasePage):
         self.enter_password(password)
         self.click_login()
     
+    def get_error(self) -> Optional[Dict]:
+        """
+        Text and visibility of the error message in one call (None if there is none).
+        Read after click_login(), which already waited for the error or the redirect.
+        """
+        errors = self.read_all(self.ERROR_MESSAGE, fields=('text', 'visible'))
+        return errors[0] if errors else None
+    
     def get_error_message(self) -> str:
         """Get error message text"""
-        return self.get_text(self.ERROR_MESSAGE)
+        error = self.get_error()
+        return error['text'] if error else ''
     
     def get_title(self) -> str:
         """Get page title"""
@@ -51,7 +77,13 @@ class LoginPage(BasePage):
     
     def is_error_visible(self) -> bool:
         """Check if error message is visible"""
-        return self.is_visible(self.ERROR_MESSAGE)
+        error = self.get_error()
+        return bool(error and error['visible'])
+    
+    def is_logged_in(self) -> bool:
+        """Check the post-login marker once the current navigation has loaded"""
+        self.wait_for_load('load')
+        return self.page.evaluate(self.LOGGED_IN_JS)
     
     def verify_on_login_page(self):
         """Verify we're on login page"""
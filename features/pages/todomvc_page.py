@@ -0,0 +1,100 @@
+"""
+TodoMVC Page Object
+For https://demo.playwright.dev/todomvc/
+"""
+import json
+import uuid
+from typing import Iterable, List, Tuple
+from .base_page import BasePage
+from .wait_strategies import SelectorWait
+
+class TodoMvcPage(BasePage):
+    URL = "https://demo.playwright.dev/todomvc/"
+    # The React TodoMVC app persists its state under this localStorage key
+    STORAGE_KEY = "react-todos"
+
+    # Selectors
+    NEW_TODO = ".new-todo"
+    TODO_ITEMS = ".todo-list li"
+    TODO_COUNT = ".todo-count strong"
+
+    READY = SelectorWait(NEW_TODO)
+
+    def open(self):
+        """Navigate to TodoMVC"""
+        self.navigate(self.URL)
+
+    @staticmethod
+    def build_state(todos: Iterable[Tuple[str, bool]]) -> List[dict]:
+        """TodoMVC storage records for (title, completed) pairs"""
+        return [
+            {'id': str(uuid.uuid4()), 'title': title, 'completed': bool(completed)}
+            for title, completed in todos
+        ]
+
+    def seed(self, todos: Iterable[Tuple[str, bool]]):
+        """
+        Replace the whole todo list in one operation.
+        On the app already: write localStorage and reload once.
+        Before navigation: install an init script that seeds the first load.
+        """
+        records = self.build_state(todos)
+        state = json.dumps(records)
+
+        if self.page.url.startswith(self.URL):
+            self.page.evaluate(
+                "([key, state]) => localStorage.setItem(key, state)",
+                [self.STORAGE_KEY, state]
+            )
+            self.page.reload(wait_until='commit')
+        else:
+            # sessionStorage guard: seed the first load only, not later reloads
+            token = uuid.uuid4().hex
+            self.page.add_init_script(f"""
+                if (!sessionStorage.getItem('seeded-{token}')) {{
+                    localStorage.setItem({json.dumps(self.STORAGE_KEY)}, {json.dumps(state)});
+                    sessionStorage.setItem('seeded-{token}', '1');
+                }}
+            """)
+            self.open()
+
+        self.wait_until_rendered(len(records))
+
+    def wait_until_rendered(self, count: int, timeout: float = None):
+        """Wait until the list shows exactly `count` items"""
+        self.wait_until_ready()
+        self.page.wait_for_function(
+            "([selector, n]) => document.querySelectorAll(selector).length === n",
+            arg=[self.TODO_ITEMS, count],
+            timeout=timeout
+        )
+
+    def get_todo_texts(self) -> List[str]:
+        """Text of every visible todo item (one browser call)"""
+        return [text.strip() for text in self.get_texts(self.TODO_ITEMS)]
+
+    def get_active_count(self) -> int:
+        """The active counter alone, in one browser call; fails when it is not shown"""
+        counter = self.read_all(self.TODO_COUNT, fields=('text',))
+        assert counter, f"Active counter '{self.TODO_COUNT}' is not shown"
+        return int(counter[0]['text'])
+
+    def get_state(self) -> dict:
+        """Items (text, classes) and the active counter (None if not shown) in one browser call"""
+        snapshot = self.snapshot(
+            {'items': self.TODO_ITEMS, 'active_count': self.TODO_COUNT},
+            fields=('text', 'classes')
+        )
+        counter = snapshot['active_count']
+        return {
+            'items': [
+                {'text': item['text'].strip(), 'completed': 'completed' in item['classes']}
+                for item in snapshot['items']
+            ],
+            'active_count': int(counter[0]['text']) if counter else None,
+        }
+
+    @staticmethod
+    def generate_todos(count: int, completed: int = 0) -> List[Tuple[str, bool]]:
+        """Large-list fixture: `count` todos, the first `completed` of them done"""
+        return [(f"Todo {i + 1}", i < completed) for i in range(count)]
@@ -0,0 +1,154 @@
+"""
+Wait Strategies
+Event-driven readiness conditions for page objects
+
+Each strategy optionally runs an action, then blocks until its condition
+holds and returns how long it actually blocked (ms).
+"""
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Optional
+from playwright.sync_api import Page, TimeoutError as PlaywrightTimeoutError
+from utils.instrumentation import timeline
+
+class WaitStrategy(ABC):
+    """Base strategy: run the action, then wait()"""
+    name = 'wait'
+
+    def describe(self) -> str:
+        return self.name
+
+    @abstractmethod
+    def wait(self, page: Page, timeout: Optional[float]):
+        """Block until the condition holds (raises Playwright's TimeoutError)"""
+
+    def perform(self, page: Page, action: Optional[Callable] = None,
+                timeout: Optional[float] = None) -> float:
+        """Run action (if any) and block until ready; returns ms blocked"""
+        if action:
+            action()
+        start = time.perf_counter()
+        with timeline.span(self.describe(), 'wait'):
+            self.wait(page, timeout)
+        return (time.perf_counter() - start) * 1000
+
+class NoWait(WaitStrategy):
+    """Return as soon as the action returns"""
+    name = 'none'
+
+    def wait(self, page, timeout):
+        pass
+
+class LoadStateWait(WaitStrategy):
+    """Legacy load-state wait ('load', 'domcontentloaded', 'networkidle')"""
+
+    def __init__(self, state: str = 'load'):
+        self.state = state
+
+    def describe(self):
+        return f"load_state:{self.state}"
+
+    def wait(self, page, timeout):
+        page.wait_for_load_state(self.state, timeout=timeout)
+
+class SelectorWait(WaitStrategy):
+    """Wait for an element to reach a state; survives navigations"""
+
+    def __init__(self, selector: str, state: str = 'visible'):
+        self.selector = selector
+        self.state = state
+
+    def describe(self):
+        return f"selector:{self.selector}:{self.state}"
+
+    def wait(self, page, timeout):
+        page.locator(self.selector).first.wait_for(state=self.state, timeout=timeout)
+
+class DomConditionWait(WaitStrategy):
+    """Wait for a JS predicate to become truthy; re-evaluated after navigations"""
+
+    def __init__(self, expression: str, arg=None, polling='raf'):
+        self.expression = expression
+        self.arg = arg
+        self.polling = polling
+
+    def describe(self):
+        return f"dom:{self.expression[:60]}"
+
+    def wait(self, page, timeout):
+        page.wait_for_function(self.expression, arg=self.arg, polling=self.polling, timeout=timeout)
+
+class AppReadyWait(DomConditionWait):
+    """Wait for an app-defined ready signal, e.g. window.__APP_READY__ = true"""
+
+    def __init__(self, signal: str = '__APP_READY__'):
+        super().__init__(f"() => window[{signal!r}] === true")
+        self.signal = signal
+
+    def describe(self):
+        return f"app_ready:{self.signal}"
+
+class ResponseWait(WaitStrategy):
+    """Wait for a response whose URL matches (glob, regex or predicate)"""
+
+    def __init__(self, url, status: Optional[int] = None):
+        self.url = url
+        self.status = status
+
+    def describe(self):
+        return f"response:{self.url}"
+
+    def _check(self, response):
+        if self.status is not None and response.status != self.status:
+            raise AssertionError(f"Expected status {self.status} from {response.url}, got {response.status}")
+
+    def wait(self, page, timeout):
+        self._check(page.wait_for_response(self.url, timeout=timeout))
+
+    def perform(self, page, action=None, timeout=None):
+        if action is None:
+            return super().perform(page, timeout=timeout)
+
+        # Arm the listener before the action so a fast response is not missed
+        with timeline.span(self.describe(), 'wait'):
+            with page.expect_response(self.url, timeout=timeout) as response_info:
+                action()
+                start = time.perf_counter()
+            response = response_info.value
+        blocked = (time.perf_counter() - start) * 1000
+        self._check(response)
+        return blocked
+
+class NavigationCommitWait(WaitStrategy):
+    """Wait until the action's navigation is committed (response received)"""
+
+    def __init__(self, url=None):
+        self.url = url
+
+    def describe(self):
+        return f"navigation_commit:{self.url or '*'}"
+
+    def wait(self, page, timeout):
+        page.wait_for_url(self.url or '**', wait_until='commit', timeout=timeout)
+
+    def perform(self, page, action=None, timeout=None):
+        if action is None:
+            return super().perform(page, timeout=timeout)
+
+        with timeline.span(self.describe(), 'wait'):
+            with page.expect_navigation(url=self.url, wait_until='commit', timeout=timeout):
+                action()
+                start = time.perf_counter()
+        return (time.perf_counter() - start) * 1000
+
+def bounded_wait(page: Page, strategy: WaitStrategy, timeout_ms: float) -> float:
+    """Wait for a condition but never longer than timeout_ms; never raises on timeout"""
+    if timeout_ms <= 0:
+        # Playwright reads timeout=0 as "no timeout"
+        return 0.0
+    start = time.perf_counter()
+    try:
+        strategy.perform(page, timeout=timeout_ms)
+    except PlaywrightTimeoutError:
+        pass
+    return (time.perf_counter() - start) * 1000
@@ -5,6 +5,10 @@ Reusable steps across features
 from behave import given, when, then
 from playwright.sync_api import expect
 import os
+import sys
+sys.path.append('.')
+from utils.context_factory import replace_browser_context
+from features.pages.wait_strategies import LoadStateWait, bounded_wait
 
 @given('I am on the "{page_name}" page')
 def step_navigate_to_page(context, page_name):
@@ -24,23 +28,16 @@ def step_navigate_to_page(context, page_name):
 @given('locale is "{locale}"')
 def step_set_locale(context, locale):
     """Set locale for the test"""
-    # Close existing context and page
-    context.page.close()
-    context.browser_context.close()
-    
-    # Create new context with specified locale
-    context.browser_context = context.browser.new_context(
-        locale=locale,
-        timezone_id=os.getenv('TIMEZONE', 'America/New_York')
-    )
-    context.page = context.browser_context.new_page()
+    # Switch to a context with the new locale; viewport and timezone carry over
+    replace_browser_context(context, locale=locale)
     context.current_locale = locale
     print(f"✓ Set locale to: {locale}")
 
 @when('I wait for {seconds:d} seconds')
 def step_wait_seconds(context, seconds):
-    """Wait for specified seconds"""
-    context.page.wait_for_timeout(seconds * 1000)
+    """Wait until the page settles, for at most the specified seconds"""
+    blocked = bounded_wait(context.page, LoadStateWait('load'), seconds * 1000)
+    print(f"✓ Page settled after {blocked:.0f} ms (limit {seconds}s)")
 
 @then('I should see "{text}"')
 def step_verify_text(context, text):
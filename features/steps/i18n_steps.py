@@ -10,8 +10,11 @@ from utils.test_helpers import (
     get_translation, 
     is_rtl_locale,
     get_expected_date_format,
-    get_expected_currency_symbol
+    get_expected_currency_symbol,
+    get_expected_text
 )
+from utils.message_format import format_messages, format_currency
+from utils.layout_checks import find_text_overflow, format_overflow_report
 
 @given('I set viewport to {width:d}x{height:d}')
 def step_set_viewport(context, width, height):
@@ -46,8 +49,7 @@ def step_verify_rtl(context):
 @then('navigation text should be in {locale}')
 def step_verify_nav_locale(context, locale):
     """Verify navigation is in correct locale"""
-    translations = load_locale_data(locale)
-    expected_home = translations['nav']['home']
+    expected_home = get_translation(locale, 'nav.home')
     
     # Check if home link exists with translated text
     home_link = context.page.locator(f"text={expected_home}")
@@ -67,25 +69,54 @@ def step_verify_currency_symbol(context, symbol):
     assert symbol == expected, f"Expected '{expected}', got '{symbol}'"
     print(f"✓ Currency symbol: {symbol}")
 
+@then('I should see the "{key}" message with count {count:d}')
+def step_verify_plural_message(context, key, count):
+    """Verify a plural message rendered with the locale's plural rules"""
+    expected = get_expected_text(context.current_locale, key, count=count)
+    assert expected is not None, f"Missing translation key '{key}' for {context.current_locale}"
+    expect(context.page.get_by_text(expected, exact=True).first).to_be_visible()
+    print(f"✓ Found '{expected}'")
+
+@then('the amount {amount:g} should be shown in the local currency')
+def step_verify_currency_amount(context, amount):
+    """Verify an amount formatted with the locale's separators and currency"""
+    expected = format_currency(context.current_locale, amount)
+    expect(context.page.get_by_text(expected, exact=True).first).to_be_visible()
+    print(f"✓ Found amount '{expected}'")
+
+@then('I should see these messages')
+def step_verify_messages(context):
+    """
+    Verify a table of messages (columns: key, plus any placeholder columns
+    such as count or name), formatted in one batch
+    """
+    items = []
+    for row in context.table:
+        params = {}
+        for heading in row.headings:
+            if heading != 'key' and row[heading]:
+                params[heading] = int(row[heading]) if row[heading].isdigit() else row[heading]
+        items.append((row['key'], params))
+
+    for (key, _), expected in zip(items, format_messages(context.current_locale, items)):
+        assert expected is not None, f"Missing translation key '{key}' for {context.current_locale}"
+        expect(context.page.get_by_text(expected, exact=True).first).to_be_visible()
+    print(f"✓ Found {len(items)} formatted messages")
+
 @then('text does not overflow containers')
 def step_verify_no_overflow(context):
     """Verify text doesn't overflow"""
-    # Check if any text is cut off
-    overflow_check = context.page.evaluate("""
-        () => {
-            const elements = document.querySelectorAll('*');
-            for (let el of elements) {
-                if (el.scrollWidth > el.clientWidth || 
-                    el.scrollHeight > el.clientHeight) {
-                    return false;
-                }
-            }
-            return true;
-        }
-    """)
-    assert overflow_check, "Text overflow detected"
+    offenders = find_text_overflow(context.page)
+    assert not offenders, f"Text overflow detected in {len(offenders)} elements:\n{format_overflow_report(offenders)}"
     print("✓ No text overflow detected")
 
+@then('text does not overflow containers within "{root_selector}"')
+def step_verify_no_overflow_within(context, root_selector):
+    """Verify text doesn't overflow inside a specific region"""
+    offenders = find_text_overflow(context.page, root_selector=root_selector)
+    assert not offenders, f"Text overflow detected in {len(offenders)} elements:\n{format_overflow_report(offenders)}"
+    print(f"✓ No text overflow detected within {root_selector}")
+
 @then('all translation keys are loaded')
 def step_verify_keys_loaded(context):
     """Verify translation keys are loaded"""
@@ -4,14 +4,56 @@ Login Step Definitions
 from behave import given, when, then
 from playwright.sync_api import expect
 from features.pages.login_page import LoginPage
+from utils.context_factory import replace_browser_context
+import os
+
+def _base_url(context) -> str:
+    """Base URL of the scenario's own context"""
+    return context.context_options.get('base_url') or os.getenv('BASE_URL', 'http://localhost:3000')
+
+def _login_page(context) -> LoginPage:
+    return LoginPage(context.page, _base_url(context))
 
 @given('I am on the login page')
 def step_navigate_to_login(context):
     """Navigate to login page"""
-    context.login_page = LoginPage(context.page)
+    context.login_page = _login_page(context)
     context.login_page.navigate_to_login()
     print("✓ Navigated to login page")
 
+@given('I am logged in as "{username}" with password "{password}"')
+def step_logged_in(context, username, password):
+    """
+    Log in once via the UI, then reuse the cached storage state.
+    Scenarios tagged @no_auth_cache always log in through the form.
+    """
+    auth_cache = context.auth_cache
+    base_url = _base_url(context)
+    locale = context.current_locale
+    use_cache = auth_cache.enabled and 'no_auth_cache' not in context.scenario.effective_tags
+
+    state_path = auth_cache.get(base_url, username, locale) if use_cache else None
+    if state_path:
+        replace_browser_context(context, storage_state=state_path)
+        context.login_page = _login_page(context)
+        context.login_page.open_dashboard()
+        if context.login_page.is_logged_in():
+            print(f"✓ Logged in as: {username} (cached session)")
+            return
+        # Expired or revoked server-side: drop it and log in through the form
+        auth_cache.invalidate(base_url, username, locale)
+        replace_browser_context(context, storage_state=None)
+        print(f"⚠️  Cached session for {username} was rejected, logging in again")
+
+    context.login_page = _login_page(context)
+    context.login_page.navigate_to_login()
+    context.login_page.login(username, password)
+
+    assert context.login_page.is_logged_in(), f"Login as {username} did not reach the dashboard"
+    if use_cache:
+        auth_cache.save(context.browser_context, base_url, username, locale)
+    print(f"✓ Logged in as: {username}")
+
 @when('I enter username "{username}"')
 def step_enter_username(context, username):
     """Enter username"""
@@ -28,13 +70,13 @@ def step_enter_password(context, password):
 def step_click_login(context):
     """Click login button"""
     context.login_page.click_login()
-    print("✓ Clicked login button")
+    print(f"✓ Clicked login button (waited {context.login_page.last_wait_ms:.0f} ms)")
 
 @when('I login with username "{username}" and password "{password}"')
 def step_complete_login(context, username, password):
     """Complete login action"""
     if not hasattr(context, 'login_page'):
-        context.login_page = LoginPage(context.page)
+        context.login_page = _login_page(context)
         context.login_page.navigate_to_login()
     
     context.login_page.login(username, password)
@@ -49,8 +91,9 @@ def step_verify_dashboard(context):
 @then('I should see error message "{message}"')
 def step_verify_error(context, message):
     """Verify error message"""
-    error_text = context.login_page.get_error_message()
-    assert message in error_text, f"Expected '{message}' in '{error_text}'"
+    error = context.login_page.get_error()
+    assert error and error['visible'], f"Expected error message '{message}', but none is shown"
+    assert message in error['text'], f"Expected '{message}' in '{error['text']}'"
     print(f"✓ Error message shown: {message}")
 
 @then('the login title should be "{expected_title}"')
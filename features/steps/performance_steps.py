@@ -0,0 +1,68 @@
+"""
+Page Performance Step Definitions
+"""
+from behave import then
+import sys
+sys.path.append('.')
+from utils.page_metrics import series_key
+
+def _collect_page_metrics(context):
+    """Collect the current page's metrics and record them for this scenario"""
+    assert context.page_metrics is not None, \
+        "Page metrics are off for this scenario (tag it @performance or set PERF_METRICS=true)"
+    metrics = context.page_metrics.collect()
+    key = series_key(context.scenario_name, context.current_locale, context.page.viewport_size)
+    context.perf_recorder.record(key, metrics)
+    return metrics
+
+def _verify_load_time(context, ms):
+    load_ms = _collect_page_metrics(context)['load_ms']
+    assert load_ms is not None, "Navigation timing not available for this page"
+    assert load_ms <= ms, f"Page loaded in {load_ms:.0f} ms, budget is {ms:.0f} ms ({context.current_locale})"
+    print(f"✓ Page loaded in {load_ms:.0f} ms (budget {ms:.0f} ms)")
+
+def _verify_lcp(context, ms):
+    lcp_ms = _collect_page_metrics(context)['lcp_ms']
+    if lcp_ms is None:
+        print("⚠️  Largest contentful paint is not reported by this browser")
+        return
+    assert lcp_ms <= ms, f"LCP was {lcp_ms:.0f} ms, budget is {ms:.0f} ms ({context.current_locale})"
+    print(f"✓ LCP {lcp_ms:.0f} ms (budget {ms:.0f} ms)")
+
+def _verify_layout_count(context, count):
+    layout_count = _collect_page_metrics(context).get('layout_count')
+    if layout_count is None:
+        print("⚠️  Layout count is only available on chromium")
+        return
+    assert layout_count < count, f"Layout count {layout_count:.0f} is not below {count:.0f} ({context.current_locale})"
+    print(f"✓ Layout count {layout_count:.0f} (below {count:.0f})")
+
+@then('the page should load within {ms:d} ms')
+def step_verify_load_time(context, ms):
+    """Verify navigation start to load event end"""
+    _verify_load_time(context, ms)
+
+@then('the page should load within the load budget')
+def step_verify_load_budget(context):
+    """Verify load time against PERF_BUDGET_LOAD_MS"""
+    _verify_load_time(context, context.perf_recorder.budgets['load_ms'])
+
+@then('the largest contentful paint should be within {ms:d} ms')
+def step_verify_lcp(context, ms):
+    """Verify LCP (Chromium and Firefox; WebKit does not report it)"""
+    _verify_lcp(context, ms)
+
+@then('the largest contentful paint should be within the LCP budget')
+def step_verify_lcp_budget(context):
+    """Verify LCP against PERF_BUDGET_LCP_MS"""
+    _verify_lcp(context, context.perf_recorder.budgets['lcp_ms'])
+
+@then('layout count should be below {count:d}')
+def step_verify_layout_count(context, count):
+    """Verify the renderer's layout count (Chromium only, via CDP)"""
+    _verify_layout_count(context, count)
+
+@then('layout count should be within the layout budget')
+def step_verify_layout_budget(context):
+    """Verify the layout count against PERF_BUDGET_LAYOUT_COUNT"""
+    _verify_layout_count(context, context.perf_recorder.budgets['layout_count'])
@@ -4,13 +4,39 @@ For testing https://demo.playwright.dev/todomvc/
 """
 from behave import given, when, then
 from playwright.sync_api import expect
+from features.pages.todomvc_page import TodoMvcPage
+
+TRUE_VALUES = {'true', 'yes', 'y', 'x', '1'}
 
 @given('I am on the TodoMVC page')
 def step_navigate_to_todomvc(context):
     """Navigate to TodoMVC application"""
-    context.page.goto("https://demo.playwright.dev/todomvc/")
+    context.todomvc_page = TodoMvcPage(context.page)
+    context.todomvc_page.open()
     print("✓ Navigated to TodoMVC")
 
+@given('I have the following todos')
+def step_seed_todos_table(context):
+    """Seed the whole todo list from a table (text, completed) in one operation"""
+    todos = [
+        (row['text'], row.get('completed', 'false').strip().lower() in TRUE_VALUES)
+        for row in context.table
+    ]
+    TodoMvcPage(context.page).seed(todos)
+    print(f"✓ Seeded {len(todos)} todos")
+
+@given('I have {count:d} todos')
+def step_seed_many_todos(context, count):
+    """Seed a large list of active todos"""
+    TodoMvcPage(context.page).seed(TodoMvcPage.generate_todos(count))
+    print(f"✓ Seeded {count} todos")
+
+@given('I have {count:d} todos with {completed:d} completed')
+def step_seed_many_todos_completed(context, count, completed):
+    """Seed a large list where the first todos are completed"""
+    TodoMvcPage(context.page).seed(TodoMvcPage.generate_todos(count, completed))
+    print(f"✓ Seeded {count} todos ({completed} completed)")
+
 @given('I have added a todo "{todo_text}"')
 def step_add_todo_given(context, todo_text):
     """Add a todo as precondition"""
@@ -74,16 +100,14 @@ def step_verify_todo_in_list(context, text):
 @then('I should not see "{text}" in the todo list')
 def step_verify_todo_not_in_list(context, text):
     """Verify todo text does NOT appear in the list"""
-    todos = context.page.locator(".todo-list li")
-    count = todos.count()
+    todo_texts = TodoMvcPage(context.page).get_todo_texts()
     
-    if count == 0:
+    if not todo_texts:
         print("✓ Todo list is empty")
         return
     
-    # Check that none of the todos contain the text
-    for i in range(count):
-        todo_text = todos.nth(i).text_content()
+    # Check that none of the todos contain the text (one browser call for all items)
+    for todo_text in todo_texts:
         assert text not in todo_text, f"Found '{text}' but it should not be visible"
     
     print(f"✓ Verified '{text}' is not in list")
@@ -106,7 +130,6 @@ def step_verify_todo_completed(context):
 @then('the active count should be {count:d}')
 def step_verify_active_count(context, count):
     """Verify the active todo count"""
-    count_element = context.page.locator(".todo-count strong")
-    actual_count = int(count_element.text_content())
+    actual_count = TodoMvcPage(context.page).get_active_count()
     assert actual_count == count, f"Expected {count} active todos, but found {actual_count}"
     print(f"✓ Active count is correct: {count}")
@@ -0,0 +1,48 @@
+"""
+Visual Regression Step Definitions
+"""
+from behave import then
+import sys
+sys.path.append('.')
+from utils.visual_regression import VisualRegression
+
+# Viewport-relative boxes (in device pixels) of every element matching a selector list
+_REGIONS_JS = """
+(selectors) => {
+    const ratio = window.devicePixelRatio || 1;
+    return Array.from(document.querySelectorAll(selectors)).map((el) => {
+        const r = el.getBoundingClientRect();
+        return [r.x * ratio, r.y * ratio, r.width * ratio, r.height * ratio];
+    });
+}
+"""
+
+def _check_visual_baseline(context, ignore_selectors: str = None):
+    visual = context.visual_regression
+    name = VisualRegression.snapshot_name(
+        context.scenario_name, context.current_locale, context.page.viewport_size
+    )
+    regions = context.page.evaluate(_REGIONS_JS, ignore_selectors) if ignore_selectors else []
+
+    actual = visual.actual_path(name)
+    context.page.screenshot(path=str(actual), animations='disabled', caret='hide')
+
+    result = visual.check(name, actual, regions)
+    if result is None:
+        print(f"✓ Visual comparison queued: {name}")
+        return
+    assert result['passed'], f"Visual mismatch for {name}: {result['reason']} (diff: {result['diff']})"
+    if result.get('missing'):
+        print(f"⚠️  No visual baseline for {name}, skipped (VISUAL_UPDATE=true creates it)")
+        return
+    print(f"✓ Matches visual baseline: {name} ({result['reason'] or 'within tolerance'})")
+
+@then('the page should match the visual baseline')
+def step_verify_visual_baseline(context):
+    """Compare the viewport with the stored baseline for this locale and viewport"""
+    _check_visual_baseline(context)
+
+@then('the page should match the visual baseline ignoring "{selectors}"')
+def step_verify_visual_baseline_ignoring(context, selectors):
+    """Compare the viewport with its baseline, masking elements matching selectors"""
+    _check_visual_baseline(context, selectors)
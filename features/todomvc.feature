@@ -33,17 +33,19 @@ Feature: TodoMVC Application Testing
     Then the todo count should be 3
 
   Scenario: Filter active todos
-    Given I have added a todo "Active task"
-    And I have added a todo "Completed task"
-    And I have marked "Completed task" as complete
+    Given I have the following todos:
+      | text           | completed |
+      | Active task    | false     |
+      | Completed task | true      |
     When I click on "Active" filter
     Then I should see "Active task" in the todo list
     And I should not see "Completed task" in the todo list
 
   Scenario: Filter completed todos
-    Given I have added a todo "Active task"
-    And I have added a todo "Completed task"
-    And I have marked "Completed task" as complete
+    Given I have the following todos:
+      | text           | completed |
+      | Active task    | false     |
+      | Completed task | true      |
     When I click on "Completed" filter
     Then I should see "Completed task" in the todo list
     And I should not see "Active task" in the todo list
@@ -55,3 +57,10 @@ Feature: TodoMVC Application Testing
     When I click "Clear completed"
     Then I should not see "Task 1" in the todo list
     And I should see "Task 2" in the todo list
+
+  @slow
+  Scenario: Filter a large todo list
+    Given I have 2000 todos with 500 completed
+    When I click on "Completed" filter
+    Then the todo count should be 500
+    And the active count should be 1500
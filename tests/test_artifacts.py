@@ -0,0 +1,50 @@
+import hashlib
+import os
+from pathlib import Path
+
+from utils.artifacts import ArtifactPipeline, reset_budget
+
+def case(tmp_path, name):
+    return {'dir': (tmp_path / name).as_posix(), 'artifacts': []}
+
+def test_budget_is_shared_between_pipelines(tmp_path):
+    # Two pipelines on one root stand in for two parallel workers
+    first = ArtifactPipeline(tmp_path, budget_bytes=100, index_name='index-worker-1.json')
+    second = ArtifactPipeline(tmp_path, budget_bytes=100, index_name='index-worker-2.json')
+
+    assert first.submit(case(tmp_path, 'a'), 'trace', os.urandom(70)).result()['path']
+    dropped = second.submit(case(tmp_path, 'b'), 'trace', os.urandom(40)).result()
+    assert dropped['path'] is None and dropped['dropped'] == 'size budget exceeded'
+    assert second.submit(case(tmp_path, 'c'), 'trace', os.urandom(30)).result()['path']
+
+    first.close()
+    second.close()
+    assert first.stored_bytes + second.stored_bytes == 100
+
+def test_reset_budget_frees_the_budget(tmp_path):
+    pipeline = ArtifactPipeline(tmp_path, budget_bytes=50)
+    assert pipeline.submit(case(tmp_path, 'a'), 'trace', os.urandom(50)).result()['path']
+    reset_budget(tmp_path)
+    assert pipeline.submit(case(tmp_path, 'b'), 'trace', os.urandom(50)).result()['path']
+    pipeline.close()
+
+def test_trace_files_are_moved_and_hashed_without_loading_them(tmp_path, monkeypatch):
+    pipeline = ArtifactPipeline(tmp_path, budget_bytes=10_000_000)
+    trace = os.urandom(3 << 20)
+    first, second = (pipeline.staging_path(case(tmp_path, name), 'trace') for name in ('a', 'b'))
+    first.write_bytes(trace)
+    second.write_bytes(trace)
+
+    def no_read_bytes(self):
+        raise AssertionError(f"{self} was read into memory")
+    monkeypatch.setattr(Path, 'read_bytes', no_read_bytes)
+
+    stored = pipeline.submit(case(tmp_path, 'a'), 'trace', source=first).result()
+    duplicate = pipeline.submit(case(tmp_path, 'b'), 'trace', source=second).result()
+    monkeypatch.undo()
+
+    assert stored['sha256'] == hashlib.sha256(trace).hexdigest() and stored['bytes'] == len(trace)
+    assert Path(stored['path']).read_bytes() == trace
+    assert duplicate['deduplicated'] and duplicate['path'] == stored['path']
+    assert not first.exists() and not second.exists()
+    pipeline.close()
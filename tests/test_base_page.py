@@ -0,0 +1,107 @@
+import json
+import shutil
+import subprocess
+
+import pytest
+
+pytest.importorskip('playwright.sync_api')
+
+from features.pages.base_page import _SNAPSHOT_JS, BasePage
+from features.pages.login_page import LoginPage
+from features.pages.todomvc_page import TodoMvcPage
+
+class FakeLocator:
+    def __init__(self, page, selector):
+        self.page = page
+        self.selector = selector
+
+    def evaluate_all(self, script, arg):
+        self.page.calls.append(('evaluate_all', self.selector, arg))
+        return self.page.records.get(self.selector, [])
+
+class FakePage:
+    """Answers batched reads from canned records and counts browser calls"""
+
+    def __init__(self, records=None):
+        self.records = records or {}
+        self.calls = []
+
+    def locator(self, selector):
+        return FakeLocator(self, selector)
+
+    def evaluate(self, script, arg=None):
+        self.calls.append(('evaluate', None, arg))
+        return {name: self.records.get(selector, []) for name, selector in arg['queries'].items()}
+
+def test_list_reads_take_one_call_whatever_the_number_of_matches():
+    items = [{'text': f" Todo {n} ", 'classes': ['completed'] if n % 2 else []} for n in range(500)]
+    page = FakePage({'.todo-list li': items})
+    todos = TodoMvcPage(page)
+
+    assert todos.get_todo_texts()[:2] == ['Todo 0', 'Todo 1']
+    assert page.calls == [('evaluate_all', '.todo-list li', {'fields': ['text'], 'attributes': []})]
+
+def test_attribute_reads_only_request_the_attribute():
+    page = FakePage({'a': [{'attributes': {'href': '/cart'}}, {'attributes': {'href': None}}]})
+    assert BasePage(page).get_attributes('a', 'href') == ['/cart', None]
+    assert page.calls == [('evaluate_all', 'a', {'fields': [], 'attributes': ['href']})]
+
+def test_snapshot_answers_several_selectors_in_one_call():
+    page = FakePage({'h1': [{'text': 'Login'}], '.error-message': []})
+    snapshot = BasePage(page).snapshot({'title': 'h1', 'error': '.error-message'}, fields=('text',))
+
+    assert snapshot == {'title': [{'text': 'Login'}], 'error': []}
+    assert page.calls == [('evaluate', None, {'queries': {'title': 'h1', 'error': '.error-message'},
+                                               'fields': ['text'], 'attributes': []})]
+
+def test_active_count_reads_only_the_counter():
+    page = FakePage({TodoMvcPage.TODO_ITEMS: [{'text': 'x', 'classes': []}] * 2000,
+                     TodoMvcPage.TODO_COUNT: [{'text': '1500'}]})
+    assert TodoMvcPage(page).get_active_count() == 1500
+    assert page.calls == [('evaluate_all', TodoMvcPage.TODO_COUNT, {'fields': ['text'], 'attributes': []})]
+
+def test_active_count_fails_when_the_counter_is_missing():
+    with pytest.raises(AssertionError, match='not shown'):
+        TodoMvcPage(FakePage()).get_active_count()
+
+def test_login_error_text_and_visibility_come_from_one_call():
+    page = FakePage({LoginPage.ERROR_MESSAGE: [{'text': 'Invalid credentials', 'visible': True}]})
+    login = LoginPage(page)
+
+    assert login.get_error() == {'text': 'Invalid credentials', 'visible': True}
+    assert len(page.calls) == 1
+    assert login.is_error_visible() and login.get_error_message() == 'Invalid credentials'
+    assert not LoginPage(FakePage()).is_error_visible()
+
+FAKE_DOCUMENT_JS = """
+const element = (text, classes, width, attrs = {}) => ({
+    textContent: text,
+    classList: classes,
+    value: attrs.value,
+    getAttribute: (name) => (name in attrs ? attrs[name] : null),
+    getBoundingClientRect: () => ({ width, height: width ? 10 : 0 }),
+});
+const matches = {
+    '.todo-list li': [element('Buy milk', ['completed'], 100), element('Walk', [], 0)],
+    '.todo-count strong': [element('1', [], 20)],
+};
+globalThis.getComputedStyle = () => ({ visibility: 'visible' });
+globalThis.document = { querySelectorAll: (selector) => matches[selector] || [] };
+"""
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='needs node to run the page script')
+def test_snapshot_script_reads_the_requested_fields(tmp_path):
+    script = tmp_path / 'snapshot.js'
+    arg = {'queries': {'items': '.todo-list li', 'count': '.todo-count strong', 'none': '.missing'},
+           'fields': ['text', 'classes', 'visible'], 'attributes': ['data-id']}
+    script.write_text(
+        FAKE_DOCUMENT_JS + f"console.log(JSON.stringify(({_SNAPSHOT_JS})({json.dumps(arg)})));\n",
+        encoding='utf-8',
+    )
+    snapshot = json.loads(subprocess.run(['node', str(script)], capture_output=True, text=True,
+                                         check=True).stdout)
+    assert snapshot['items'] == [
+        {'text': 'Buy milk', 'classes': ['completed'], 'visible': True, 'attributes': {'data-id': None}},
+        {'text': 'Walk', 'classes': [], 'visible': False, 'attributes': {'data-id': None}},
+    ]
+    assert snapshot['count'][0]['text'] == '1' and snapshot['none'] == []
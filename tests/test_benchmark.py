@@ -0,0 +1,51 @@
+from utils.benchmark import close_step_context, make_step_context
+from utils.context_factory import replace_browser_context
+
+class FakePage:
+    def __init__(self):
+        self.closed = False
+
+    def on(self, event, handler):
+        pass
+
+    def close(self):
+        self.closed = True
+
+class FakeContext:
+    def __init__(self, options):
+        self.options = options
+        self.closed = False
+
+    def route(self, url, handler):
+        pass
+
+    def new_page(self):
+        return FakePage()
+
+    def close(self):
+        self.closed = True
+
+class FakeSession:
+    browser_name = 'chromium'
+
+    def __init__(self):
+        self.contexts = []
+
+    def new_context(self, **options):
+        self.contexts.append(FakeContext(options))
+        return self.contexts[-1]
+
+def test_step_context_supports_context_replacement():
+    session = FakeSession()
+    ctx = make_step_context(session)
+    assert ctx.current_locale == 'en-US'
+    assert ctx.page_metrics is None
+
+    # What the locale switch step does
+    replace_browser_context(ctx, locale='de-DE')
+    assert session.contexts[0].closed
+    assert ctx.browser_context is session.contexts[1]
+    assert ctx.context_options['locale'] == 'de-DE'
+
+    close_step_context(ctx)
+    assert session.contexts[1].closed and ctx.page.closed
@@ -0,0 +1,157 @@
+import json
+from types import SimpleNamespace
+
+from utils.context_factory import close_browser_context, open_browser_context
+from utils.context_pool import ContextPool
+
+class FakePage:
+    def __init__(self):
+        self.closed = False
+        self.scripts = []
+
+    def on(self, event, handler):
+        pass
+
+    def evaluate(self, script):
+        self.scripts.append(script)
+
+    def is_closed(self):
+        return self.closed
+
+    def close(self):
+        self.closed = True
+
+class FakeContext:
+    def __init__(self, browser, options):
+        self.browser = browser
+        self.options = options
+        self.pages = []
+        self.cookies = ['left over']
+        self.init_scripts = []
+        self.closed = False
+        self.fail_reset = False
+
+    def new_page(self):
+        self.pages.append(FakePage())
+        return self.pages[-1]
+
+    def clear_cookies(self):
+        if self.fail_reset:
+            raise RuntimeError('target closed')
+        self.cookies = []
+
+    def clear_permissions(self):
+        pass
+
+    def add_cookies(self, cookies):
+        self.cookies.extend(cookies)
+
+    def add_init_script(self, script):
+        self.init_scripts.append(script)
+
+    def close(self):
+        self.closed = True
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+
+    def is_connected(self):
+        return self.connected
+
+class FakeSession:
+    browser_name = 'chromium'
+
+    def __init__(self):
+        self.browser = FakeBrowser()
+        self.created = []
+
+    def ensure_browser(self):
+        pass
+
+    def new_context(self, **options):
+        self.created.append(FakeContext(self.browser, options))
+        return self.created[-1]
+
+def no_setup(browser_context):
+    pass
+
+def test_released_context_is_reset_and_reused_for_the_same_options():
+    pool, session = ContextPool(), FakeSession()
+    first = pool.acquire(session, {'locale': 'de-DE'}, no_setup)
+    page = first.new_page()
+    pool.release(first)
+
+    assert page.closed and page.scripts and first.cookies == []
+    assert pool.acquire(session, {'locale': 'de-DE'}, no_setup) is first
+    assert pool.acquire(session, {'locale': 'fr-FR'}, no_setup) is not first
+    assert pool.stats() == {'hits': 1, 'misses': 2, 'evictions': 0, 'idle': 0}
+
+def test_storage_state_cookies_are_restored_after_reset(tmp_path):
+    state = tmp_path / 'state.json'
+    state.write_text(json.dumps({
+        'cookies': [{'name': 'session', 'value': 'abc'}],
+        'origins': [{'origin': 'http://localhost:3000', 'localStorage': [{'name': 'token', 'value': 't'}]}],
+    }), encoding='utf-8')
+    pool, session = ContextPool(), FakeSession()
+    browser_context = pool.acquire(session, {'storage_state': str(state)}, no_setup)
+    pool.release(browser_context)
+
+    assert browser_context.cookies == [{'name': 'session', 'value': 'abc'}]
+    assert '"http://localhost:3000": [["token", "t"]]' in browser_context.init_scripts[0]
+
+def test_least_recently_used_contexts_are_evicted():
+    pool, session = ContextPool(max_size=2), FakeSession()
+    contexts = [pool.acquire(session, {'locale': locale}, no_setup) for locale in ('en-US', 'de-DE', 'ja-JP')]
+    for browser_context in contexts:
+        pool.release(browser_context)
+
+    assert contexts[0].closed and not contexts[1].closed and not contexts[2].closed
+    assert pool.stats()['evictions'] == 1 and pool.idle_count() == 2
+
+def test_failed_reset_closes_the_context_and_unknown_contexts_are_closed():
+    pool, session = ContextPool(), FakeSession()
+    broken = pool.acquire(session, {'locale': 'en-US'}, no_setup)
+    broken.fail_reset = True
+    pool.release(broken)
+    assert broken.closed and pool.idle_count() == 0
+
+    stranger = FakeContext(session.browser, {})
+    pool.release(stranger)
+    assert stranger.closed and pool.idle_count() == 0
+
+def test_contexts_of_a_disconnected_browser_are_not_handed_out():
+    pool, session = ContextPool(), FakeSession()
+    old = pool.acquire(session, {'locale': 'en-US'}, no_setup)
+    pool.release(old)
+    session.browser = FakeBrowser()
+
+    assert pool.acquire(session, {'locale': 'en-US'}, no_setup) is not old
+
+def scenario_context(pool, retry_attempt=0):
+    return SimpleNamespace(
+        context_pool=pool, retry_attempt=retry_attempt, scenario_session=FakeSession(),
+        block_categories=[], trace_active=False, perf_active=False,
+        network_mode=SimpleNamespace(apply=no_setup),
+        resource_blocker=SimpleNamespace(apply=lambda browser_context, categories: None),
+    )
+
+def test_retries_bypass_the_pool_on_open_and_close():
+    pool = ContextPool()
+    released = []
+    pool.release = released.append
+    context = scenario_context(pool, retry_attempt=1)
+    open_browser_context(context, {'locale': 'en-US'})
+    close_browser_context(context)
+
+    assert released == []
+    assert context.browser_context.closed and context.page.closed
+    assert pool.stats() == {'hits': 0, 'misses': 0, 'evictions': 0, 'idle': 0}
+
+def test_first_attempts_return_their_context_to_the_pool():
+    pool = ContextPool()
+    context = scenario_context(pool)
+    open_browser_context(context, {'locale': 'en-US'})
+    close_browser_context(context)
+
+    assert not context.browser_context.closed and pool.idle_count() == 1
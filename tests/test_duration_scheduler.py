@@ -0,0 +1,46 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from utils.duration_scheduler import DurationDatabase, lpt_schedule
+from utils.parallel_runner import main, split_shards
+
+ROOT = Path(__file__).resolve().parent.parent
+
+def test_lpt_places_longest_first_on_the_least_loaded_bucket():
+    durations = {'a': 7, 'b': 5, 'c': 4, 'd': 3, 'e': 3, 'f': 2}
+    buckets, loads = lpt_schedule(durations, 2)
+    assert buckets == [['a', 'd', 'f'], ['b', 'c', 'e']]
+    assert loads == [12, 12]
+
+def test_lpt_breaks_ties_on_the_location():
+    buckets, _ = lpt_schedule({'x:2': 1, 'x:1': 1, 'x:3': 1}, 2)
+    assert buckets == [['x:1', 'x:3'], ['x:2']]
+
+def test_lpt_leaves_extra_buckets_empty():
+    buckets, loads = lpt_schedule({'a': 1}, 3)
+    assert buckets == [['a'], [], []] and loads == [1, 0, 0]
+
+def test_shards_default_to_round_robin():
+    items = [f"features/a.feature:{line}" for line in range(10, 16)]
+    assert split_shards(items, 2) == [items[0::2], items[1::2]]
+
+def test_shards_balance_by_a_shared_durations_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(ROOT)
+    items = ['features/login.feature:10', 'features/login.feature:17', 'features/login.feature:30']
+    durations = tmp_path / 'durations.json'
+    durations.write_text(json.dumps({
+        'login.User Login|Successful login with valid credentials': [9.0],
+        'login.User Login|Failed login with invalid credentials': [1.0],
+    }), encoding='utf-8')
+
+    assert DurationDatabase(durations).duration('login.User Login|Failed login with invalid credentials') == 1.0
+    shards = split_shards(items, 2, durations)
+    assert shards[0] == ['features/login.feature:10']
+    assert sorted(shards[1]) == ['features/login.feature:17', 'features/login.feature:30']
+
+def test_missing_shard_durations_file_is_refused(tmp_path, monkeypatch):
+    monkeypatch.chdir(ROOT)
+    with pytest.raises(SystemExit):
+        main(['--list', '--shard', '1/2', '--shard-durations', str(tmp_path / 'missing.json')])
@@ -0,0 +1,190 @@
+import json
+
+import pytest
+
+pytest.importorskip('playwright.sync_api')
+
+from behave.parser import parse_feature
+from playwright.sync_api import Error as PlaywrightError
+
+import features.environment as environment
+from features.environment import (
+    BrowserSession, _create_session, _fan_out_scenarios, _load_locale_assignment, _scenario_locale
+)
+
+class FakeBrowser:
+    def __init__(self, name, context_error=None, dies=False, fail_close=False):
+        self.name = name
+        self.connected = True
+        self.context_error = context_error
+        self.dies = dies
+        self.fail_close = fail_close
+        self.contexts = []
+
+    def is_connected(self):
+        return self.connected
+
+    def new_context(self, **options):
+        if self.context_error is not None:
+            self.connected = not self.dies
+            raise self.context_error
+        self.contexts.append(options)
+        return options
+
+    def close(self):
+        self.connected = False
+        if self.fail_close:
+            raise PlaywrightError('Browser has been closed')
+
+class FakeBrowserType:
+    def __init__(self, name, driver):
+        self.name = name
+        self.driver = driver
+
+    def launch(self, headless, slow_mo):
+        self.driver.launches.append((self.name, headless, slow_mo))
+        return self.driver.next_browser.pop(0) if self.driver.next_browser else FakeBrowser(self.name)
+
+class FakePlaywright:
+    """Stands in for both sync_playwright() and the started driver"""
+
+    def __init__(self):
+        self.launches = []
+        self.next_browser = []
+        self.starts = 0
+        self.stopped = False
+        self.chromium, self.firefox, self.webkit = (
+            FakeBrowserType(name, self) for name in ('chromium', 'firefox', 'webkit')
+        )
+
+    def start(self):
+        self.starts += 1
+        return self
+
+    def stop(self):
+        self.stopped = True
+
+@pytest.fixture
+def driver(monkeypatch):
+    driver = FakePlaywright()
+    monkeypatch.setattr(environment, 'sync_playwright', lambda: driver)
+    return driver
+
+def test_browser_is_launched_once_and_reused(driver):
+    session = BrowserSession('firefox', headless=True, slow_mo=50)
+    first = session.ensure_browser()
+
+    assert session.ensure_browser() is first
+    session.new_context(locale='de-DE')
+    session.new_context(locale='fr-FR')
+    assert first.contexts == [{'locale': 'de-DE'}, {'locale': 'fr-FR'}]
+    assert driver.launches == [('firefox', True, 50)] and driver.starts == 1
+    assert session.launch_count == 1
+
+def test_disconnected_browser_is_relaunched(driver):
+    session = BrowserSession('webkit', headless=True, slow_mo=0)
+    first = session.ensure_browser()
+    first.connected = False
+
+    assert session.ensure_browser() is not first
+    assert session.launch_count == 2 and driver.starts == 1
+
+def test_new_context_relaunches_once_when_the_browser_died(driver):
+    session = BrowserSession('chromium', headless=True, slow_mo=0)
+    driver.next_browser = [FakeBrowser('chromium', PlaywrightError('Browser has been closed'), dies=True)]
+
+    assert session.new_context(locale='en-US') == {'locale': 'en-US'}
+    assert session.launch_count == 2
+
+def test_new_context_errors_of_a_live_browser_are_raised(driver):
+    session = BrowserSession('chromium', headless=True, slow_mo=0)
+    driver.next_browser = [FakeBrowser('chromium', PlaywrightError('bad option'))]
+
+    with pytest.raises(PlaywrightError, match='bad option'):
+        session.new_context(locale='en-US')
+    assert session.launch_count == 1
+
+def test_close_stops_the_driver_even_if_the_browser_is_gone(driver):
+    session = BrowserSession('chromium', headless=True, slow_mo=0)
+    driver.next_browser = [FakeBrowser('chromium', fail_close=True)]
+    session.ensure_browser()
+    session.close()
+
+    assert driver.stopped and session.browser is None and session.playwright is None
+    session.close()
+
+def test_session_settings_come_from_the_environment(monkeypatch):
+    monkeypatch.setenv('BROWSER', 'firefox')
+    monkeypatch.setenv('HEADLESS', 'True')
+    monkeypatch.setenv('SLOW_MO', '25')
+    session = _create_session()
+
+    assert (session.browser_name, session.headless, session.slow_mo) == ('firefox', True, 25)
+    assert session.browser is None and session.launch_count == 0
+
+GREETING_FEATURE = """Feature: Greeting
+  @i18n
+  Scenario: Welcome
+    Given a step
+
+  @i18n
+  Scenario Outline: Pinned <locale>
+    Given a step
+    Examples:
+      | locale |
+      | de-DE  |
+      | ja-JP  |
+
+  Scenario: Plain
+    Given a step
+
+  @i18n
+  Scenario Outline: Search <term>
+    Given a step
+    Examples:
+      | term |
+      | a    |
+      | b    |
+"""
+
+def greeting_feature():
+    return parse_feature(GREETING_FEATURE, filename='features/greeting.feature')
+
+def test_i18n_scenarios_get_one_tagged_copy_per_locale(monkeypatch):
+    monkeypatch.delenv('LOCALE', raising=False)
+    feature = greeting_feature()
+    _fan_out_scenarios(feature, ['en-US', 'de-DE'])
+
+    assert [scenario.name for scenario in feature.scenarios] == [
+        'Welcome [en-US]', 'Welcome [de-DE]', 'Pinned <locale>', 'Plain',
+        'Search <term> [en-US]', 'Search <term> [de-DE]',
+    ]
+    assert [_scenario_locale(scenario) for scenario in feature.scenarios] == [
+        'en-US', 'de-DE', 'en-US', 'en-US', 'en-US', 'de-DE',
+    ]
+    rows = feature.scenarios[-1].scenarios
+    assert [row.line for row in rows] == [22, 23]
+    assert all(_scenario_locale(row) == 'de-DE' for row in rows)
+    assert all(row.feature is feature for row in rows)
+
+def test_assignment_limits_copies_to_this_workers_locales():
+    feature = greeting_feature()
+    _fan_out_scenarios(feature, ['en-US', 'de-DE'], {
+        'features/greeting.feature:3': ['de-DE'],
+        'features/greeting.feature:22': ['en-US'],
+        'features/greeting.feature:23': [],
+    })
+
+    assert [scenario.name for scenario in feature.scenarios] == [
+        'Welcome [de-DE]', 'Pinned <locale>', 'Plain', 'Search <term> [en-US]',
+    ]
+    assert [row.line for row in feature.scenarios[-1].scenarios] == [22]
+
+def test_locale_assignment_is_read_from_the_runner_file(tmp_path, monkeypatch):
+    monkeypatch.delenv('LOCALE_ASSIGNMENT', raising=False)
+    assert _load_locale_assignment() == {}
+
+    assignment = tmp_path / 'locales.json'
+    assignment.write_text(json.dumps({'features/greeting.feature:3': ['ar-SA']}), encoding='utf-8')
+    monkeypatch.setenv('LOCALE_ASSIGNMENT', str(assignment))
+    assert _load_locale_assignment() == {'features/greeting.feature:3': ['ar-SA']}
@@ -0,0 +1,45 @@
+from pathlib import Path
+
+import pytest
+
+from utils.impact_analysis import ImpactIndex, formatter_modules, select_scenarios
+
+ROOT = Path(__file__).resolve().parent.parent
+
+@pytest.fixture(scope='module')
+def index(tmp_path_factory):
+    with pytest.MonkeyPatch.context() as patch:
+        patch.chdir(ROOT)
+        yield ImpactIndex(tmp_path_factory.mktemp('impact') / 'index.json').build(use_cache=False)
+
+@pytest.fixture(autouse=True)
+def repo_root(monkeypatch):
+    monkeypatch.chdir(ROOT)
+
+def selected(index, *files):
+    return select_scenarios(index, files)['scenarios']
+
+@pytest.mark.parametrize('changed', [
+    'utils/parallel_runner.py',
+    'utils/reporting.py',
+    '.github/workflows/ci.yml',
+    'pytest.ini',
+    'Makefile',
+])
+def test_unknown_runner_and_config_files_select_everything(index, changed):
+    assert len(selected(index, changed)) == len(index.scenarios)
+
+def test_documentation_selects_nothing(index):
+    assert selected(index, 'docs/TESTING_GUIDE.md', 'README.md') == []
+
+def test_step_module_selects_its_scenarios_only(index):
+    scenarios = selected(index, 'features/steps/login_steps.py')
+    assert 'features/dashboard.feature:7' in scenarios
+    assert 0 < len(scenarios) < len(index.scenarios)
+
+def test_catalog_change_runs_only_its_locale(index):
+    selection = select_scenarios(index, ['locales/de-DE/common.json'])
+    assert selection['scenarios'] and selection['locales'] == ['de-DE']
+
+def test_behave_ini_formatters_are_global():
+    assert formatter_modules() == ['utils/reporting.py']
@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+from utils.instrumentation import Timeline, _timed_method
+
+def test_nothing_is_recorded_until_enabled():
+    timeline = Timeline()
+    hook = timeline.timed('before_all')(lambda: 'ran')
+    step = object()
+
+    assert hook() == 'ran'
+    with timeline.span('chromium.launch', 'browser'):
+        pass
+    timeline.begin(step)
+    timeline.end(step, 'Given a step', 'step')
+    assert timeline.events == []
+
+def test_hooks_spans_and_steps_are_recorded():
+    timeline = Timeline()
+    timeline.enabled = True
+    step = object()
+
+    @timeline.timed('after_scenario')
+    def failing_hook():
+        raise RuntimeError('boom')
+
+    with pytest.raises(RuntimeError):
+        failing_hook()
+    with timeline.span('chromium.launch', 'browser', headless=True):
+        pass
+    timeline.begin(step)
+    timeline.end(step, 'Given a step', 'step', status='passed')
+    timeline.end(step, 'Given a step', 'step')
+
+    assert [(e['name'], e['cat'], e['args']) for e in timeline.events] == [
+        ('after_scenario', 'hook', {}),
+        ('chromium.launch', 'browser', {'headless': True}),
+        ('Given a step', 'step', {'status': 'passed'}),
+    ]
+    assert all(e['duration_ms'] >= 0 and e['start_ms'] >= 0 for e in timeline.events)
+
+def test_wrapped_methods_are_timed_only_while_enabled():
+    class Page:
+        def click(self, selector):
+            return f"clicked {selector}"
+
+    timeline = Timeline()
+    Page.click = _timed_method(timeline, 'Page.click', Page.click)
+
+    assert Page().click('#submit') == 'clicked #submit'
+    timeline.enabled = True
+    assert Page().click('#submit') == 'clicked #submit'
+    assert [e['name'] for e in timeline.events] == ['Page.click'] and Page.click.__timed__
+
+def test_aggregate_and_summary_put_the_slowest_first():
+    timeline = Timeline()
+    origin = timeline._origin
+    for name, seconds in (('Page.goto', 0.5), ('Locator.click', 0.1), ('Page.goto', 0.25), ('Locator.click', 0.1)):
+        timeline.add(name, 'playwright', origin, origin + seconds)
+    timeline.add('before_all', 'hook', origin, origin + 1)
+
+    assert timeline.aggregate('playwright') == [
+        {'name': 'Page.goto', 'count': 2, 'total_ms': 750.0, 'max_ms': 500.0},
+        {'name': 'Locator.click', 'count': 2, 'total_ms': 200.0, 'max_ms': 100.0},
+    ]
+    lines = timeline.summary(limit=1).splitlines()
+    assert lines[0] == '⏱️  Slowest calls:' and lines[1].endswith('Page.goto')
+    assert lines[2] == '⏱️  Hooks:' and len(lines) == 4
+
+def test_timeline_and_chrome_trace_are_written(tmp_path):
+    timeline = Timeline()
+    origin = timeline._origin
+    timeline.add('Given a step', 'step', origin + 0.002, origin + 0.0125, {'status': 'passed'})
+
+    paths = timeline.write(str(tmp_path), '-worker-2')
+    assert [p.name for p in paths] == ['timeline-worker-2.json', 'chrome-trace-worker-2.json']
+    assert json.loads(paths[0].read_text(encoding='utf-8')) == timeline.events
+
+    event = json.loads(paths[1].read_text(encoding='utf-8'))['traceEvents'][0]
+    assert (event['ph'], event['ts'], event['dur'], event['args']) == ('X', 2000, 10500, {'status': 'passed'})
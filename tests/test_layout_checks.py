@@ -0,0 +1,106 @@
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from utils.layout_checks import (
+    _COLLECT_TEXT_ELEMENTS_JS, _MEASURE_OVERFLOW_JS, find_text_overflow, format_overflow_report
+)
+
+def offender(n):
+    return {'selector': f"li:nth-of-type({n})", 'text': f"Item {n}", 'overflow_x': n, 'overflow_y': 0}
+
+class FakePage:
+    """Answers the scan scripts from a list of measured offenders"""
+
+    def __init__(self, total, offenders=(), fail_at=None):
+        self.total = total
+        self.offenders = list(offenders)
+        self.fail_at = fail_at
+        self.calls = []
+
+    def evaluate(self, script, arg=None):
+        self.calls.append((script, arg))
+        if script == _COLLECT_TEXT_ELEMENTS_JS:
+            return self.total
+        if script == _MEASURE_OVERFLOW_JS:
+            if arg['start'] == self.fail_at:
+                raise RuntimeError('page closed')
+            return [o for n, o in enumerate(self.offenders) if arg['start'] <= n < arg['end']]
+        return None
+
+def test_scan_measures_in_chunks_and_cleans_up():
+    page = FakePage(1200, [offender(n) for n in range(1200) if n % 400 == 0])
+    offenders = find_text_overflow(page, '#app', chunk_size=500, tolerance=2)
+
+    assert [o['overflow_x'] for o in offenders] == [0, 400, 800]
+    assert page.calls[0] == (_COLLECT_TEXT_ELEMENTS_JS, {'root': '#app'})
+    assert [arg for script, arg in page.calls if script == _MEASURE_OVERFLOW_JS] == [
+        {'start': 0, 'end': 500, 'tolerance': 2},
+        {'start': 500, 'end': 1000, 'tolerance': 2},
+        {'start': 1000, 'end': 1500, 'tolerance': 2},
+    ]
+    assert 'delete window.__overflowScan' in page.calls[-1][0]
+
+def test_scan_cleans_up_when_measuring_fails():
+    page = FakePage(1000, fail_at=500)
+    with pytest.raises(RuntimeError):
+        find_text_overflow(page, chunk_size=500)
+    assert 'delete window.__overflowScan' in page.calls[-1][0]
+
+# Minimal DOM: just what the collect script touches
+FAKE_DOM_JS = """
+globalThis.window = globalThis;
+globalThis.NodeFilter = { SHOW_TEXT: 4, FILTER_ACCEPT: 1, FILTER_REJECT: 2 };
+const element = (name, display, parent) => {
+    const el = { name, display, parentElement: parent, children: [] };
+    if (parent) parent.children.push(el);
+    return el;
+};
+const text = (value, parent) => parent.children.push({ nodeValue: value, parentElement: parent });
+const html = element('html', 'block', null);
+const body = element('body', 'block', html);
+const li = element('li', 'list-item', element('ul', 'block', body));
+text('Products', element('a', 'inline', li));
+text('Cart', element('strong', 'inline', element('span', 'inline', li)));
+text('Intro', element('p', 'block', body));
+text('   ', element('div', 'block', body));
+text('Loose', element('em', 'inline', body));
+globalThis.getComputedStyle = (el) => ({ display: el.display });
+globalThis.document = {
+    body, documentElement: html,
+    querySelector: () => body,
+    createTreeWalker: (scope, what, filter) => {
+        const nodes = [];
+        const visit = (node) => (node.children || []).forEach((child) => {
+            if ('nodeValue' in child) {
+                if (filter.acceptNode(child) === NodeFilter.FILTER_ACCEPT) nodes.push(child);
+            } else {
+                visit(child);
+            }
+        });
+        visit(scope);
+        const walker = { currentNode: null, nextNode: () => (walker.currentNode = nodes.shift() || null) };
+        return walker;
+    },
+};
+"""
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='needs node to run the page script')
+def test_text_in_inline_elements_is_measured_on_its_block(tmp_path):
+    script = tmp_path / 'collect.js'
+    script.write_text(
+        FAKE_DOM_JS
+        + f"const total = ({_COLLECT_TEXT_ELEMENTS_JS})({{ root: null }});\n"
+        + "console.log(JSON.stringify([total, window.__overflowScan.map((el) => el.name)]));\n",
+        encoding='utf-8',
+    )
+    output = subprocess.run(['node', str(script)], capture_output=True, text=True, check=True).stdout
+    assert json.loads(output) == [2, ['li', 'p']]
+
+def test_report_lists_the_first_offenders():
+    report = format_overflow_report([offender(n) for n in range(1, 13)], limit=10)
+    lines = report.splitlines()
+    assert lines[0] == "  - li:nth-of-type(1) (1px x, 0px y): 'Item 1'"
+    assert len(lines) == 11 and lines[-1] == "  ... and 2 more"
@@ -0,0 +1,74 @@
+import http.client
+from urllib.parse import urlencode, urlparse
+
+import pytest
+
+from utils.local_app import SESSION_COOKIE, LocalApp, negotiate_locale, t
+
+@pytest.fixture(scope='module')
+def app():
+    app = LocalApp().start()
+    yield app
+    app.stop()
+
+def request(app, method, path, body=None, headers=None):
+    """Raw request (redirects are not followed) -> (status, headers, text)"""
+    url = urlparse(app.url)
+    connection = http.client.HTTPConnection(url.hostname, url.port, timeout=5)
+    try:
+        connection.request(method, path, body, headers or {})
+        response = connection.getresponse()
+        return response.status, response.headers, response.read().decode('utf-8')
+    finally:
+        connection.close()
+
+@pytest.mark.parametrize('query, accept_language, locale', [
+    ('ja-JP', 'de-DE', 'ja-JP'),
+    (None, 'fr-CA,fr;q=0.9,en;q=0.8', 'fr-FR'),
+    (None, 'pt-BR, de;q=0.5', 'de-DE'),
+    ('xx-XX', None, 'en-US'),
+    (None, None, 'en-US'),
+])
+def test_locale_comes_from_the_query_then_accept_language(query, accept_language, locale):
+    assert negotiate_locale(query, accept_language) == locale
+
+def test_text_is_escaped_and_missing_keys_are_marked():
+    assert t('en-US', 'login.title') == 'Login'
+    assert t('en-US', 'greeting', name='<b>') == 'Hello, &lt;b&gt;'
+    assert t('en-US', 'login.nope') == '[missing] login.nope'
+
+def test_pages_are_rendered_in_the_negotiated_locale(app):
+    status, headers, body = request(app, 'GET', '/login', headers={'Accept-Language': 'de'})
+    assert status == 200 and '<html lang="de-DE" dir="ltr">' in body
+    assert '<h1>Anmelden</h1>' in body and headers['Vary'] == 'Accept-Language'
+
+    status, _, body = request(app, 'GET', '/products?locale=ar-SA')
+    assert status == 200 and 'dir="rtl"' in body
+
+def test_unchanged_pages_answer_not_modified(app):
+    _, headers, _ = request(app, 'GET', '/cart?locale=en-US')
+    status, _, body = request(app, 'GET', '/cart?locale=en-US', headers={'If-None-Match': headers['ETag']})
+    assert status == 304 and body == ''
+
+def test_unknown_pages_are_not_found(app):
+    assert request(app, 'GET', '/missing')[0] == 404
+    assert request(app, 'POST', '/logout', body='')[0] == 404
+
+def test_dashboard_needs_the_session_cookie(app):
+    status, headers, _ = request(app, 'GET', '/dashboard?locale=es-ES')
+    assert status == 303 and headers['Location'] == '/login?locale=es-ES'
+
+    status, headers, _ = request(app, 'GET', '/dashboard', headers={'Cookie': SESSION_COOKIE})
+    assert status == 200 and headers['Cache-Control'] == 'no-store'
+
+def test_login_sets_the_session_or_shows_the_error(app):
+    form = {'Content-Type': 'application/x-www-form-urlencoded'}
+    status, headers, _ = request(app, 'POST', '/login', urlencode(
+        {'username': 'testuser@example.com', 'password': 'Test@123'}), form)
+    assert status == 303 and headers['Location'] == '/dashboard'
+    assert headers['Set-Cookie'].startswith(SESSION_COOKIE)
+
+    status, headers, body = request(app, 'POST', '/login?locale=de-DE', urlencode(
+        {'username': 'testuser@example.com', 'password': 'wrong'}), form)
+    assert status == 200 and 'Set-Cookie' not in headers
+    assert f'<p class="error-message">{t("de-DE", "login.error")}</p>' in body
@@ -0,0 +1,52 @@
+import pytest
+
+from utils.message_format import format_currency, format_message, format_number, plural_categories, plural_category
+
+@pytest.mark.parametrize('locale, n, category', [
+    ('en-US', 1, 'one'),
+    ('en-US', 0, 'other'),
+    ('en-US', 1.0, 'other'),
+    ('fr-FR', 0, 'one'),
+    ('fr-FR', 1.5, 'one'),
+    ('fr-FR', 1000000, 'many'),
+    ('es-ES', 1000000, 'many'),
+    ('es-ES', 2, 'other'),
+    ('ar-SA', 0, 'zero'),
+    ('ar-SA', 2, 'two'),
+    ('ar-SA', 3, 'few'),
+    ('ar-SA', 11, 'many'),
+    ('ar-SA', 100, 'other'),
+    ('ja-JP', 1, 'other'),
+])
+def test_cldr_plural_selection(locale, n, category):
+    assert plural_category(locale, n) == category
+    assert category in plural_categories(locale)
+
+def test_plural_messages_use_explicit_zero_and_locale_forms():
+    assert format_message('en-US', 'items', count=0) == 'No items'
+    assert format_message('en-US', 'items', count=1) == '1 item'
+    assert format_message('ar-SA', 'items', count=2) == 'عنصران'
+
+@pytest.mark.parametrize('locale, value, expected', [
+    ('en-US', 1234567.891, '1,234,567.891'),
+    ('de-DE', 1234.5, '1.234,5'),
+    ('es-ES', 1234.5, '1234,5'),
+    ('es-ES', 12345.5, '12.345,5'),
+    ('fr-FR', 1234.5, '1\u202f234,5'),
+    ('ar-SA', 1234.5, '١٬٢٣٤٫٥'),
+    ('en-US', 0.0005, '0.001'),
+    ('en-US', -0.0005, '-0.001'),
+    ('en-US', -0.0001, '0'),
+])
+def test_number_formatting(locale, value, expected):
+    assert format_number(locale, value) == expected
+
+@pytest.mark.parametrize('locale, amount, expected', [
+    ('ja-JP', 1234.5, '¥1,235'),
+    ('ja-JP', 1233.5, '¥1,234'),
+    ('en-US', 2.675, '$2.68'),
+    ('en-US', 1234.5, '$1,234.50'),
+    ('de-DE', -2.5, '-2,50 €'),
+])
+def test_currency_rounds_half_up(locale, amount, expected):
+    assert format_currency(locale, amount) == expected
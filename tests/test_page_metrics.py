@@ -0,0 +1,26 @@
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.page_metrics import PerformanceRecorder
+
+def test_collects_only_tagged_scenarios_by_default(monkeypatch):
+    monkeypatch.delenv('PERF_METRICS', raising=False)
+    monkeypatch.setenv('PERF_BUDGET_LOAD_MS', '1200')
+    recorder = PerformanceRecorder.from_env()
+    assert not recorder.collects(['i18n'])
+    assert recorder.collects(['i18n', 'performance'])
+    assert recorder.budgets['load_ms'] == 1200.0
+    assert recorder.budgets['layout_count'] == 50.0
+
+def _finish(history_path, report_path, key):
+    recorder = PerformanceRecorder(history_path=history_path)
+    recorder.record(key, {'load_ms': 100.0})
+    recorder.finish(report_path)
+
+def test_parallel_finishes_keep_every_series(tmp_path):
+    history = tmp_path / 'perf_history.json'
+    keys = [f"Home|en-US|{width}x720" for width in range(300, 316)]
+    with ProcessPoolExecutor(max_workers=8) as pool:
+        list(pool.map(_finish, [history] * len(keys),
+                      [tmp_path / f"report-{n}.json" for n in range(len(keys))], keys))
+    assert sorted(json.loads(history.read_text(encoding='utf-8'))) == sorted(f"chromium|{key}" for key in keys)
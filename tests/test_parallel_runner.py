@@ -0,0 +1,159 @@
+import argparse
+import json
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from utils import parallel_runner
+from utils.parallel_runner import (
+    discover_scenarios, main, merge_junit_reports, parse_shard, shard_items, split_item
+)
+
+SHOP_FEATURE = """Feature: Shop
+  Scenario: Browse
+    Given a step
+
+  @wip
+  Scenario: Draft
+    Given a step
+
+  Scenario Outline: Search <term>
+    Given a step
+    Examples:
+      | term |
+      | a    |
+      | b    |
+"""
+
+CART_FEATURE = """Feature: Cart
+  Scenario: Add
+    Given a step
+"""
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    features = tmp_path / 'features'
+    features.mkdir()
+    (features / 'shop.feature').write_text(SHOP_FEATURE, encoding='utf-8')
+    (features / 'cart.feature').write_text(CART_FEATURE, encoding='utf-8')
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+def test_every_scenario_and_outline_row_is_an_item(project):
+    assert discover_scenarios(['features'], []) == [
+        'features/cart.feature:2',
+        'features/shop.feature:2', 'features/shop.feature:6',
+        'features/shop.feature:13', 'features/shop.feature:14',
+    ]
+
+def test_tags_and_line_filters_narrow_the_selection(project):
+    assert 'features/shop.feature:6' not in discover_scenarios(['features'], ['-@wip'])
+    assert discover_scenarios(['features/shop.feature:9'], []) == [
+        'features/shop.feature:13', 'features/shop.feature:14',
+    ]
+    assert discover_scenarios(['features/shop.feature:14', 'features/cart.feature'], []) == [
+        'features/cart.feature:2', 'features/shop.feature:14',
+    ]
+
+def test_shard_spec_is_validated():
+    assert parse_shard('2/3') == (2, 3)
+    for value in ('2', 'a/b', '0/3', '4/3', '1/0'):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_shard(value)
+
+def test_shards_cover_every_item_exactly_once():
+    items = [f"features/a.feature:{line}" for line in range(1, 11)]
+    buckets = shard_items(items, 3)
+
+    assert [len(bucket) for bucket in buckets] == [4, 3, 3]
+    assert sorted(sum(buckets, []), key=lambda item: int(item.rsplit(':', 1)[1])) == items
+    assert shard_items(items, 3) == buckets
+    assert shard_items(items[:1], 3) == [items[:1], [], []]
+
+def test_list_prints_only_the_selected_shard(project, capsys):
+    assert main(['--list', '--shard', '2/2', '--schedule', 'round-robin', 'features']) == 0
+    assert capsys.readouterr().out.splitlines() == [
+        'features/shop.feature:2', 'features/shop.feature:13',
+    ]
+
+def test_split_item_separates_the_locale():
+    assert split_item('features/a.feature:7') == ('features/a.feature:7', None)
+    assert split_item('features/a.feature:7@de-DE') == ('features/a.feature:7', 'de-DE')
+
+def write_suite(directory, name, tests, failures, time):
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / f"TESTS-{name}.xml").write_text(
+        f'<testsuite name="{name}" tests="{tests}" failures="{failures}" errors="0" '
+        f'skipped="0" time="{time}"><testcase name="{name}"/></testsuite>',
+        encoding='utf-8',
+    )
+
+def test_worker_reports_are_merged_with_summed_totals(tmp_path):
+    write_suite(tmp_path / 'worker-1', 'login', 3, 1, 1.5)
+    write_suite(tmp_path / 'worker-2', 'todomvc', 4, 0, 2.25)
+    output = tmp_path / 'merged' / 'TESTS-merged.xml'
+
+    totals = merge_junit_reports([tmp_path / 'worker-1', tmp_path / 'worker-2'], output)
+    assert totals == {'tests': 7, 'failures': 1, 'errors': 0, 'skipped': 0}
+
+    merged = ET.parse(output).getroot()
+    assert merged.get('tests') == '7' and merged.get('time') == '3.750'
+    assert [(suite.get('name'), suite.get('hostname')) for suite in merged] == [
+        ('login', 'worker-1'), ('todomvc', 'worker-2'),
+    ]
+
+GREETING_FEATURE = """Feature: Greeting
+  @i18n
+  Scenario: Welcome
+    Given a step
+
+  @i18n
+  Scenario Outline: Pinned <locale>
+    Given a step
+    Examples:
+      | locale |
+      | de-DE  |
+      | ja-JP  |
+
+  Scenario: Plain
+    Given a step
+"""
+
+def test_locales_fan_i18n_scenarios_out_into_locale_items(project):
+    (project / 'features' / 'greeting.feature').write_text(GREETING_FEATURE, encoding='utf-8')
+    items = discover_scenarios(['features/greeting.feature'], [], ['en-US', 'de-DE'])
+
+    assert items == [
+        'features/greeting.feature:3@de-DE', 'features/greeting.feature:3@en-US',
+        'features/greeting.feature:11', 'features/greeting.feature:14',
+    ]
+
+def test_worker_gets_its_locale_pairs_through_an_assignment_file(tmp_path, monkeypatch):
+    runs = []
+    monkeypatch.setattr(parallel_runner, 'WORKERS_DIR', tmp_path / 'workers')
+    monkeypatch.setattr(parallel_runner.subprocess, 'run',
+                        lambda command, env, **kwargs: runs.append((command, env)) or SimpleNamespace(returncode=0))
+
+    result = parallel_runner.run_worker(2, [
+        'features/greeting.feature:3@en-US', 'features/greeting.feature:14',
+        'features/greeting.feature:3@ar-SA',
+    ], ['--no-capture'])
+
+    command, env = runs[0]
+    assert command[-3:] == ['--no-capture', 'features/greeting.feature:3', 'features/greeting.feature:14']
+    assert env['WORKER_ID'] == '2' and result['returncode'] == 0
+    assignment = json.loads(Path(env['LOCALE_ASSIGNMENT']).read_text(encoding='utf-8'))
+    assert assignment == {'features/greeting.feature:3': ['en-US', 'ar-SA']}
+
+def test_worker_without_locale_items_gets_no_assignment(tmp_path, monkeypatch):
+    runs = []
+    monkeypatch.delenv('LOCALE_ASSIGNMENT', raising=False)
+    monkeypatch.setattr(parallel_runner, 'WORKERS_DIR', tmp_path / 'workers')
+    monkeypatch.setattr(parallel_runner.subprocess, 'run',
+                        lambda command, env, **kwargs: runs.append(env) or SimpleNamespace(returncode=1))
+
+    assert parallel_runner.run_worker(1, ['features/login.feature:10'], [])['returncode'] == 1
+    assert 'LOCALE_ASSIGNMENT' not in runs[0]
+    assert not (tmp_path / 'workers' / 'worker-1' / 'locales.json').exists()
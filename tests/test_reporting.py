@@ -0,0 +1,105 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from utils.reporting import final_results, report_path, summarize
+
+ROOT = Path(__file__).resolve().parents[1]
+
+ENVIRONMENT = """
+import os, sys
+from utils.reporting import report_formatters
+
+def before_all(context):
+    formatters = report_formatters(context.config)
+    context._runner.formatters.extend(formatters)
+    context.results_formatter = formatters[-1]
+
+def after_scenario(context, scenario):
+    try:
+        if 'broken_hook' in scenario.tags:
+            raise RuntimeError('after_scenario failed')
+    finally:
+        context.results_formatter.scenario_finished(scenario, hook_failed=sys.exc_info()[1] is not None)
+"""
+
+STEPS = """
+import json
+from pathlib import Path
+from behave import step
+
+@step('the results file has {count:d} records')
+def step_count(context, count):
+    lines = Path('reports/results-ci.jsonl').read_text(encoding='utf-8').splitlines()
+    assert len(lines) == count, lines
+
+@step('it fails')
+def step_fail(context):
+    assert False, 'boom'
+
+@step('nothing happens')
+def step_nothing(context):
+    pass
+"""
+
+FEATURE = """
+Feature: Streaming
+  Scenario: First
+    Given the results file has 0 records
+
+  Scenario: Second sees the first
+    Given the results file has 1 records
+    Then it fails
+    And nothing happens
+
+  @broken_hook
+  Scenario: Hook failure
+    Given nothing happens
+"""
+
+def run_behave(tmp_path, *args, **env):
+    (tmp_path / 'features' / 'steps').mkdir(parents=True)
+    (tmp_path / 'features' / 'environment.py').write_text(ENVIRONMENT, encoding='utf-8')
+    (tmp_path / 'features' / 'steps' / 'steps.py').write_text(STEPS, encoding='utf-8')
+    (tmp_path / 'features' / 'streaming.feature').write_text(FEATURE, encoding='utf-8')
+    (tmp_path / 'reports').mkdir()
+    (tmp_path / 'reports' / 'results-ci.jsonl').touch()
+    return subprocess.run(
+        [sys.executable, '-m', 'behave', '--no-capture', *args, 'features'],
+        cwd=tmp_path, capture_output=True, text=True,
+        env=dict(os.environ, PYTHONPATH=str(ROOT), **env),
+    )
+
+def test_records_are_written_when_each_scenario_ends(tmp_path):
+    run = run_behave(tmp_path, REPORT_SUFFIX='ci')
+    records = [json.loads(line) for line in
+               (tmp_path / 'reports' / 'results-ci.jsonl').read_text(encoding='utf-8').splitlines()]
+
+    assert [(r['name'], r['status']) for r in records] == [
+        ('First', 'passed'), ('Second sees the first', 'failed'), ('Hook failure', 'failed'),
+    ], run.stdout
+    assert records[1]['failed_step'] == 'Then it fails' and 'boom' in records[1]['error']
+    assert records[2]['error'] == 'hook failed'
+    assert '<!DOCTYPE HTML>' in (tmp_path / 'reports' / 'report-ci.html').read_text(encoding='utf-8')
+
+def test_dry_run_leaves_the_reports_alone(tmp_path):
+    run_behave(tmp_path, '--dry-run')
+    assert (tmp_path / 'reports' / 'results-ci.jsonl').read_text(encoding='utf-8') == ''
+    assert not list((tmp_path / 'reports').glob('report*.html'))
+
+def test_report_path_adds_suffix_and_worker(monkeypatch):
+    monkeypatch.setenv('REPORT_SUFFIX', 'firefox')
+    monkeypatch.setenv('WORKER_ID', '2')
+    assert report_path('reports/results.jsonl') == str(Path('reports/results-firefox-worker-2.jsonl'))
+
+def test_final_results_keep_the_last_attempt_and_ignore_skips():
+    records = [
+        {'classname': 'login', 'name': 'A', 'status': 'failed', 'attempt': 0},
+        {'classname': 'login', 'name': 'A', 'status': 'passed', 'attempt': 1},
+        {'classname': 'login', 'name': 'B', 'status': 'failed', 'attempt': 0},
+        {'classname': 'login', 'name': 'B', 'status': 'skipped', 'attempt': 0},
+    ]
+    assert final_results(records)[('login', 'A')]['attempt'] == 1
+    assert summarize(records) == {'passed': 1, 'failed': 1}
@@ -0,0 +1,80 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from utils.resource_blocking import ResourceBlocker, format_summary, merge_summaries
+
+class FakeRoute:
+    def __init__(self, url, resource_type):
+        self.request = SimpleNamespace(url=url, resource_type=resource_type)
+        self.outcome = None
+
+    def abort(self, reason):
+        self.outcome = f"abort:{reason}"
+
+    def fallback(self):
+        self.outcome = 'fallback'
+
+class FakeContext:
+    def __init__(self):
+        self.routes = []
+
+    def route(self, url, handler):
+        self.routes.append((url, handler))
+
+    def request(self, url, resource_type):
+        route = FakeRoute(url, resource_type)
+        for _, handler in reversed(self.routes):
+            handler(route)
+        return route.outcome
+
+def test_profiles_and_tags_pick_the_blocked_categories():
+    assert ResourceBlocker('full').categories_for([]) == set()
+    assert ResourceBlocker('minimal').categories_for(['allow:fonts']) == {'media', 'analytics'}
+    assert ResourceBlocker('full').categories_for(['block:no-media', 'block:fonts']) == {'media', 'fonts'}
+    assert ResourceBlocker('full').categories_for(['block:unknown', 'smoke']) == set()
+
+def test_unknown_profile_is_rejected():
+    with pytest.raises(ValueError, match='BLOCK_PROFILE'):
+        ResourceBlocker('everything')
+
+def test_blocked_requests_are_aborted_and_counted():
+    blocker = ResourceBlocker('minimal')
+    browser_context = FakeContext()
+    blocker.apply(browser_context, blocker.categories_for([]))
+
+    assert browser_context.request('https://site.test/logo.png', 'image') == 'abort:blockedbyclient'
+    assert browser_context.request('https://fonts.test/a.woff2', 'font') == 'abort:blockedbyclient'
+    assert browser_context.request('https://www.google-analytics.com/g/collect', 'xhr') == 'abort:blockedbyclient'
+    assert browser_context.request('https://site.test/app.js', 'script') == 'fallback'
+
+    summary = blocker.summary()
+    assert summary['blocked'] == {'media': 1, 'fonts': 1, 'analytics': 1}
+    assert summary['estimated_bytes_saved'] == 30_000 + 25_000 + 5_000
+
+def test_nothing_is_routed_without_blocked_categories():
+    browser_context = FakeContext()
+    ResourceBlocker('full').apply(browser_context, set())
+    assert browser_context.routes == []
+
+def test_worker_summaries_are_added_up(tmp_path):
+    parts = []
+    for worker, blocked in ((1, {'media': 2}), (2, {'media': 1, 'fonts': 3})):
+        blocker = ResourceBlocker('minimal')
+        for category, count in blocked.items():
+            for _ in range(count):
+                blocker._record(category, 'image' if category == 'media' else 'font')
+        parts.append(blocker.write_summary(tmp_path / f"blocking-worker-{worker}.json"))
+
+    merged = merge_summaries(parts, tmp_path / 'blocking.json')
+    assert merged['blocked'] == {'media': 3, 'fonts': 3}
+    assert merged['total_blocked'] == 6
+    assert merged['estimated_bytes_saved'] == 3 * 30_000 + 3 * 25_000
+    assert json.loads((tmp_path / 'blocking.json').read_text(encoding='utf-8')) == merged
+    assert 'estimated' in format_summary(merged) and 'not measured' in format_summary(merged)
+
+def test_nothing_blocked_writes_nothing(tmp_path):
+    assert ResourceBlocker('full').write_summary(tmp_path / 'blocking.json') is None
+    assert merge_summaries([], tmp_path / 'blocking.json') is None
+    assert not (tmp_path / 'blocking.json').exists()
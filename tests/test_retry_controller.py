@@ -0,0 +1,52 @@
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.retry_controller import FlakinessHistory, RetryController
+
+JUNIT = """<?xml version="1.0" encoding="utf-8"?>
+<testsuite name="login.User Login" tests="2">
+  <testcase classname="login.User Login" name="Flaky login" status="passed" time="1.0"/>
+  <testcase classname="login.User Login" name="Broken login" status="failed" time="3.0">
+    <failure message="attempt 3" type="AssertionError">attempt 3</failure>
+  </testcase>
+</testsuite>
+"""
+
+def annotated_cases(tmp_path):
+    junit_file = tmp_path / 'TESTS-login.xml'
+    junit_file.write_text(JUNIT, encoding='utf-8')
+    controller = RetryController(max_retries=2, history=FlakinessHistory(tmp_path / 'history.json'))
+    controller.results = {
+        'flaky': {'classname': 'login.User Login', 'name': 'Flaky login', 'outcome': 'flaky',
+                  'failures': ['attempt 1']},
+        'broken': {'classname': 'login.User Login', 'name': 'Broken login', 'outcome': 'failed',
+                   'failures': ['attempt 1', 'attempt 2', 'attempt 3']},
+    }
+    assert controller.annotate_junit(tmp_path) == 2
+    return {case.get('name'): case for case in ET.parse(junit_file).getroot().iter('testcase')}
+
+def properties(case):
+    return {p.get('name'): p.get('value') for p in case.find('properties')}
+
+def test_flaky_case_gets_flaky_failures(tmp_path):
+    case = annotated_cases(tmp_path)['Flaky login']
+    assert [e.text for e in case.findall('flakyFailure')] == ['attempt 1']
+    assert properties(case) == {'outcome': 'flaky', 'attempts': '2'}
+
+def test_failed_case_reruns_exclude_the_reported_failure(tmp_path):
+    case = annotated_cases(tmp_path)['Broken login']
+    assert case.find('failure').text == 'attempt 3'
+    assert [e.text for e in case.findall('rerunFailure')] == ['attempt 1', 'attempt 2']
+    assert properties(case) == {'outcome': 'failed', 'attempts': '3'}
+
+def _record_and_save(path, key):
+    history = FlakinessHistory(path)
+    history.record(key, 'flaky', f"features/{key}.feature:1")
+    history.save()
+
+def test_parallel_saves_keep_every_worker_outcome(tmp_path):
+    path = tmp_path / 'history.json'
+    keys = [f"scenario-{n}" for n in range(16)]
+    with ProcessPoolExecutor(max_workers=8) as pool:
+        list(pool.map(_record_and_save, [path] * len(keys), keys))
+    assert sorted(FlakinessHistory(path).entries) == sorted(keys)
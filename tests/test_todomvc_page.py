@@ -0,0 +1,105 @@
+import json
+import shutil
+import subprocess
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('playwright.sync_api')
+
+from features.pages.todomvc_page import TodoMvcPage
+
+class FakePage:
+    """Records the browser calls a seed makes"""
+
+    def __init__(self, url='about:blank'):
+        self.url = url
+        self.calls = []
+
+    def evaluate(self, script, arg=None):
+        self.calls.append(('evaluate', arg))
+
+    def reload(self, wait_until=None):
+        self.calls.append(('reload', wait_until))
+
+    def add_init_script(self, script):
+        self.calls.append(('add_init_script', script))
+
+    def goto(self, url, wait_until=None):
+        self.url = url
+        self.calls.append(('goto', url))
+
+    def locator(self, selector):
+        wait_for = lambda state, timeout: self.calls.append(('wait_for', selector))
+        return SimpleNamespace(first=SimpleNamespace(wait_for=wait_for))
+
+    def wait_for_function(self, script, arg=None, timeout=None):
+        self.calls.append(('wait_for_function', arg))
+
+def test_state_records_have_unique_ids():
+    records = TodoMvcPage.build_state([('Buy milk', True), ('Walk', 0)])
+
+    assert [(r['title'], r['completed']) for r in records] == [('Buy milk', True), ('Walk', False)]
+    assert len({r['id'] for r in records}) == 2
+
+def test_generated_lists_complete_the_first_items():
+    assert TodoMvcPage.generate_todos(3, completed=1) == [('Todo 1', True), ('Todo 2', False), ('Todo 3', False)]
+
+def test_seeding_an_open_app_writes_storage_and_reloads_once():
+    page = FakePage(TodoMvcPage.URL)
+    TodoMvcPage(page).seed(TodoMvcPage.generate_todos(2000, completed=500))
+
+    assert [name for name, _ in page.calls] == ['evaluate', 'reload', 'wait_for', 'wait_for_function']
+    key, state = page.calls[0][1]
+    assert key == TodoMvcPage.STORAGE_KEY and len(json.loads(state)) == 2000
+    assert page.calls[1] == ('reload', 'commit')
+    assert page.calls[-1] == ('wait_for_function', [TodoMvcPage.TODO_ITEMS, 2000])
+
+def test_seeding_before_navigation_uses_an_init_script():
+    page = FakePage()
+    TodoMvcPage(page).seed([('Buy milk', False)])
+
+    assert page.calls[0][0] == 'add_init_script' and page.calls[1] == ('goto', TodoMvcPage.URL)
+    assert 'evaluate' not in {name for name, _ in page.calls} and 'reload' not in {name for name, _ in page.calls}
+    assert page.calls[-1] == ('wait_for_function', [TodoMvcPage.TODO_ITEMS, 1])
+
+FAKE_STORAGE_JS = """
+const storage = () => {
+    const items = {};
+    return { getItem: (key) => (key in items ? items[key] : null), setItem: (key, value) => { items[key] = String(value); } };
+};
+globalThis.localStorage = storage();
+globalThis.sessionStorage = storage();
+"""
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='needs node to run the init script')
+def test_init_script_seeds_only_the_first_load(tmp_path):
+    page = FakePage()
+    TodoMvcPage(page).seed([('Buy milk', True)])
+    init_script = page.calls[0][1]
+
+    script = tmp_path / 'seed.js'
+    script.write_text(
+        FAKE_STORAGE_JS
+        + f"{init_script}\n"
+        + f"localStorage.setItem({json.dumps(TodoMvcPage.STORAGE_KEY)}, '[]');\n"
+        + f"{init_script}\n"
+        + f"console.log(localStorage.getItem({json.dumps(TodoMvcPage.STORAGE_KEY)}));\n",
+        encoding='utf-8',
+    )
+    output = subprocess.run(['node', str(script)], capture_output=True, text=True, check=True).stdout
+    assert json.loads(output) == []
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='needs node to run the init script')
+def test_init_script_writes_the_todos(tmp_path):
+    page = FakePage()
+    TodoMvcPage(page).seed([('Buy "milk"', True), ('Walk', False)])
+
+    script = tmp_path / 'seed.js'
+    script.write_text(
+        FAKE_STORAGE_JS + f"{page.calls[0][1]}\n"
+        + f"console.log(localStorage.getItem({json.dumps(TodoMvcPage.STORAGE_KEY)}));\n",
+        encoding='utf-8',
+    )
+    output = subprocess.run(['node', str(script)], capture_output=True, text=True, check=True).stdout
+    assert [(r['title'], r['completed']) for r in json.loads(output)] == [('Buy "milk"', True), ('Walk', False)]
@@ -0,0 +1,85 @@
+import pytest
+
+from utils.tracing_policy import TracingPolicy
+
+class FakeTracing:
+    def __init__(self):
+        self.calls = []
+
+    def start(self, **options):
+        self.calls.append(('start', options))
+
+    def start_chunk(self, title=None):
+        self.calls.append(('start_chunk', title))
+
+    def stop_chunk(self, path=None):
+        self.calls.append(('stop_chunk', path))
+
+class FakeContext:
+    def __init__(self):
+        self.tracing = FakeTracing()
+
+@pytest.mark.parametrize('mode, attempt, failed, traced, kept', [
+    ('off', 0, True, False, True),
+    ('on', 0, False, True, True),
+    ('retain-on-failure', 0, False, True, False),
+    ('retain-on-failure', 0, True, True, True),
+    ('on-first-retry', 0, True, False, True),
+    ('on-first-retry', 1, True, True, True),
+    ('on-first-retry', 2, True, False, True),
+])
+def test_modes_decide_what_is_traced_and_kept(mode, attempt, failed, traced, kept):
+    policy = TracingPolicy(mode)
+    assert policy.should_trace('login.feature:Valid login', attempt) is traced
+    assert policy.should_keep(failed) is kept
+
+def test_sampling_is_deterministic_and_roughly_the_requested_share():
+    policy = TracingPolicy('sampled', sample_percent=25)
+    scenarios = [f"features/shop.feature:Scenario {n}" for n in range(2000)]
+    sampled = [scenario for scenario in scenarios if policy.should_trace(scenario)]
+
+    assert sampled == [scenario for scenario in scenarios if policy.should_trace(scenario)]
+    assert 400 < len(sampled) < 600
+    assert not any(TracingPolicy('sampled', sample_percent=0).should_trace(s) for s in scenarios)
+    assert policy.should_keep(False)
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError, match='TRACE_MODE'):
+        TracingPolicy('always')
+
+def test_mode_falls_back_to_trace_on_failure(monkeypatch):
+    monkeypatch.delenv('TRACE_MODE', raising=False)
+    monkeypatch.setenv('TRACE_ON_FAILURE', 'false')
+    assert TracingPolicy.from_env().mode == 'off'
+
+    monkeypatch.setenv('TRACE_MODE', 'Sampled')
+    monkeypatch.setenv('TRACE_SAMPLE_PERCENT', '2.5')
+    monkeypatch.setenv('TRACE_SNAPSHOTS', 'false')
+    policy = TracingPolicy.from_env()
+    assert (policy.mode, policy.sample_percent, policy.screenshots, policy.snapshots) == ('sampled', 2.5, True, False)
+
+def test_reused_context_starts_tracing_once_and_records_chunks():
+    policy = TracingPolicy('retain-on-failure', snapshots=False)
+    browser_context = FakeContext()
+
+    policy.start(browser_context, 'First')
+    assert policy.stop(browser_context, failed=False, path='first.zip') is None
+    policy.start(browser_context, 'Second')
+    assert policy.stop(browser_context, failed=True, path='second.zip') == 'second.zip'
+
+    assert browser_context.tracing.calls == [
+        ('start', {'screenshots': True, 'snapshots': False}),
+        ('start_chunk', 'First'), ('stop_chunk', None),
+        ('start_chunk', 'Second'), ('stop_chunk', 'second.zip'),
+    ]
+
+def test_contexts_that_are_not_recording_are_left_alone():
+    policy = TracingPolicy('on')
+    browser_context = FakeContext()
+    assert policy.stop(browser_context, failed=True, path='trace.zip') is None
+    policy.discard(browser_context)
+
+    policy.start(browser_context)
+    policy.discard(browser_context)
+    policy.discard(browser_context)
+    assert [name for name, _ in browser_context.tracing.calls] == ['start', 'start_chunk', 'stop_chunk']
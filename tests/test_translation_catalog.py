@@ -0,0 +1,72 @@
+import json
+import os
+
+import pytest
+
+from utils.test_helpers import TranslationCatalog, flatten_translations, get_translation, get_translations
+
+def write_catalog(tmp_path, locale, data):
+    path = tmp_path / locale / 'common.json'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data), encoding='utf-8')
+    return path
+
+def test_flat_index_has_sections_and_leaves():
+    index = flatten_translations({'welcome': 'Hi', 'login': {'title': 'Login', 'form': {'submit': 'Go'}}})
+    assert index == {
+        'welcome': 'Hi',
+        'login': {'title': 'Login', 'form': {'submit': 'Go'}},
+        'login.title': 'Login',
+        'login.form': {'submit': 'Go'},
+        'login.form.submit': 'Go',
+    }
+
+def test_files_are_parsed_once(tmp_path, monkeypatch):
+    write_catalog(tmp_path, 'en-US', {'login': {'title': 'Login'}})
+    catalog = TranslationCatalog(tmp_path)
+    parsed = []
+    loads = json.loads
+    monkeypatch.setattr(json, 'loads', lambda text: parsed.append(text) or loads(text))
+
+    first = catalog.load('en-US')
+    assert catalog.load('en-US') is first
+    assert catalog.get('en-US', 'login.title') == 'Login'
+    assert catalog.get('en-US', 'login.missing') is None
+    assert len(parsed) == 1
+
+def test_touched_files_are_hashed_but_not_reparsed(tmp_path):
+    path = write_catalog(tmp_path, 'en-US', {'welcome': 'Welcome'})
+    catalog = TranslationCatalog(tmp_path)
+    data, version = catalog.load('en-US'), catalog.version('en-US')
+
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert catalog.load('en-US') is data and catalog.version('en-US') == version
+
+def test_edited_files_are_reloaded(tmp_path):
+    path = write_catalog(tmp_path, 'en-US', {'welcome': 'Welcome'})
+    catalog = TranslationCatalog(tmp_path)
+    version = catalog.version('en-US')
+
+    path.write_text(json.dumps({'welcome': 'Welcome back'}), encoding='utf-8')
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert catalog.get('en-US', 'welcome') == 'Welcome back'
+    assert catalog.version('en-US') != version
+
+def test_missing_file_names_the_path(tmp_path):
+    with pytest.raises(FileNotFoundError, match='Translation file not found'):
+        TranslationCatalog(tmp_path).load('xx-XX')
+
+def test_many_keys_across_locales(tmp_path):
+    write_catalog(tmp_path, 'en-US', {'login': {'title': 'Login'}, 'welcome': 'Welcome'})
+    write_catalog(tmp_path, 'de-DE', {'login': {'title': 'Anmelden'}})
+
+    assert TranslationCatalog(tmp_path).get_many(['login.title', 'welcome'], ['en-US', 'de-DE']) == {
+        'en-US': {'login.title': 'Login', 'welcome': 'Welcome'},
+        'de-DE': {'login.title': 'Anmelden', 'welcome': None},
+    }
+
+def test_helpers_read_the_shared_catalog():
+    assert get_translation('de-DE', 'login.title') == 'Anmelden'
+    assert get_translations(['nav.cart'], ['en-US']) == {'en-US': {'nav.cart': 'Cart'}}
@@ -0,0 +1,25 @@
+from utils.translation_validator import compare_namespace, find_plural_groups, validate_translations
+
+def analysis(data):
+    return {'keys': [], 'placeholders': {}, 'plurals': find_plural_groups(data)}
+
+BASE = analysis({'items': {'zero': 'No items', 'one': '{{count}} item', 'other': '{{count}} items'}})
+
+def test_japanese_needs_only_other():
+    result = compare_namespace(BASE, analysis({'items': {'other': '{{count}} 個'}}), 'ja-JP')
+    assert result['plural_mismatches'] == {}
+
+def test_arabic_needs_all_six_categories():
+    result = compare_namespace(BASE, analysis({'items': {'zero': '', 'one': '', 'other': ''}}), 'ar-SA')
+    assert result['plural_mismatches']['items']['missing'] == ['few', 'many', 'two']
+
+def test_explicit_zero_is_optional():
+    result = compare_namespace(BASE, analysis({'items': {'one': '', 'other': ''}}), 'de-DE')
+    assert result['plural_mismatches'] == {}
+
+def test_missing_group_reports_every_category():
+    result = compare_namespace(BASE, analysis({}), 'fr-FR')
+    assert result['plural_mismatches']['items']['missing'] == ['many', 'one', 'other']
+
+def test_bundled_catalogs_are_valid():
+    assert validate_translations(use_cache=False)['errors'] == []
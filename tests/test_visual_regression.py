@@ -0,0 +1,83 @@
+import numpy as np
+from PIL import Image
+
+from utils.visual_regression import BaselineStore, VisualRegression, compare_images
+
+def save_png(path, pixels):
+    Image.fromarray(pixels).save(path)
+    return str(path)
+
+def gradient(width=64, height=48):
+    x = np.linspace(0, 255, width, dtype=np.uint8)
+    return np.repeat(np.stack([x, x[::-1], x], axis=-1)[None, :, :], height, axis=0).copy()
+
+def test_identical_images_pass_after_a_full_diff(tmp_path):
+    pixels = gradient()
+    result = compare_images(save_png(tmp_path / 'a.png', pixels), save_png(tmp_path / 'b.png', pixels))
+    assert result['passed'] and result['diff_pixels'] == 0 and result['reason'] is None
+
+def test_single_changed_pixel_fails(tmp_path):
+    baseline = gradient()
+    actual = baseline.copy()
+    actual[10, 10] = actual[10, 10] // 2 + 1
+    result = compare_images(save_png(tmp_path / 'a.png', actual), save_png(tmp_path / 'b.png', baseline),
+                            diff_path=str(tmp_path / 'diff.png'))
+    assert not result['passed']
+    assert result['diff_pixels'] == 1
+    assert (tmp_path / 'diff.png').exists()
+
+def test_tolerance_and_ignore_regions(tmp_path):
+    baseline = gradient()
+    actual = baseline.copy()
+    actual[:, :, 0] = np.clip(actual[:, :, 0].astype(np.int16) + 3, 0, 255)
+    actual[40:44, 50:60] = 0
+    a, b = save_png(tmp_path / 'a.png', actual), save_png(tmp_path / 'b.png', baseline)
+
+    assert not compare_images(a, b, tolerance=3)['passed']
+    assert compare_images(a, b, tolerance=3, ignore_regions=[(50, 40, 10, 4)])['passed']
+
+def test_mirrored_image_fails_with_a_diff_image(tmp_path):
+    baseline = gradient()
+    actual = baseline[:, ::-1].copy()
+    result = compare_images(save_png(tmp_path / 'a.png', actual), save_png(tmp_path / 'b.png', baseline),
+                            diff_path=str(tmp_path / 'diff.png'))
+    assert not result['passed'] and result['diff'] == str(tmp_path / 'diff.png')
+    assert (tmp_path / 'diff.png').exists()
+
+def test_size_mismatch_fails(tmp_path):
+    result = compare_images(save_png(tmp_path / 'a.png', gradient(64, 48)),
+                            save_png(tmp_path / 'b.png', gradient(64, 40)))
+    assert not result['passed'] and result['diff_ratio'] == 1.0
+
+def test_missing_baseline_is_skipped_unless_strict(tmp_path):
+    actual = save_png(tmp_path / 'actual.png', gradient())
+    store = BaselineStore(tmp_path / 'baselines', 'chromium')
+
+    visual = VisualRegression(store, tmp_path / 'out')
+    result = visual.check('login/en-US-1280x720', actual)
+    assert result['passed'] and result['missing']
+    assert visual.finish(tmp_path / 'report.json')['missing'] == ['login/en-US-1280x720']
+
+    result = VisualRegression(store, tmp_path / 'out', strict=True).check('login/en-US-1280x720', actual)
+    assert not result['passed'] and 'missing baseline' in result['reason']
+    assert not store.exists('login/en-US-1280x720')
+
+    result = VisualRegression(store, tmp_path / 'out', update=True).check('login/en-US-1280x720', actual)
+    assert result['passed'] and store.exists('login/en-US-1280x720')
+
+def test_check_compares_inline_and_deferred_uses_the_pool(tmp_path):
+    baseline = gradient()
+    changed = baseline.copy()
+    changed[5, 5] = 0
+    store = BaselineStore(tmp_path / 'baselines', 'chromium')
+    store.save('home/en-US-default', save_png(tmp_path / 'baseline.png', baseline))
+
+    visual = VisualRegression(store, tmp_path / 'out')
+    result = visual.check('home/en-US-default', save_png(tmp_path / 'changed.png', changed))
+    assert not result['passed'] and visual._pool is None
+    assert (tmp_path / 'out' / 'diff' / 'chromium' / 'home' / 'en-US-default.png').exists()
+
+    deferred = VisualRegression(store, tmp_path / 'out', deferred=True, workers=1)
+    assert deferred.check('home/en-US-default', save_png(tmp_path / 'same.png', baseline)) is None
+    summary = deferred.finish(tmp_path / 'report.json')
+    assert summary['failed'] == [] and summary['results']['home/en-US-default']['passed']
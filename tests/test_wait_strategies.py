@@ -0,0 +1,98 @@
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('playwright.sync_api')
+
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from features.pages.wait_strategies import (
+    LoadStateWait, NavigationCommitWait, NoWait, ResponseWait, WaitStrategy, bounded_wait
+)
+
+class FakePage:
+    """Records wait calls; raises `error` from them when set"""
+
+    def __init__(self, response=None, error=None):
+        self.response = response
+        self.error = error
+        self.calls = []
+
+    def _call(self, name, *args, **kwargs):
+        self.calls.append((name, args, kwargs))
+        if self.error is not None:
+            raise self.error
+
+    def wait_for_load_state(self, state, timeout=None):
+        self._call('wait_for_load_state', state, timeout=timeout)
+
+    def wait_for_url(self, url, wait_until=None, timeout=None):
+        self._call('wait_for_url', url, wait_until=wait_until, timeout=timeout)
+
+    def wait_for_response(self, url, timeout=None):
+        self._call('wait_for_response', url, timeout=timeout)
+        return self.response
+
+    @contextmanager
+    def expect_response(self, url, timeout=None):
+        self._call('expect_response', url, timeout=timeout)
+        yield SimpleNamespace(value=self.response)
+
+def response(status):
+    return SimpleNamespace(url='http://localhost:3000/api/login', status=status)
+
+def test_wait_strategy_requires_wait():
+    with pytest.raises(TypeError):
+        WaitStrategy()
+
+    class Incomplete(WaitStrategy):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+def test_zero_or_negative_timeout_returns_without_waiting():
+    page = FakePage()
+    assert bounded_wait(page, LoadStateWait('load'), 0) == 0.0
+    assert bounded_wait(page, LoadStateWait('load'), -5) == 0.0
+    assert page.calls == []
+
+def test_bounded_wait_passes_the_timeout_and_swallows_timeouts():
+    page = FakePage(error=PlaywrightTimeoutError('Timeout 250ms exceeded'))
+    assert bounded_wait(page, LoadStateWait('load'), 250) >= 0
+    assert page.calls == [('wait_for_load_state', ('load',), {'timeout': 250})]
+
+def test_bounded_wait_does_not_hide_other_errors():
+    page = FakePage(error=RuntimeError('page closed'))
+    with pytest.raises(RuntimeError):
+        bounded_wait(page, LoadStateWait('load'), 250)
+
+def test_perform_runs_the_action_before_waiting():
+    page = FakePage()
+    order = []
+    assert LoadStateWait('domcontentloaded').perform(page, lambda: order.append(len(page.calls)), 1000) >= 0
+    assert order == [0]
+    assert page.calls == [('wait_for_load_state', ('domcontentloaded',), {'timeout': 1000})]
+
+def test_strategies_without_an_action_use_wait():
+    page = FakePage()
+    NavigationCommitWait('**/dashboard').perform(page, timeout=1000)
+    NoWait().perform(page)
+    assert page.calls == [('wait_for_url', ('**/dashboard',), {'wait_until': 'commit', 'timeout': 1000})]
+
+def test_response_wait_checks_the_status():
+    clicked = []
+    strategy = ResponseWait('**/api/login', status=200)
+    assert strategy.perform(FakePage(response(200)), lambda: clicked.append(True)) >= 0
+    assert clicked == [True]
+
+    with pytest.raises(AssertionError, match='Expected status 200 .* got 401'):
+        strategy.perform(FakePage(response(401)), lambda: None)
+    with pytest.raises(AssertionError, match='got 500'):
+        strategy.perform(FakePage(response(500)))
+
+def test_response_wait_without_status_accepts_any_response():
+    page = FakePage(response(404))
+    assert ResponseWait('**/api/login').perform(page, lambda: None, timeout=500) >= 0
+    assert page.calls == [('expect_response', ('**/api/login',), {'timeout': 500})]
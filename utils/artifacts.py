@@ -0,0 +1,248 @@
+"""
+Failure Artifact Pipeline
+Screenshots, traces, console logs and page HTML are captured on the test
+thread and handed to a background writer pool that compresses, deduplicates
+and stores them under a total size budget. An index JSON links every
+artifact to its JUnit test case.
+
+The budget is shared by parallel workers: reservations are added up in
+artifacts/.budget under a file lock, reset at the start of each run.
+
+Layout:
+    artifacts/<browser>/<feature>/<scenario>_L<line>_<locale>[_retry<n>]/<kind>.<ext>
+    artifacts/index.json (index-worker-<n>.json in parallel runs)
+"""
+import gzip
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from PIL import Image
+
+from utils.file_lock import file_lock
+
+ARTIFACTS_DIR = Path('artifacts')
+BUDGET_FILE = '.budget'
+
+# kind -> (file extension, compression)
+ARTIFACT_KINDS = {
+    'screenshot': ('png', 'optimize'),
+    'html': ('html.gz', 'gzip'),
+    'console': ('log.gz', 'gzip'),
+    'trace': ('zip', None),
+}
+
+def _slug(value: str) -> str:
+    return re.sub(r'[^A-Za-z0-9._-]+', '_', value).strip('_')[:120]
+
+def junit_classname(feature, features_dir: str = 'features') -> str:
+    """classname behave's JUnit reporter gives this feature's test cases"""
+    filename = Path(feature.filename).as_posix()
+    prefix = f"{features_dir.rstrip('/')}/"
+    if filename.startswith(prefix):
+        filename = filename[len(prefix):]
+    return f"{filename.rsplit('.', 1)[0].replace('/', '.')}.{feature.name}"
+
+def _file_sha256(path: Path, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of a file read in chunks, so large traces never sit in memory"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _compress(kind: str, data: bytes) -> bytes:
+    compression = ARTIFACT_KINDS[kind][1]
+    if compression == 'gzip':
+        return gzip.compress(data, compresslevel=6, mtime=0)
+    if compression == 'optimize':
+        out = io.BytesIO()
+        with Image.open(io.BytesIO(data)) as image:
+            image.save(out, format='PNG', optimize=True)
+        return out.getvalue() if out.tell() < len(data) else data
+    return data
+
+class ArtifactPipeline:
+    """Background artifact writer shared by the whole run"""
+
+    def __init__(self, root: Path = ARTIFACTS_DIR, browser: str = 'chromium',
+                 budget_bytes: int = 500 * 1024 * 1024, workers: int = 2,
+                 index_name: str = 'index.json'):
+        self.root = Path(root)
+        self.browser = browser
+        self.budget_bytes = budget_bytes
+        self.budget_path = self.root / BUDGET_FILE
+        self.index_path = self.root / index_name
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='artifacts')
+        self._lock = threading.Lock()
+        self._futures: List[Future] = []
+        self._by_hash: Dict[str, Dict] = {}
+        self._cases: Dict[tuple, Dict] = {}
+        self.stored_bytes = 0
+        self.deduplicated = 0
+        self.dropped = 0
+
+    @classmethod
+    def from_env(cls) -> 'ArtifactPipeline':
+        worker_id = os.getenv('WORKER_ID')
+        if not worker_id:
+            # Parallel runs are reset once by the runner, not by every worker
+            reset_budget(Path(os.getenv('ARTIFACTS_DIR', str(ARTIFACTS_DIR))))
+        return cls(
+            root=Path(os.getenv('ARTIFACTS_DIR', str(ARTIFACTS_DIR))),
+            browser=os.getenv('BROWSER', 'chromium'),
+            budget_bytes=int(float(os.getenv('ARTIFACT_BUDGET_MB', '500')) * 1024 * 1024),
+            workers=int(os.getenv('ARTIFACT_WORKERS', '2')),
+            index_name=f"index-worker-{worker_id}.json" if worker_id else 'index.json',
+        )
+
+    def test_case(self, scenario, locale: str, attempt: int = 0) -> Dict:
+        """Index record (and artifact directory) for one scenario run"""
+        classname = junit_classname(scenario.feature)
+        key = (classname, scenario.name, attempt)
+        with self._lock:
+            case = self._cases.get(key)
+            if case is None:
+                directory = f"{_slug(scenario.name)}_L{scenario.line}_{_slug(locale)}"
+                if attempt:
+                    directory += f"_retry{attempt}"
+                feature = _slug(Path(scenario.feature.filename).stem)
+                case = {
+                    'classname': classname,
+                    'name': scenario.name,
+                    'location': f"{Path(scenario.filename).as_posix()}:{scenario.line}",
+                    'locale': locale,
+                    'browser': self.browser,
+                    'attempt': attempt,
+                    'status': None,
+                    'dir': (self.root / self.browser / feature / directory).as_posix(),
+                    'artifacts': [],
+                }
+                self._cases[key] = case
+            case['status'] = getattr(scenario.status, 'name', str(scenario.status))
+        return case
+
+    def _reserve(self, size: int) -> bool:
+        """Claim `size` bytes of the run-wide budget shared with the other workers"""
+        with file_lock(self.budget_path):
+            try:
+                reserved = int(self.budget_path.read_text(encoding='utf-8'))
+            except (FileNotFoundError, ValueError):
+                reserved = 0
+            if reserved + size > self.budget_bytes:
+                return False
+            self.budget_path.write_text(str(reserved + size), encoding='utf-8')
+        return True
+
+    def _staging_dir(self) -> Path:
+        # Per process: parallel workers share the artifacts root
+        return self.root / f".staging-{os.getpid()}"
+
+    def staging_path(self, case: Dict, kind: str) -> Path:
+        """Temporary file for artifacts Playwright writes itself (traces)"""
+        staging = self._staging_dir()
+        staging.mkdir(parents=True, exist_ok=True)
+        return staging / f"{hashlib.sha1(case['dir'].encode()).hexdigest()[:16]}-{kind}.{ARTIFACT_KINDS[kind][0]}"
+
+    def submit(self, case: Dict, kind: str, data: bytes = None, source: Path = None) -> Future:
+        """Queue an artifact (bytes, or a file to move in) for background writing"""
+        future = self._pool.submit(self._write, case, kind, data, source)
+        self._futures.append(future)
+        return future
+
+    def _write(self, case: Dict, kind: str, data: Optional[bytes], source: Optional[Path]) -> Dict:
+        # Files that are stored as they are (traces) are hashed in chunks and moved, never loaded
+        move = data is None and ARTIFACT_KINDS[kind][1] is None
+        if move:
+            digest = _file_sha256(source)
+            payload, size = None, source.stat().st_size
+        else:
+            if data is None:
+                data = source.read_bytes()
+            digest = hashlib.sha256(data).hexdigest()
+            payload = _compress(kind, data)
+            size = len(payload)
+        record = {'kind': kind, 'sha256': digest, 'path': None, 'bytes': 0, 'deduplicated': False}
+
+        target = Path(case['dir']) / f"{kind}.{ARTIFACT_KINDS[kind][0]}"
+        with self._lock:
+            # Dedupe and reserve budget under the lock so concurrent writers agree
+            existing = self._by_hash.get(digest)
+            if existing is not None:
+                record.update(path=existing['path'], bytes=existing['bytes'], deduplicated=True)
+                self.deduplicated += 1
+            elif not self._reserve(size):
+                record['dropped'] = 'size budget exceeded'
+                self.dropped += 1
+            else:
+                self.stored_bytes += size
+                record.update(path=target.as_posix(), bytes=size)
+                self._by_hash[digest] = record
+
+        if record['path'] and not record['deduplicated']:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if move:
+                shutil.move(source, target)
+            else:
+                target.write_bytes(payload)
+
+        if source is not None:
+            source.unlink(missing_ok=True)
+        with self._lock:
+            case['artifacts'].append(record)
+        return record
+
+    def close(self) -> Dict:
+        """Wait for pending writes, write the index and return a summary"""
+        errors = []
+        for future in self._futures:
+            try:
+                future.result()
+            except Exception as e:
+                errors.append(str(e))
+        self._pool.shutdown()
+        shutil.rmtree(self._staging_dir(), ignore_errors=True)
+
+        cases = [case for case in self._cases.values() if case['artifacts']]
+        summary = {
+            'browser': self.browser,
+            'budget_bytes': self.budget_bytes,
+            'stored_bytes': self.stored_bytes,
+            'deduplicated': self.deduplicated,
+            'dropped': self.dropped,
+            'errors': errors,
+            'testcases': cases,
+        }
+        if cases or errors:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            self.index_path.write_text(json.dumps(summary, indent=2), encoding='utf-8')
+        return summary
+
+def reset_budget(root: Path = ARTIFACTS_DIR):
+    """Start a run with the whole artifact budget available"""
+    with file_lock(root / BUDGET_FILE):
+        (root / BUDGET_FILE).unlink(missing_ok=True)
+
+def merge_indexes(root: Path = ARTIFACTS_DIR, output: Path = None) -> Optional[Path]:
+    """Combine per-worker index files into one index.json"""
+    output = output or root / 'index.json'
+    parts = sorted(root.glob('index-worker-*.json'))
+    if not parts:
+        return None
+    merged = {'stored_bytes': 0, 'deduplicated': 0, 'dropped': 0, 'errors': [], 'testcases': []}
+    for part in parts:
+        index = json.loads(part.read_text(encoding='utf-8'))
+        for key in ('stored_bytes', 'deduplicated', 'dropped'):
+            merged[key] += index.get(key, 0)
+        merged['errors'].extend(index.get('errors', []))
+        merged['testcases'].extend(index.get('testcases', []))
+        merged.setdefault('browser', index.get('browser'))
+    output.write_text(json.dumps(merged, indent=2), encoding='utf-8')
+    return output
@@ -0,0 +1,58 @@
+"""
+Authenticated Storage-State Cache
+Stores a logged-in context's storage_state per (base URL, username, locale)
+so later scenarios can start already authenticated
+"""
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+class AuthStateCache:
+    def __init__(self, cache_dir: str = '.auth', ttl_seconds: int = 3600, enabled: bool = True):
+        self.cache_dir = Path(cache_dir)
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+
+    @classmethod
+    def from_env(cls) -> 'AuthStateCache':
+        """Build the cache from AUTH_CACHE / AUTH_CACHE_DIR / AUTH_STATE_TTL"""
+        return cls(
+            cache_dir=os.getenv('AUTH_CACHE_DIR', '.auth'),
+            ttl_seconds=int(os.getenv('AUTH_STATE_TTL', '3600')),
+            enabled=os.getenv('AUTH_CACHE', 'true').lower() == 'true',
+        )
+
+    def state_path(self, base_url: str, username: str, locale: str) -> Path:
+        """Storage-state file for a login identity"""
+        identity = json.dumps([base_url.rstrip('/'), username, locale])
+        digest = hashlib.sha256(identity.encode('utf-8')).hexdigest()[:16]
+        return self.cache_dir / f"{digest}.json"
+
+    def get(self, base_url: str, username: str, locale: str) -> Optional[str]:
+        """Path to a fresh cached storage state, or None"""
+        if not self.enabled:
+            return None
+        path = self.state_path(base_url, username, locale)
+        try:
+            age = time.time() - path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+        if age > self.ttl_seconds:
+            return None
+        return str(path)
+
+    def save(self, browser_context, base_url: str, username: str, locale: str) -> str:
+        """Write the context's storage state atomically (safe across parallel workers)"""
+        path = self.state_path(base_url, username, locale)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        browser_context.storage_state(path=str(tmp_path))
+        os.replace(tmp_path, path)
+        return str(path)
+
+    def invalidate(self, base_url: str, username: str, locale: str):
+        """Drop a cached login, e.g. after the session was rejected"""
+        self.state_path(base_url, username, locale).unlink(missing_ok=True)
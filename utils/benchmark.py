@@ -0,0 +1,320 @@
+"""
+Framework Benchmark Suite
+Measures per-phase framework overhead against deterministic in-process
+pages (page.route / set_content), so no network is needed
+
+Usage:
+    python utils/benchmark.py
+    python utils/benchmark.py --iterations 20 --only login_flow --only overflow_scan
+    python utils/benchmark.py --save-baseline
+    python utils/benchmark.py --baseline reports/benchmark-baseline.json --threshold 0.15
+"""
+import argparse
+import json
+import math
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, Dict, List
+
+sys.path.append('.')
+
+from utils.test_helpers import catalog, get_translation, get_translations, is_rtl_locale
+
+BENCH_ORIGIN = 'http://bench.local'
+DEFAULT_OUTPUT = Path('reports/benchmark.json')
+DEFAULT_BASELINE = Path('reports/benchmark-baseline.json')
+BENCH_LOCALES = ['en-US', 'es-ES', 'fr-FR', 'de-DE', 'ja-JP', 'ar-SA']
+
+BENCHMARKS: Dict[str, Callable] = {}
+
+def benchmark(name: str):
+    """Register a benchmark; it receives the bench env and the iteration count"""
+    def decorator(fn):
+        BENCHMARKS[name] = fn
+        return fn
+    return decorator
+
+def measure(fn: Callable, iterations: int, setup: Callable = None) -> List[float]:
+    """Run fn `iterations` times, returning wall times in ms (setup is not timed)"""
+    samples = []
+    for _ in range(iterations):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+def summarize(samples: List[float]) -> Dict:
+    """Median, p95 and throughput for a list of ms samples"""
+    ordered = sorted(samples)
+    median = statistics.median(ordered)
+    return {
+        'iterations': len(ordered),
+        'median_ms': round(median, 3),
+        'p95_ms': round(ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)], 3),
+        'mean_ms': round(statistics.fmean(ordered), 3),
+        'min_ms': round(ordered[0], 3),
+        'per_second': round(1000 / median, 2) if median else None,
+    }
+
+# ---------------------------------------------------------------------------
+# In-process pages
+# ---------------------------------------------------------------------------
+
+def render_login_page(locale: str) -> str:
+    """Deterministic login page built from the locale catalog"""
+    direction = 'rtl' if is_rtl_locale(locale) else 'ltr'
+    t = lambda key: get_translation(locale, key)
+    return f"""<!DOCTYPE html>
+<html lang="{locale}" dir="{direction}"><body>
+  <h1>{t('login.title')}</h1>
+  <form action="/dashboard" method="get">
+    <label for="username">{t('login.username')}</label><input id="username" name="u">
+    <label for="password">{t('login.password')}</label><input id="password" type="password">
+    <button type="submit">{t('login.submit')}</button>
+  </form>
+</body></html>"""
+
+def render_large_dom(blocks: int) -> str:
+    """Page with many text-bearing boxes for the overflow scanner"""
+    items = "\n".join(
+        f'<div class="card" style="width:240px"><h3>Item {i}</h3><p>Description {i} text</p></div>'
+        for i in range(blocks)
+    )
+    return f"<!DOCTYPE html><html><body>{items}</body></html>"
+
+def serve_bench_pages(browser_context):
+    """Answer every bench.local request in-process"""
+    def handle(route):
+        path = route.request.url[len(BENCH_ORIGIN):].split('?')[0]
+        if path == '/login':
+            locale = route.request.headers.get('accept-language', 'en-US').split(',')[0]
+            body = render_login_page(locale if locale in BENCH_LOCALES else 'en-US')
+        elif path == '/dashboard':
+            body = "<!DOCTYPE html><html><body><h1>Dashboard</h1></body></html>"
+        else:
+            body = "<!DOCTYPE html><html><body><h1>Home</h1></body></html>"
+        route.fulfill(status=200, content_type='text/html; charset=utf-8', body=body)
+
+    browser_context.route(f"{BENCH_ORIGIN}/**", handle)
+
+def make_step_context(session) -> SimpleNamespace:
+    """
+    Minimal stand-in for behave's context, enough for the steps under test.
+    Everything context_factory reads is set, with the run-wide extras off
+    (no tracing, pool, page metrics or retries) so only the step is measured.
+    """
+    from utils.context_factory import default_context_options, open_browser_context
+    from utils.network_mode import NetworkMode
+    from utils.resource_blocking import ResourceBlocker
+    from utils.tracing_policy import TracingPolicy
+
+    ctx = SimpleNamespace(
+        scenario_session=session,
+        network_mode=NetworkMode('live'),
+        resource_blocker=ResourceBlocker('full'),
+        tracing_policy=TracingPolicy('off'),
+        context_pool=None,
+        perf_recorder=None,
+        perf_active=False,
+        retry_attempt=0,
+        block_categories=set(),
+        trace_active=False,
+        scenario_name='benchmark',
+    )
+    open_browser_context(ctx, default_context_options('en-US'))
+    ctx.current_locale = 'en-US'
+    return ctx
+
+def close_step_context(ctx):
+    from utils.context_factory import close_browser_context
+
+    close_browser_context(ctx)
+
+# ---------------------------------------------------------------------------
+# Benchmarks
+# ---------------------------------------------------------------------------
+
+@benchmark('browser_launch')
+def bench_browser_launch(env, iterations):
+    from features.environment import BrowserSession
+
+    session = BrowserSession(env.browser_name, headless=True, slow_mo=0)
+    session.playwright = env.session.playwright
+
+    def launch_and_close():
+        session.ensure_browser()
+        session.browser.close()
+        session.browser = None
+
+    return measure(launch_and_close, max(1, iterations // 4))
+
+@benchmark('context_creation')
+def bench_context_creation(env, iterations):
+    def create_and_close():
+        browser_context = env.session.new_context(locale='en-US')
+        browser_context.new_page()
+        browser_context.close()
+
+    return measure(create_and_close, iterations)
+
+@benchmark('locale_switch')
+def bench_locale_switch(env, iterations):
+    from features.steps.common_steps import step_set_locale
+
+    ctx = make_step_context(env.session)
+    locales = iter(BENCH_LOCALES * iterations)
+    try:
+        return measure(lambda: step_set_locale(ctx, next(locales)), iterations)
+    finally:
+        close_step_context(ctx)
+
+@benchmark('login_flow')
+def bench_login_flow(env, iterations):
+    from features.pages.login_page import LoginPage
+
+    def login():
+        browser_context = env.session.new_context(locale='en-US', base_url=BENCH_ORIGIN)
+        serve_bench_pages(browser_context)
+        page = browser_context.new_page()
+        login_page = LoginPage(page, BENCH_ORIGIN)
+        login_page.navigate_to_login()
+        login_page.login('bench@example.com', 'Bench@123')
+        browser_context.close()
+
+    return measure(login, max(1, iterations // 2))
+
+@benchmark('overflow_scan')
+def bench_overflow_scan(env, iterations):
+    from features.steps.i18n_steps import step_verify_no_overflow
+
+    ctx = make_step_context(env.session)
+    ctx.page.set_content(render_large_dom(env.dom_blocks))
+    try:
+        return measure(lambda: step_verify_no_overflow(ctx), iterations)
+    finally:
+        close_step_context(ctx)
+
+@benchmark('translation_lookup_cold')
+def bench_translation_cold(env, iterations):
+    return measure(lambda: get_translation('de-DE', 'nav.home'), iterations, setup=catalog.clear)
+
+@benchmark('translation_lookup_warm')
+def bench_translation_warm(env, iterations):
+    get_translation('de-DE', 'nav.home')
+    return measure(lambda: [get_translation('de-DE', 'nav.home') for _ in range(1000)], iterations)
+
+@benchmark('translation_batch')
+def bench_translation_batch(env, iterations):
+    keys = ['welcome', 'login.title', 'login.username', 'login.password', 'nav.home', 'items.other']
+    return measure(lambda: get_translations(keys, BENCH_LOCALES), iterations)
+
+@benchmark('scenario_throughput')
+def bench_scenario_throughput(env, iterations):
+    """Synthetic scenario: fresh context, page, content, a few assertions"""
+    html = render_login_page('de-DE')
+
+    def scenario():
+        browser_context = env.session.new_context(locale='de-DE', viewport={'width': 1920, 'height': 1080})
+        page = browser_context.new_page()
+        page.set_content(html)
+        page.locator('h1').text_content()
+        page.locator('#username').is_visible()
+        page.evaluate("() => document.dir")
+        browser_context.close()
+
+    return measure(scenario, iterations)
+
+# ---------------------------------------------------------------------------
+# Running and comparing
+# ---------------------------------------------------------------------------
+
+def run_benchmarks(names: List[str], iterations: int, browser_name: str, dom_blocks: int) -> Dict:
+    """Run the selected benchmarks with one shared browser"""
+    from features.environment import BrowserSession
+
+    session = BrowserSession(browser_name, headless=True, slow_mo=0)
+    env = SimpleNamespace(session=session, browser_name=browser_name, dom_blocks=dom_blocks)
+    results = {}
+    try:
+        session.ensure_browser()
+        for name in names:
+            samples = BENCHMARKS[name](env, iterations)
+            results[name] = summarize(samples)
+            r = results[name]
+            print(f"  {name:26s} median {r['median_ms']:9.2f} ms  p95 {r['p95_ms']:9.2f} ms  "
+                  f"({r['per_second']}/s)")
+    finally:
+        session.close()
+
+    return {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'browser': browser_name,
+        'iterations': iterations,
+        'dom_blocks': dom_blocks,
+        'scenarios_per_second': results.get('scenario_throughput', {}).get('per_second'),
+        'results': results,
+    }
+
+def compare_to_baseline(report: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Return regressions where the median slowed down by more than `threshold`"""
+    regressions = []
+    for name, result in report['results'].items():
+        base = baseline.get('results', {}).get(name)
+        if not base or not base['median_ms']:
+            continue
+        ratio = result['median_ms'] / base['median_ms']
+        marker = "❌" if ratio > 1 + threshold else "✓"
+        print(f"  {marker} {name:26s} {base['median_ms']:9.2f} -> {result['median_ms']:9.2f} ms ({ratio - 1:+.1%})")
+        if ratio > 1 + threshold:
+            regressions.append(f"{name}: median {base['median_ms']} ms -> {result['median_ms']} ms ({ratio - 1:+.1%})")
+    return regressions
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark framework overhead')
+    parser.add_argument('--iterations', type=int, default=10, help='Samples per benchmark')
+    parser.add_argument('--browser', default=os.getenv('BROWSER', 'chromium'), help='Browser to launch')
+    parser.add_argument('--dom-blocks', type=int, default=2000, help='Cards in the overflow scan page')
+    parser.add_argument('--only', action='append', choices=sorted(BENCHMARKS), help='Run only these benchmarks')
+    parser.add_argument('--output', default=str(DEFAULT_OUTPUT), help='JSON results path')
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE), help='Baseline JSON to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help='Store these results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=0.15, help='Allowed median slowdown (0.15 = 15%%)')
+    args = parser.parse_args(argv)
+
+    print("⏱️  Running framework benchmarks...")
+    report = run_benchmarks(args.only or list(BENCHMARKS), args.iterations, args.browser, args.dom_blocks)
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    print(f"📊 Results saved: {output}")
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(report, indent=2), encoding='utf-8')
+        print(f"📌 Baseline saved: {baseline_path}")
+        return 0
+
+    if not baseline_path.exists():
+        print(f"ℹ️  No baseline at {baseline_path} (run with --save-baseline)")
+        return 0
+
+    print(f"📈 Comparing against baseline {baseline_path} (threshold {args.threshold:.0%}):")
+    regressions = compare_to_baseline(report, json.loads(baseline_path.read_text(encoding='utf-8')), args.threshold)
+    if regressions:
+        print("❌ Performance regressions:")
+        for regression in regressions:
+            print(f"  - {regression}")
+        return 1
+    print("✅ No regressions")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
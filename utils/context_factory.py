@@ -0,0 +1,87 @@
+"""
+Browser Context Factory
+Creates and replaces the scenario's BrowserContext with consistent options
+"""
+import os
+from typing import Dict
+from utils.instrumentation import timeline
+from utils.page_metrics import PageMetricsCollector
+
+DEFAULT_VIEWPORT = {'width': 1920, 'height': 1080}
+
+def default_context_options(locale: str) -> Dict:
+    """Options every scenario context starts with"""
+    options = {
+        'locale': locale,
+        'timezone_id': os.getenv('TIMEZONE', 'America/New_York'),
+        'viewport': dict(DEFAULT_VIEWPORT),
+    }
+    if os.getenv('BASE_URL'):
+        options['base_url'] = os.getenv('BASE_URL')
+    return options
+
+def context_setup(context, categories):
+    """Per-context routing applied once when a context is created"""
+    def setup(browser_context):
+        context.network_mode.apply(browser_context)
+        context.resource_blocker.apply(browser_context, categories)
+    return setup
+
+def open_browser_context(context, options: Dict):
+    """
+    Create the scenario's context and page.
+    Run-wide context setup (network mode, resource blocking, tracing) is
+    applied here so every context a scenario opens behaves the same.
+    With a context pool, matching contexts are reused instead of created.
+    """
+    setup = context_setup(context, context.block_categories)
+    pool = getattr(context, 'context_pool', None)
+    if getattr(context, 'retry_attempt', 0):
+        pool = None  # retries always start from a brand-new context
+    with timeline.span('browser.new_context', 'browser', locale=options.get('locale')):
+        if pool is not None:
+            context.browser_context = pool.acquire(
+                context.scenario_session, options, setup, extra=context.block_categories
+            )
+        else:
+            context.browser_context = context.scenario_session.new_context(**options)
+            setup(context.browser_context)
+    context.context_options = options
+    context.pooled_context = pool is not None
+    if getattr(context, 'trace_active', False):
+        context.tracing_policy.start(context.browser_context, title=context.scenario_name)
+    context.page = context.browser_context.new_page()
+    # Console output is kept for the failure artifacts
+    context.console_log = []
+    context.page.on('console', lambda message: context.console_log.append(f"[{message.type}] {message.text}"))
+    context.page.on('pageerror', lambda error: context.console_log.append(f"[pageerror] {error}"))
+    # Performance observers go in before the first navigation
+    context.page_metrics = None
+    if getattr(context, 'perf_active', False):
+        context.page_metrics = PageMetricsCollector.attach(context.page, context.scenario_session.browser_name)
+    return context.page
+
+def close_browser_context(context):
+    """
+    Close the scenario's page and context, or hand the context back to the pool.
+    Mirrors open_browser_context: only contexts that came from the pool go back.
+    """
+    if getattr(context, 'pooled_context', False):
+        context.context_pool.release(context.browser_context)
+    else:
+        context.page.close()
+        context.browser_context.close()
+
+def replace_browser_context(context, **overrides):
+    """
+    Close the scenario's page and context and open new ones.
+    Options not overridden are carried over from the current context.
+    """
+    options = dict(context.context_options, **overrides)
+
+    tracing_policy = getattr(context, 'tracing_policy', None)
+    if tracing_policy is not None:
+        tracing_policy.discard(context.browser_context)
+    close_browser_context(context)
+
+    return open_browser_context(context, options)
@@ -0,0 +1,177 @@
+"""
+Browser Context Pool
+Keeps warmed BrowserContexts keyed by (locale, timezone, viewport, storage
+state, ...) so switching locale or viewport is a lookup instead of a new
+context. Contexts are reset (pages closed, cookies and storage cleared)
+before they are handed out again and evicted least-recently-used.
+
+The reset is partial, so the pool is opt-in (CONTEXT_POOL=true). NOT reset:
+- localStorage / sessionStorage of origins other than the open pages' ones
+- IndexedDB, Cache Storage and registered service workers (any origin)
+- HTTP cache, granted geolocation/offline overrides and init scripts
+Scenarios that depend on those must not run with the pool.
+"""
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional
+
+# Clears storage for the page's origin before the page is closed
+_CLEAR_STORAGE_JS = """
+() => {
+    try { localStorage.clear(); } catch (e) {}
+    try { sessionStorage.clear(); } catch (e) {}
+}
+"""
+
+# Re-seeds localStorage from a storage state on the first load of each page
+_RESTORE_STORAGE_JS = """
+(origins => {
+    const items = origins[location.origin];
+    if (items && !sessionStorage.getItem('__context_pool_restored')) {
+        for (const [name, value] of items) localStorage.setItem(name, value);
+        sessionStorage.setItem('__context_pool_restored', '1');
+    }
+})(%s)
+"""
+
+def _storage_state_version(options: Dict):
+    """Identify a storage_state file by path and mtime so refreshed logins get new contexts"""
+    path = options.get('storage_state')
+    if not isinstance(path, (str, Path)):
+        return path
+    try:
+        return [str(path), Path(path).stat().st_mtime_ns]
+    except FileNotFoundError:
+        return [str(path), None]
+
+class ContextPool:
+    def __init__(self, max_size: int = 8):
+        self.max_size = max_size
+        self._idle: 'OrderedDict[str, list]' = OrderedDict()
+        self._keys: Dict[int, str] = {}
+        self._storage: Dict[int, Dict] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls) -> 'ContextPool':
+        return cls(max_size=int(os.getenv('CONTEXT_POOL_SIZE', '8')))
+
+    @staticmethod
+    def make_key(options: Dict, extra: Iterable = ()) -> str:
+        """Pool key: every context option plus caller-defined setup (e.g. blocking)"""
+        keyed = dict(options, storage_state=_storage_state_version(options))
+        return json.dumps([keyed, sorted(extra)], sort_keys=True, default=str)
+
+    def _create(self, session, options: Dict, setup: Callable, key: str):
+        browser_context = session.new_context(**options)
+        setup(browser_context)
+        state = self._load_storage_state(options)
+        if state and state.get('origins'):
+            origins = {
+                o['origin']: [[item['name'], item['value']] for item in o.get('localStorage', [])]
+                for o in state['origins']
+            }
+            browser_context.add_init_script(_RESTORE_STORAGE_JS % json.dumps(origins))
+        self._keys[id(browser_context)] = key
+        self._storage[id(browser_context)] = state or {}
+        return browser_context
+
+    @staticmethod
+    def _load_storage_state(options: Dict) -> Optional[Dict]:
+        state = options.get('storage_state')
+        if isinstance(state, (str, Path)):
+            try:
+                return json.loads(Path(state).read_text(encoding='utf-8'))
+            except (FileNotFoundError, ValueError):
+                return None
+        return state
+
+    def acquire(self, session, options: Dict, setup: Callable, extra: Iterable = ()):
+        """Hand out an idle context for these options, or create one"""
+        key = self.make_key(options, extra)
+        idle = self._idle.get(key)
+        while idle:
+            browser_context = idle.pop()
+            if not idle:
+                del self._idle[key]
+            if browser_context.browser is session.browser and session.browser.is_connected():
+                self.hits += 1
+                return browser_context
+            self._forget(browser_context)
+            idle = self._idle.get(key)
+
+        self.misses += 1
+        session.ensure_browser()
+        return self._create(session, options, setup, key)
+
+    def release(self, browser_context):
+        """Reset a context and park it for reuse (closes it if it cannot be reset)"""
+        key = self._keys.get(id(browser_context))
+        if key is None:
+            browser_context.close()
+            return
+        try:
+            for page in list(browser_context.pages):
+                if not page.is_closed():
+                    page.evaluate(_CLEAR_STORAGE_JS)
+                    page.close()
+            browser_context.clear_cookies()
+            browser_context.clear_permissions()
+            cookies = self._storage.get(id(browser_context), {}).get('cookies')
+            if cookies:
+                browser_context.add_cookies(cookies)
+        except Exception as error:
+            print(f"⚠️  Context pool: reset failed, closing the context instead ({error})")
+            self._close(browser_context)
+            return
+
+        self._idle.setdefault(key, []).append(browser_context)
+        self._idle.move_to_end(key)
+        self._evict()
+
+    def prewarm(self, session, options_list: Iterable[Dict], setup: Callable, extra: Iterable = ()):
+        """Create idle contexts ahead of time (e.g. one per locale of an outline)"""
+        for options in options_list:
+            if self.idle_count() >= self.max_size:
+                break
+            key = self.make_key(options, extra)
+            if key not in self._idle:
+                session.ensure_browser()
+                self._idle[key] = [self._create(session, options, setup, key)]
+
+    def idle_count(self) -> int:
+        return sum(len(contexts) for contexts in self._idle.values())
+
+    def _evict(self):
+        """Close least-recently-used idle contexts beyond max_size"""
+        while self.idle_count() > self.max_size:
+            key, contexts = next(iter(self._idle.items()))
+            self._close(contexts.pop(0))
+            self.evictions += 1
+            if not contexts:
+                del self._idle[key]
+
+    def _forget(self, browser_context):
+        self._keys.pop(id(browser_context), None)
+        self._storage.pop(id(browser_context), None)
+
+    def _close(self, browser_context):
+        self._forget(browser_context)
+        try:
+            browser_context.close()
+        except Exception as error:
+            print(f"⚠️  Context pool: closing a context failed ({error})")
+
+    def close_all(self):
+        """Close every idle context"""
+        for contexts in self._idle.values():
+            for browser_context in contexts:
+                self._close(browser_context)
+        self._idle.clear()
+
+    def stats(self) -> Dict:
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'idle': self.idle_count()}
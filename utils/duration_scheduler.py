@@ -0,0 +1,187 @@
+"""
+Duration-Aware Scheduler
+Keeps a per-scenario duration history fed from behave's JUnit reports and
+splits scenario locations into balanced buckets, longest-processing-time
+first, so no worker is left running one long outline at the end.
+
+The default history in .cache/ is per machine, so it only balances local
+workers. CI shards are balanced only by a durations file committed to the
+repo (parallel_runner.py --shard-durations), so every machine agrees.
+
+Usage:
+    python utils/duration_scheduler.py ingest reports/
+    python utils/duration_scheduler.py ingest reports/ --durations ci/durations.json
+    python utils/duration_scheduler.py plan --shards 3 --tags=@i18n
+"""
+import argparse
+import heapq
+import json
+import os
+import statistics
+import sys
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+sys.path.append('.')
+
+from utils.artifacts import junit_classname
+
+DURATIONS_FILE = Path('.cache/durations.json')
+DURATIONS_WINDOW = 10
+DEFAULT_ESTIMATE = 10.0
+
+def duration_key(classname: str, name: str) -> str:
+    return f"{classname}|{name}"
+
+def fan_out_name(name: str, locale: str) -> str:
+    """Test case name of a LOCALES fan-out copy ("<name> [de-DE]", rows "<outline> [de-DE] -- @1.2 ...")"""
+    outline, separator, row = name.partition(' -- @')
+    return f"{outline} [{locale}]{separator}{row}"
+
+def _outline_key(key: str) -> str:
+    """Key shared by all rows of an outline ("<name> -- @1.2 ..." -> "<name>")"""
+    return key.split(' -- @', 1)[0]
+
+class DurationDatabase:
+    """Recent run times (seconds) per scenario, stored as JSON between runs"""
+
+    def __init__(self, path: Path = DURATIONS_FILE, window: int = DURATIONS_WINDOW):
+        self.path = Path(path)
+        self.window = window
+        self.entries: Dict[str, List[float]] = self._read()
+
+    def _read(self) -> Dict[str, List[float]]:
+        try:
+            return json.loads(self.path.read_text(encoding='utf-8'))
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def ingest(self, report_dirs: Iterable[Path]) -> int:
+        """Add one sample per test case from the TESTS-*.xml files in report_dirs"""
+        cases: Dict[Tuple[str, str], float] = {}
+        for report_dir in report_dirs:
+            for xml_file in sorted(Path(report_dir).glob('TESTS-*.xml')):
+                for case in ET.parse(xml_file).getroot().iter('testcase'):
+                    if case.get('status') == 'skipped' or case.find('skipped') is not None:
+                        continue
+                    # The same test case in a merged report replaces, not adds
+                    cases[(case.get('classname'), case.get('name'))] = float(case.get('time', 0))
+
+        for (classname, name), seconds in cases.items():
+            key = duration_key(classname, name)
+            self.entries[key] = (self.entries.get(key, []) + [round(seconds, 3)])[-self.window:]
+        return len(cases)
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        temp.write_text(json.dumps(self.entries, indent=2, sort_keys=True), encoding='utf-8')
+        os.replace(temp, self.path)
+
+    def duration(self, key: str):
+        """Median recent duration, or None for a scenario never seen before"""
+        samples = self.entries.get(key)
+        return statistics.median(samples) if samples else None
+
+    def estimate(self, scenarios: Dict[str, Dict]) -> Dict[str, float]:
+        """
+        Expected seconds per location. New scenarios get the median of their
+        outline's known rows, else their step count times the average seconds
+        per step of the known scenarios, else DEFAULT_ESTIMATE.
+        """
+        known = {location: self.duration(info['key']) for location, info in scenarios.items()}
+        known = {location: seconds for location, seconds in known.items() if seconds is not None}
+
+        by_outline: Dict[str, List[float]] = {}
+        for location, seconds in known.items():
+            by_outline.setdefault(_outline_key(scenarios[location]['key']), []).append(seconds)
+        known_steps = sum(scenarios[location]['steps'] for location in known)
+        per_step = sum(known.values()) / known_steps if known_steps else None
+
+        estimates = {}
+        for location, info in scenarios.items():
+            if location in known:
+                estimates[location] = known[location]
+            elif _outline_key(info['key']) in by_outline:
+                estimates[location] = statistics.median(by_outline[_outline_key(info['key'])])
+            elif per_step is not None:
+                estimates[location] = per_step * info['steps']
+            else:
+                estimates[location] = DEFAULT_ESTIMATE
+        return estimates
+
+def describe_locations(items: List[str]) -> Dict[str, Dict]:
+    """History key and step count for each `file:line` or `file:line@locale` item"""
+    from behave.parser import parse_file
+
+    wanted: Dict[str, List[str]] = {}
+    for item in items:
+        wanted.setdefault(item.partition('@')[0].rsplit(':', 1)[0], []).append(item)
+
+    scenarios = {}
+    for filename, file_items in wanted.items():
+        feature = parse_file(filename)
+        by_line = {scenario.line: scenario for scenario in feature.walk_scenarios()} if feature else {}
+        for item in file_items:
+            location, _, locale = item.partition('@')
+            scenario = by_line.get(int(location.rsplit(':', 1)[1]))
+            if scenario is None:
+                scenarios[item] = {'key': item, 'steps': 1}
+                continue
+            name = fan_out_name(scenario.name, locale) if locale else scenario.name
+            scenarios[item] = {
+                'key': duration_key(junit_classname(feature), name),
+                'steps': len(list(scenario.all_steps)),
+            }
+    return scenarios
+
+def lpt_schedule(durations: Dict[str, float], total: int) -> Tuple[List[List[str]], List[float]]:
+    """
+    Longest-processing-time-first bin packing into `total` buckets.
+    Ties break on the location, so every machine computes the same plan.
+    """
+    buckets: List[List[str]] = [[] for _ in range(total)]
+    loads = [0.0] * total
+    heap = [(0.0, index) for index in range(total)]
+    for location in sorted(durations, key=lambda item: (-durations[item], item)):
+        load, index = heapq.heappop(heap)
+        buckets[index].append(location)
+        loads[index] = load + durations[location]
+        heapq.heappush(heap, (loads[index], index))
+    return buckets, loads
+
+def plan(locations: List[str], total: int, db: DurationDatabase = None) -> Tuple[List[List[str]], List[float]]:
+    """Balanced buckets for locations plus each bucket's predicted seconds"""
+    db = db or DurationDatabase()
+    return lpt_schedule(db.estimate(describe_locations(locations)), total)
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Scenario duration history and scheduling')
+    parser.add_argument('command', choices=['ingest', 'plan'])
+    parser.add_argument('paths', nargs='*', help='Report directories (ingest) or feature paths (plan)')
+    parser.add_argument('--shards', type=int, default=2, help='Number of buckets to plan')
+    parser.add_argument('--tags', '-t', action='append', default=[], help='behave tag expression (repeatable)')
+    parser.add_argument('--durations', default=str(DURATIONS_FILE))
+    args = parser.parse_args(argv)
+
+    db = DurationDatabase(Path(args.durations))
+    if args.command == 'ingest':
+        count = db.ingest([Path(p) for p in args.paths or ['reports']])
+        db.save()
+        print(f"⏱️  Recorded durations for {count} scenarios ({db.path})")
+        return 0
+
+    from utils.parallel_runner import _parse_locales, discover_scenarios
+
+    items = discover_scenarios(args.paths, args.tags, _parse_locales(os.getenv('LOCALES', '')))
+    buckets, loads = plan(items, max(1, args.shards), db)
+    for index, (bucket, load) in enumerate(zip(buckets, loads), start=1):
+        print(f"Shard {index}/{len(buckets)}: {len(bucket)} scenarios, ~{load:.1f}s")
+        for location in bucket:
+            print(f"  {location}")
+    print(f"Predicted makespan: {max(loads):.1f}s")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,441 @@
+"""
+Test Impact Analysis
+Maps every scenario (including each Scenario Outline row) to the locales it
+exercises, the translation keys its steps read, and the step modules, page
+objects and utils it depends on, then selects the scenarios affected by a
+set of changed files.
+
+Per-file analysis is cached by content hash in .cache/impact_index.json, so
+rebuilding after an edit only re-parses the files that changed.
+
+Usage:
+    python utils/impact_analysis.py build
+    python utils/impact_analysis.py select --diff origin/main
+    python utils/impact_analysis.py select --files locales/fr-FR/common.json
+    python utils/impact_analysis.py select --diff origin/main --format github >> "$GITHUB_OUTPUT"
+"""
+import argparse
+import ast
+import configparser
+import hashlib
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+sys.path.append('.')
+
+from utils.test_helpers import flatten_translations
+
+CACHE_FILE = Path('.cache/impact_index.json')
+CACHE_VERSION = 1
+FEATURES_DIR = Path('features')
+STEPS_DIR = FEATURES_DIR / 'steps'
+LOCALES_DIR = Path('locales')
+SOURCE_DIRS = (Path('features'), Path('utils'))
+
+# Changing any of these can affect every scenario
+GLOBAL_FILES = {'features/environment.py', 'behave.ini', 'requirements.txt', '.env', '.env.example'}
+GLOBAL_PREFIXES = ('.github/',)
+BEHAVE_CONFIG = Path('behave.ini')
+
+# Changes here never affect a scenario; any other file nothing is known to
+# depend on selects everything
+INERT_PREFIXES = ('docs/', 'tests/')
+INERT_FILES = {'.gitignore', 'LICENSE'}
+
+# Translation helpers: (function name, index of the key argument)
+TRANSLATION_CALLS = {'get_translation': 1, 't': 1, 'plural': 1}
+CATALOG_CALLS = {'load_locale_data', 'get_translations'}
+STEP_DECORATORS = {'given', 'when', 'then', 'step'}
+
+ALL = '*'
+
+def file_hash(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+def module_to_path(module: str, current: Path = None, level: int = 0) -> Optional[str]:
+    """Resolve an import to a repo file, or None for third-party modules"""
+    if level:
+        base = current.parent
+        for _ in range(level - 1):
+            base = base.parent
+        parts = list(base.parts) + (module.split('.') if module else [])
+    else:
+        parts = module.split('.')
+    candidate = Path(*parts)
+    for path in (candidate.with_suffix('.py'), candidate / '__init__.py'):
+        if path.exists():
+            return path.as_posix()
+    return None
+
+class _NameCollector(ast.NodeVisitor):
+    """Names, translation keys and catalog access inside one function"""
+
+    def __init__(self):
+        self.names: Set[str] = set()
+        self.keys: Set[str] = set()
+        self.dynamic_keys = False
+
+    def visit_Name(self, node):
+        self.names.add(node.id)
+
+    def visit_Call(self, node):
+        func = node.func.id if isinstance(node.func, ast.Name) else getattr(node.func, 'attr', None)
+        if func in TRANSLATION_CALLS:
+            index = TRANSLATION_CALLS[func]
+            arg = node.args[index] if len(node.args) > index else None
+            if isinstance(arg, ast.Constant) and isinstance(arg.value, str):
+                self.keys.add(arg.value)
+            else:
+                self.dynamic_keys = True
+        elif func in CATALOG_CALLS:
+            self.dynamic_keys = True
+        self.generic_visit(node)
+
+def analyze_python(path: Path) -> Dict:
+    """Imports, module-level functions and step definitions of one module"""
+    tree = ast.parse(path.read_text(encoding='utf-8'), filename=str(path))
+    imports: Dict[str, str] = {}
+    modules: Set[str] = set()
+    functions: Dict[str, Dict] = {}
+    steps: List[Dict] = []
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom):
+            target = module_to_path(node.module or '', path, node.level)
+            if target is None:
+                continue
+            modules.add(target)
+            for alias in node.names:
+                sub = module_to_path(f"{node.module}.{alias.name}" if node.module else alias.name, path, node.level)
+                imports[alias.asname or alias.name] = sub or target
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                target = module_to_path(alias.name)
+                if target is not None:
+                    modules.add(target)
+                    imports[alias.asname or alias.name.split('.')[0]] = target
+
+    for node in tree.body:
+        if not isinstance(node, ast.FunctionDef):
+            continue
+        collector = _NameCollector()
+        for statement in node.body:
+            collector.visit(statement)
+        functions[node.name] = {
+            'names': sorted(collector.names),
+            'keys': sorted(collector.keys),
+            'dynamic_keys': collector.dynamic_keys,
+        }
+        for decorator in node.decorator_list:
+            if (isinstance(decorator, ast.Call) and isinstance(decorator.func, ast.Name)
+                    and decorator.func.id in STEP_DECORATORS and decorator.args
+                    and isinstance(decorator.args[0], ast.Constant)):
+                steps.append({'type': decorator.func.id, 'pattern': decorator.args[0].value,
+                              'function': node.name})
+
+    return {'imports': imports, 'modules': sorted(modules), 'functions': functions, 'steps': steps}
+
+def analyze_feature(path: Path) -> List[Dict]:
+    """One record per scenario / outline row: location, tags, row values and steps"""
+    from behave.parser import parse_file
+
+    feature = parse_file(str(path))
+    if feature is None:
+        return []
+    background = list(feature.background.steps) if feature.background else []
+    scenarios = []
+    for scenario in feature.walk_scenarios():
+        row = getattr(scenario, '_row', None)
+        scenarios.append({
+            'location': f"{path.as_posix()}:{scenario.line}",
+            'name': scenario.name,
+            'tags': sorted(scenario.effective_tags),
+            'row': dict(zip(row.headings, row.cells)) if row is not None else {},
+            'steps': [[step.step_type, step.name] for step in background + list(scenario.steps)],
+        })
+    return scenarios
+
+class ImpactIndex:
+    """Scenario dependency index with a per-file content-hash cache"""
+
+    def __init__(self, cache_file: Path = CACHE_FILE):
+        self.cache_file = cache_file
+        self.files: Dict[str, Dict] = {}
+        self.reparsed: List[str] = []
+        self.scenarios: List[Dict] = []
+
+    def _load_cache(self) -> Dict:
+        try:
+            cache = json.loads(self.cache_file.read_text(encoding='utf-8'))
+        except (FileNotFoundError, ValueError):
+            return {}
+        return cache.get('files', {}) if cache.get('version') == CACHE_VERSION else {}
+
+    def _save_cache(self):
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        self.cache_file.write_text(json.dumps({'version': CACHE_VERSION, 'files': self.files}), encoding='utf-8')
+
+    def build(self, use_cache: bool = True) -> 'ImpactIndex':
+        """Analyze changed sources (reusing cached results) and resolve scenario dependencies"""
+        cached = self._load_cache() if use_cache else {}
+        sources = sorted({p for d in SOURCE_DIRS for p in d.rglob('*.py')} |
+                         set(FEATURES_DIR.rglob('*.feature')))
+        for path in sources:
+            key = path.as_posix()
+            digest = file_hash(path)
+            entry = cached.get(key)
+            if entry is None or entry['hash'] != digest:
+                analysis = analyze_feature(path) if path.suffix == '.feature' else analyze_python(path)
+                entry = {'hash': digest, 'analysis': analysis}
+                self.reparsed.append(key)
+            self.files[key] = entry
+        if self.reparsed or set(cached) != set(self.files):
+            self._save_cache()
+        self._resolve()
+        return self
+
+    def _closure(self, start: Iterable[str]) -> Set[str]:
+        """Repo modules reachable through imports"""
+        seen, stack = set(), list(start)
+        while stack:
+            path = stack.pop()
+            if path in seen or path not in self.files:
+                continue
+            seen.add(path)
+            stack.extend(self.files[path]['analysis']['modules'])
+        return seen
+
+    def _step_definitions(self) -> Dict[str, List[Dict]]:
+        """Compiled step patterns per step type, with their dependencies"""
+        import parse
+
+        definitions = {'given': [], 'when': [], 'then': []}
+        for module, entry in self.files.items():
+            if not module.startswith(STEPS_DIR.as_posix()) or not module.endswith('.py'):
+                continue
+            analysis = entry['analysis']
+            for step in analysis['steps']:
+                # Follow module-level helpers the step calls
+                names, keys, dynamic = set(), set(), False
+                pending, visited = [step['function']], set()
+                while pending:
+                    function = pending.pop()
+                    if function in visited or function not in analysis['functions']:
+                        continue
+                    visited.add(function)
+                    info = analysis['functions'][function]
+                    names.update(info['names'])
+                    keys.update(info['keys'])
+                    dynamic = dynamic or info['dynamic_keys']
+                    pending.extend(info['names'])
+
+                used = {analysis['imports'][name] for name in names if name in analysis['imports']}
+                definition = {
+                    'matcher': parse.compile(step['pattern']),
+                    'module': module,
+                    'files': sorted(self._closure(used) | {module}),
+                    'keys': [ALL] if dynamic else sorted(keys),
+                }
+                types = definitions if step['type'] == 'step' else {step['type']: None}
+                for step_type in types:
+                    definitions[step_type].append(definition)
+        return definitions
+
+    def _resolve(self):
+        definitions = self._step_definitions()
+        self.scenarios = []
+        for path, entry in self.files.items():
+            if not path.endswith('.feature'):
+                continue
+            for scenario in entry['analysis']:
+                locales, keys, files, unmatched = set(), set(), set(), []
+                if 'locale' in scenario['row']:
+                    locales.add(scenario['row']['locale'])
+                for step_type, text in scenario['steps']:
+                    for definition in definitions.get(step_type, []):
+                        match = definition['matcher'].parse(text)
+                        if match is None:
+                            continue
+                        if 'locale' in match.named:
+                            locales.add(match.named['locale'])
+                        keys.update(definition['keys'])
+                        files.update(definition['files'])
+                        break
+                    else:
+                        unmatched.append(text)
+
+                i18n = 'i18n' in scenario['tags']
+                if not locales:
+                    # Fan-out runs @i18n scenarios in every LOCALES entry
+                    locales.add(ALL if i18n else 'default')
+                if i18n:
+                    # Localized UI: any rendered string may come from the catalog
+                    keys = {ALL}
+                self.scenarios.append(dict(
+                    scenario,
+                    locales=sorted(locales),
+                    keys=sorted(keys),
+                    files=sorted(files),
+                    page_objects=sorted(f for f in files if f.startswith('features/pages/')),
+                    unmatched_steps=unmatched,
+                ))
+        self.scenarios.sort(key=lambda s: (s['location'].rsplit(':', 1)[0], int(s['location'].rsplit(':', 1)[1])))
+
+    def global_files(self) -> Set[str]:
+        """
+        Files every scenario depends on: environment, the formatters registered
+        in behave.ini, their imports, and configuration
+        """
+        return GLOBAL_FILES | self._closure(['features/environment.py', *formatter_modules()])
+
+    def is_known(self, path: str) -> bool:
+        """Feature-side source the index resolves precisely (steps, page objects)"""
+        return path in self.files and path.startswith(FEATURES_DIR.as_posix() + '/')
+
+def formatter_modules(config: Path = BEHAVE_CONFIG) -> List[str]:
+    """Repo modules of the custom formatters registered in behave.ini"""
+    parser = configparser.ConfigParser()
+    try:
+        parser.read_string(config.read_text(encoding='utf-8'))
+    except (FileNotFoundError, configparser.Error):
+        return []
+    if not parser.has_section('behave.formatters'):
+        return []
+    modules = (module_to_path(value.split(':', 1)[0].strip()) for value in parser['behave.formatters'].values())
+    return sorted({module for module in modules if module})
+
+def is_inert(path: str) -> bool:
+    """Documentation and unit tests: never part of a behave run"""
+    return path in INERT_FILES or path.endswith('.md') or path.startswith(INERT_PREFIXES)
+
+def changed_catalog_keys(path: str, base: Optional[str]) -> Set[str]:
+    """Dotted keys whose value differs between `base` and the working tree"""
+    if base is None or not path.endswith('common.json'):
+        return {ALL}
+
+    def flat(content: Optional[str]) -> Dict:
+        try:
+            return flatten_translations(json.loads(content)) if content else {}
+        except ValueError:
+            return {}
+
+    old = subprocess.run(['git', 'show', f"{base}:{path}"], capture_output=True, text=True)
+    current = Path(path).read_text(encoding='utf-8') if Path(path).exists() else None
+    before, after = flat(old.stdout if old.returncode == 0 else None), flat(current)
+    if not before or not after:
+        return {ALL}
+    return {key for key in before.keys() | after.keys()
+            if before.get(key) != after.get(key) and not isinstance(after.get(key, before.get(key)), dict)}
+
+def _keys_overlap(scenario_keys: Iterable[str], changed: Set[str]) -> bool:
+    scenario_keys = set(scenario_keys)
+    if ALL in scenario_keys or ALL in changed:
+        return True
+    return any(changed_key == key or changed_key.startswith(f"{key}.")
+               for key in scenario_keys for changed_key in changed)
+
+def git_changed_files(base: str) -> List[str]:
+    """Files changed between `base` and the working tree"""
+    result = subprocess.run(['git', 'diff', '--name-only', base], capture_output=True, text=True, check=True)
+    return [line for line in result.stdout.splitlines() if line]
+
+def select_scenarios(index: ImpactIndex, changed_files: Iterable[str], base: str = None) -> Dict:
+    """
+    Scenarios affected by the changed files and the locales to run them in.
+    A catalog change only needs its own locale; any other change needs every
+    locale the scenario exercises.
+    """
+    default_locale = os.getenv('LOCALE', 'en-US')
+    all_locales = sorted(p.name for p in LOCALES_DIR.iterdir() if p.is_dir())
+    global_files = index.global_files()
+    reasons: Dict[str, List[str]] = {}
+    run_locales: Dict[str, Set[str]] = {}
+
+    def scenario_locales(scenario) -> Set[str]:
+        locales = set()
+        for locale in scenario['locales']:
+            locales.update(all_locales if locale == ALL else [default_locale if locale == 'default' else locale])
+        return locales
+
+    def add(scenario, reason, locales):
+        reasons.setdefault(scenario['location'], []).append(reason)
+        run_locales.setdefault(scenario['location'], set()).update(locales)
+
+    for changed in changed_files:
+        parts = Path(changed).parts
+        if changed in global_files or changed.startswith(GLOBAL_PREFIXES):
+            for scenario in index.scenarios:
+                add(scenario, changed, scenario_locales(scenario))
+        elif len(parts) >= 3 and parts[0] == LOCALES_DIR.name and changed.endswith('.json'):
+            locale = parts[1]
+            keys = changed_catalog_keys(changed, base)
+            for scenario in index.scenarios:
+                if locale in scenario_locales(scenario) and _keys_overlap(scenario['keys'], keys):
+                    add(scenario, f"{changed} ({', '.join(sorted(keys))})", {locale})
+        elif changed.endswith('.feature'):
+            for scenario in index.scenarios:
+                if scenario['location'].rsplit(':', 1)[0] == changed:
+                    add(scenario, changed, scenario_locales(scenario))
+        else:
+            dependents = [s for s in index.scenarios if changed in s['files']]
+            if not dependents and not index.is_known(changed) and not is_inert(changed):
+                # Runner scripts, CI and config files, unanalyzed code: assume everything
+                dependents, changed = index.scenarios, f"{changed} (unknown impact)"
+            for scenario in dependents:
+                add(scenario, changed, scenario_locales(scenario))
+
+    selected = [s['location'] for s in index.scenarios if s['location'] in reasons]
+    return {
+        'scenarios': selected,
+        'locales': sorted(set().union(*run_locales.values())) if run_locales else [],
+        'reasons': reasons,
+    }
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Select scenarios affected by changed files')
+    parser.add_argument('--no-cache', action='store_true', help='Re-analyze every file')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build = commands.add_parser('build', help='Build (or refresh) the dependency index')
+    build.add_argument('--show', action='store_true', help='Print every scenario and its dependencies')
+
+    select = commands.add_parser('select', help='Print the scenarios and locales to run')
+    source = select.add_mutually_exclusive_group(required=True)
+    source.add_argument('--diff', metavar='REV', help='Use files changed since REV (git diff --name-only)')
+    source.add_argument('--files', nargs='+', help='Changed files')
+    select.add_argument('--format', choices=['text', 'json', 'github'], default='text')
+    args = parser.parse_args(argv)
+
+    index = ImpactIndex().build(use_cache=not args.no_cache)
+
+    if args.command == 'build':
+        print(f"📇 Indexed {len(index.scenarios)} scenarios "
+              f"({len(index.reparsed)} of {len(index.files)} files re-analyzed)")
+        if args.show:
+            for scenario in index.scenarios:
+                print(f"{scenario['location']}  locales={','.join(scenario['locales'])}  "
+                      f"keys={','.join(scenario['keys']) or '-'}  files={','.join(scenario['files'])}")
+        return 0
+
+    changed = git_changed_files(args.diff) if args.diff else args.files
+    selection = select_scenarios(index, changed, base=args.diff)
+
+    if args.format == 'json':
+        print(json.dumps(selection, indent=2))
+    elif args.format == 'github':
+        print(f"scenarios={' '.join(selection['scenarios'])}")
+        print(f"locales={','.join(selection['locales'])}")
+        print(f"count={len(selection['scenarios'])}")
+    else:
+        for location in selection['scenarios']:
+            print(location)
+        print(f"🎯 {len(selection['scenarios'])} of {len(index.scenarios)} scenarios, "
+              f"locales: {', '.join(selection['locales']) or '-'}", file=sys.stderr)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""
+Run Instrumentation
+Wall-time recording for hooks, steps and Playwright calls, exported as a
+JSON timeline and a Chrome trace-event file (open in Perfetto or
+chrome://tracing)
+"""
+import functools
+import inspect
+import json
+import os
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Page/Locator methods that only build objects client-side (no browser round-trip)
+UNTIMED_METHODS = {
+    'locator', 'nth', 'filter', 'frame_locator', 'and_', 'or_',
+    'get_by_alt_text', 'get_by_label', 'get_by_placeholder', 'get_by_role',
+    'get_by_test_id', 'get_by_text', 'get_by_title',
+    'on', 'once', 'remove_listener', 'is_closed',
+}
+
+class Timeline:
+    def __init__(self):
+        self.enabled = False
+        self.events: List[Dict] = []
+        self._origin = time.perf_counter()
+        self._open: Dict[int, float] = {}
+
+    def enable(self):
+        """Start recording and wrap Playwright Page/Locator calls"""
+        self.enabled = True
+        instrument_playwright(self)
+
+    def add(self, name: str, cat: str, start: float, end: float, args: Optional[Dict] = None):
+        """Record a finished span (perf_counter timestamps)"""
+        self.events.append({
+            'name': name,
+            'cat': cat,
+            'start_ms': round((start - self._origin) * 1000, 3),
+            'duration_ms': round((end - start) * 1000, 3),
+            'args': args or {},
+        })
+
+    @contextmanager
+    def span(self, name: str, cat: str, **args):
+        """Time a block of code"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, cat, start, time.perf_counter(), args)
+
+    def begin(self, obj):
+        """Mark the start of an object's span (paired with end())"""
+        if self.enabled:
+            self._open[id(obj)] = time.perf_counter()
+
+    def end(self, obj, name: str, cat: str, **args):
+        """Record the span opened by begin()"""
+        start = self._open.pop(id(obj), None)
+        if start is not None:
+            self.add(name, cat, start, time.perf_counter(), args)
+
+    def timed(self, name: str, cat: str = 'hook'):
+        """Decorator recording each call of a function"""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    if self.enabled:
+                        self.add(name, cat, start, time.perf_counter())
+            return wrapper
+        return decorator
+
+    def to_chrome_trace(self) -> Dict:
+        """Chrome trace-event format (complete 'X' events, microseconds)"""
+        pid = os.getpid()
+        return {
+            'traceEvents': [
+                {
+                    'name': e['name'],
+                    'cat': e['cat'],
+                    'ph': 'X',
+                    'ts': round(e['start_ms'] * 1000),
+                    'dur': round(e['duration_ms'] * 1000),
+                    'pid': pid,
+                    'tid': 1,
+                    'args': e['args'],
+                }
+                for e in self.events
+            ],
+            'displayTimeUnit': 'ms',
+        }
+
+    def write(self, output_dir: str = 'reports', suffix: str = '') -> List[Path]:
+        """Write timeline.json and chrome-trace.json"""
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        timeline_path = output_dir / f"timeline{suffix}.json"
+        trace_path = output_dir / f"chrome-trace{suffix}.json"
+        timeline_path.write_text(json.dumps(self.events, indent=1), encoding='utf-8')
+        trace_path.write_text(json.dumps(self.to_chrome_trace()), encoding='utf-8')
+        return [timeline_path, trace_path]
+
+    def aggregate(self, cat: str) -> List[Dict]:
+        """Per-name totals for a category, slowest total first"""
+        totals = defaultdict(lambda: {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+        for e in self.events:
+            if e['cat'] != cat:
+                continue
+            t = totals[e['name']]
+            t['count'] += 1
+            t['total_ms'] += e['duration_ms']
+            t['max_ms'] = max(t['max_ms'], e['duration_ms'])
+        return sorted(
+            ({'name': name, **t} for name, t in totals.items()),
+            key=lambda t: t['total_ms'], reverse=True
+        )
+
+    def summary(self, limit: int = 10) -> str:
+        """Slowest steps, Playwright calls and hooks"""
+        lines = []
+        sections = (
+            ('Slowest steps', 'step'),
+            ('Slowest calls', 'playwright'),
+            ('Browser', 'browser'),
+            ('Waits', 'wait'),
+            ('Hooks', 'hook'),
+        )
+        for title, cat in sections:
+            rows = self.aggregate(cat)[:limit]
+            if not rows:
+                continue
+            lines.append(f"⏱️  {title}:")
+            for row in rows:
+                lines.append(
+                    f"  {row['total_ms']:10.1f} ms  {row['count']:5d}x  "
+                    f"max {row['max_ms']:8.1f} ms  {row['name']}"
+                )
+        return "\n".join(lines)
+
+def _timed_method(timeline: Timeline, name: str, fn):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not timeline.enabled:
+            return fn(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            timeline.add(name, 'playwright', start, time.perf_counter())
+    wrapper.__timed__ = True
+    return wrapper
+
+def instrument_playwright(timeline: Timeline):
+    """Wrap public Page and Locator methods that talk to the browser"""
+    from playwright.sync_api import Locator, Page
+
+    for cls in (Page, Locator):
+        for name, fn in list(vars(cls).items()):
+            if name.startswith('_') or name in UNTIMED_METHODS:
+                continue
+            if not inspect.isfunction(fn) or getattr(fn, '__timed__', False):
+                continue
+            setattr(cls, name, _timed_method(timeline, f"{cls.__name__}.{name}", fn))
+
+# Shared timeline used by features/environment.py
+timeline = Timeline()
@@ -0,0 +1,125 @@
+"""
+Layout Checks
+Single-pass text overflow detection for localized pages
+"""
+from typing import Dict, List, Optional
+
+# Elements measured per page.evaluate call on large documents
+OVERFLOW_CHUNK_SIZE = 500
+
+# Collect the boxes that hold text once and park them on window for chunked measuring.
+# Inline elements (<a>, <span>, <strong>...) never clip, so each text node is
+# measured against its nearest non-inline ancestor
+_COLLECT_TEXT_ELEMENTS_JS = """
+({ root }) => {
+    const scope = root ? document.querySelector(root) : document.body;
+    if (!scope) {
+        throw new Error(`Overflow scan root not found: ${root}`);
+    }
+    const walker = document.createTreeWalker(scope, NodeFilter.SHOW_TEXT, {
+        acceptNode: (node) => node.nodeValue.trim()
+            ? NodeFilter.FILTER_ACCEPT
+            : NodeFilter.FILTER_REJECT
+    });
+    const containers = new Map();
+    const container = (el) => {
+        const inlines = [];
+        while (el && el !== document.body && !containers.has(el)
+               && ['inline', 'contents'].includes(getComputedStyle(el).display)) {
+            inlines.push(el);
+            el = el.parentElement;
+        }
+        const box = containers.has(el) ? containers.get(el) : el;
+        for (const node of [...inlines, el]) {
+            containers.set(node, box);
+        }
+        return box;
+    };
+    const elements = new Set();
+    while (walker.nextNode()) {
+        const box = container(walker.currentNode.parentElement);
+        if (box && box !== document.documentElement && box !== document.body) {
+            elements.add(box);
+        }
+    }
+    window.__overflowScan = Array.from(elements);
+    return window.__overflowScan.length;
+}
+"""
+
+# Measure one slice: all reads, no writes, so layout is flushed at most once
+_MEASURE_OVERFLOW_JS = """
+({ start, end, tolerance }) => {
+    const scrollable = new Set(['auto', 'scroll']);
+    const selectorPath = (el) => {
+        const parts = [];
+        for (let node = el; node && node.nodeType === 1 && node !== document.body; node = node.parentElement) {
+            if (node.id) {
+                parts.unshift(`#${CSS.escape(node.id)}`);
+                break;
+            }
+            let part = node.localName;
+            const parent = node.parentElement;
+            if (parent) {
+                const siblings = Array.from(parent.children).filter((c) => c.localName === node.localName);
+                if (siblings.length > 1) {
+                    part += `:nth-of-type(${siblings.indexOf(node) + 1})`;
+                }
+            }
+            parts.unshift(part);
+        }
+        return parts.join(' > ');
+    };
+
+    const offenders = [];
+    for (const el of window.__overflowScan.slice(start, end)) {
+        if (!el.isConnected || (el.clientWidth === 0 && el.clientHeight === 0)) {
+            continue;
+        }
+        const style = getComputedStyle(el);
+        if (style.display === 'inline' || style.visibility === 'hidden') {
+            continue;
+        }
+        const overflowX = scrollable.has(style.overflowX) ? 0 : el.scrollWidth - el.clientWidth;
+        const overflowY = scrollable.has(style.overflowY) ? 0 : el.scrollHeight - el.clientHeight;
+        if (overflowX > tolerance || overflowY > tolerance) {
+            offenders.push({
+                selector: selectorPath(el),
+                text: el.textContent.trim().slice(0, 80),
+                overflow_x: Math.max(overflowX, 0),
+                overflow_y: Math.max(overflowY, 0),
+            });
+        }
+    }
+    return offenders;
+}
+"""
+
+def find_text_overflow(page, root_selector: Optional[str] = None,
+                       chunk_size: int = OVERFLOW_CHUNK_SIZE, tolerance: int = 1) -> List[Dict]:
+    """
+    Return text-bearing elements whose content overflows their box.
+    Intentionally scrollable containers (overflow auto/scroll) are ignored.
+    Each offender has: selector, text, overflow_x, overflow_y (px).
+    """
+    total = page.evaluate(_COLLECT_TEXT_ELEMENTS_JS, {'root': root_selector})
+    offenders = []
+    try:
+        for start in range(0, total, chunk_size):
+            offenders.extend(page.evaluate(
+                _MEASURE_OVERFLOW_JS,
+                {'start': start, 'end': start + chunk_size, 'tolerance': tolerance}
+            ))
+    finally:
+        page.evaluate("() => { delete window.__overflowScan; }")
+    return offenders
+
+def format_overflow_report(offenders: List[Dict], limit: int = 10) -> str:
+    """Human readable summary of overflow offenders"""
+    lines = [
+        f"  - {o['selector']} ({o['overflow_x']}px x, {o['overflow_y']}px y): '{o['text']}'"
+        for o in offenders[:limit]
+    ]
+    if len(offenders) > limit:
+        lines.append(f"  ... and {len(offenders) - limit} more")
+    return "\n".join(lines)
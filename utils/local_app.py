@@ -0,0 +1,253 @@
+"""
+Local Stand-in Application
+Lightweight HTTP app rendered from locales/<locale>/common.json, so the
+login and i18n features can run without the public demo sites
+
+Pages: /login, /dashboard, /, /products, /cart
+Locale comes from ?locale=xx-XX or the Accept-Language header.
+
+Usage:
+    python utils/local_app.py --port 3000
+"""
+import argparse
+import hashlib
+import html
+import sys
+import threading
+from datetime import date
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+sys.path.append('.')
+
+from utils.test_helpers import is_rtl_locale
+from utils import message_format
+
+DEFAULT_LOCALE = 'en-US'
+
+# Accounts used by features/login.feature
+TEST_USERS = {
+    'testuser@example.com': 'Test@123',
+    'admin@example.com': 'Admin@123',
+    'user@example.com': 'User@123',
+}
+
+# Set on a successful login; /dashboard redirects to /login without it
+SESSION_COOKIE = 'session=local-app'
+
+PRODUCTS = [('Laptop', 999.99), ('Headphones', 149.5), ('Keyboard', 79.0)]
+
+STYLE = """
+* { box-sizing: border-box; }
+body { margin: 0; font-family: sans-serif; overflow-wrap: anywhere; }
+nav ul { display: flex; flex-wrap: wrap; gap: 12px; margin: 0; padding: 12px; list-style: none; }
+main { max-width: 960px; margin: 0 auto; padding: 16px; }
+form { display: flex; flex-direction: column; gap: 8px; max-width: 360px; }
+.error-message { color: #b00020; }
+"""
+
+@lru_cache(maxsize=1)
+def available_locales() -> Tuple[str, ...]:
+    """Locale directories shipped in locales/"""
+    return tuple(sorted(p.name for p in Path('locales').iterdir() if (p / 'common.json').exists()))
+
+def negotiate_locale(query_locale: Optional[str], accept_language: Optional[str]) -> str:
+    """Pick a supported locale from ?locale= or Accept-Language"""
+    supported = available_locales()
+    candidates = [query_locale] if query_locale else []
+    for part in (accept_language or '').split(','):
+        tag = part.split(';')[0].strip()
+        if tag:
+            candidates.append(tag)
+
+    for candidate in candidates:
+        if candidate in supported:
+            return candidate
+        language = candidate.split('-')[0].lower()
+        for locale in supported:
+            if locale.split('-')[0].lower() == language:
+                return locale
+    return DEFAULT_LOCALE
+
+def t(locale: str, key: str, **params) -> str:
+    """Translated, HTML-escaped text with {{placeholders}} filled in"""
+    value = message_format.format_message(locale, key, **params)
+    if value is None:
+        return f"[missing] {html.escape(key)}"
+    return html.escape(value)
+
+def plural(locale: str, key: str, count: int) -> str:
+    """Plural group rendered with the locale's CLDR plural rules"""
+    return t(locale, key, count=count)
+
+def format_date(locale: str, value: date) -> str:
+    return html.escape(message_format.format_date(locale, value))
+
+def format_currency(locale: str, amount: float) -> str:
+    return html.escape(message_format.format_currency(locale, amount))
+
+def layout(locale: str, title: str, body: str) -> str:
+    direction = 'rtl' if is_rtl_locale(locale) else 'ltr'
+    nav = "".join(
+        f'<li><a href="{href}">{t(locale, f"nav.{key}")}</a></li>'
+        for key, href in (('home', '/'), ('products', '/products'), ('cart', '/cart'),
+                          ('about', '/about'), ('contact', '/contact'))
+    )
+    return f"""<!DOCTYPE html>
+<html lang="{locale}" dir="{direction}">
+<head><meta charset="utf-8"><meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title}</title><style>{STYLE}</style></head>
+<body><nav><ul>{nav}</ul></nav><main>{body}</main></body>
+</html>"""
+
+@lru_cache(maxsize=512)
+def render_page(path: str, locale: str, today: date, error: bool = False) -> Optional[str]:
+    """Render a page (cached per path, locale, day and error state)"""
+    if path == '/login':
+        error_html = f'<p class="error-message">{t(locale, "login.error")}</p>' if error else ''
+        # No "forgot password" link: its text contains the password label and
+        # would make `text=<password label>` ambiguous in the login features
+        body = f"""<h1>{t(locale, 'login.title')}</h1>{error_html}
+<form method="post" action="/login">
+  <label for="username">{t(locale, 'login.username')}</label>
+  <input id="username" name="username" autocomplete="username">
+  <label for="password">{t(locale, 'login.password')}</label>
+  <input id="password" name="password" type="password" autocomplete="current-password">
+  <button type="submit">{t(locale, 'login.submit')}</button>
+</form>"""
+        return layout(locale, t(locale, 'login.title'), body)
+
+    if path == '/dashboard':
+        return layout(locale, 'Dashboard', f"<h1>Dashboard</h1><p>{t(locale, 'login.success')}</p>")
+
+    if path == '/':
+        body = f"""<h1>{t(locale, 'welcome')}</h1>
+<p>{t(locale, 'greeting', name='Alex')}</p>
+<p class="date">{t(locale, 'date.today')}: {format_date(locale, today)}</p>
+<p class="items">{plural(locale, 'items', len(PRODUCTS))}</p>"""
+        return layout(locale, t(locale, 'welcome'), body)
+
+    if path == '/products':
+        rows = "".join(
+            f'<li><span class="name">{html.escape(name)}</span> '
+            f'<span class="price">{format_currency(locale, price)}</span></li>'
+            for name, price in PRODUCTS
+        )
+        return layout(locale, t(locale, 'nav.products'), f"<h1>{t(locale, 'nav.products')}</h1><ul>{rows}</ul>")
+
+    if path == '/cart':
+        total = sum(price for _, price in PRODUCTS[:2])
+        body = f"""<h1>{t(locale, 'nav.cart')}</h1>
+<p class="items">{plural(locale, 'items', 2)}</p>
+<p class="total">{format_currency(locale, total)}</p>"""
+        return layout(locale, t(locale, 'nav.cart'), body)
+
+    if path in ('/about', '/contact'):
+        key = f"nav.{path[1:]}"
+        return layout(locale, t(locale, key), f"<h1>{t(locale, key)}</h1>")
+
+    return None
+
+class LocalAppHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _locale(self, query: Dict) -> str:
+        return negotiate_locale(query.get('locale', [None])[0], self.headers.get('Accept-Language'))
+
+    def _send(self, status: int, body: str = '', headers: Dict = None, cacheable: bool = True):
+        payload = body.encode('utf-8')
+        etag = f'"{hashlib.sha1(payload).hexdigest()}"'
+        if cacheable and status == 200 and self.headers.get('If-None-Match') == etag:
+            status, payload = 304, b''
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.send_header('Vary', 'Accept-Language')
+        if cacheable:
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'public, max-age=300')
+        else:
+            self.send_header('Cache-Control', 'no-store')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(payload)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        locale = self._locale(parse_qs(url.query))
+        path = url.path.rstrip('/') or '/'
+        if path == '/dashboard' and SESSION_COOKIE not in self.headers.get('Cookie', ''):
+            location = f"/login?{url.query}" if url.query else '/login'
+            self._send(303, '', {'Location': location}, cacheable=False)
+            return
+        page = render_page(path, locale, date.today())
+        if page is None:
+            self._send(404, layout(locale, 'Not Found', '<h1>404</h1>'), cacheable=False)
+        else:
+            self._send(200, page, cacheable=path != '/dashboard')
+
+    do_HEAD = do_GET
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != '/login':
+            self._send(404, '', cacheable=False)
+            return
+        length = int(self.headers.get('Content-Length', 0))
+        form = parse_qs(self.rfile.read(length).decode('utf-8'))
+        username = form.get('username', [''])[0]
+        password = form.get('password', [''])[0]
+
+        if TEST_USERS.get(username) == password:
+            self._send(303, '', {'Location': '/dashboard', 'Set-Cookie': f'{SESSION_COOKIE}; Path=/'}, cacheable=False)
+        else:
+            locale = self._locale(parse_qs(url.query))
+            self._send(200, render_page('/login', locale, date.today(), error=True), cacheable=False)
+
+class LocalApp:
+    """Threaded local app server, safe to share between parallel workers"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0):
+        self.server = ThreadingHTTPServer((host, port), LocalAppHandler)
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'LocalApp':
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Serve the local stand-in application')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=3000)
+    args = parser.parse_args(argv)
+
+    app = LocalApp(args.host, args.port)
+    print(f"🌐 Local app running at {app.url} (Ctrl+C to stop)")
+    try:
+        app.server.serve_forever()
+    except KeyboardInterrupt:
+        app.stop()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,261 @@
+"""
+Message Formatting
+Compiles catalog entries into cached callables that render the text a
+localized page is expected to show: {{placeholder}} interpolation, CLDR
+plural selection, and locale-aware number, currency and date formatting.
+
+    format_message('de-DE', 'items', count=3)        -> '3 Artikel'
+    format_currency('ja-JP', 1000)                   -> '¥1,000'
+    format_messages('ar-SA', [('items', {'count': 0}), ('greeting', {'name': 'Sam'})])
+"""
+import re
+import threading
+from datetime import date
+from decimal import ROUND_HALF_UP, Decimal
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from utils.test_helpers import catalog
+
+PLACEHOLDER_PATTERN = re.compile(r'\{\{\s*(\w+)\s*\}\}')
+PLURAL_CATEGORIES = ('zero', 'one', 'two', 'few', 'many', 'other')
+
+def _operands(n) -> Tuple[Decimal, int, int]:
+    """CLDR plural operands: absolute value n, integer digits i, visible fraction digits v"""
+    value = abs(Decimal(str(n)))
+    exponent = value.as_tuple().exponent
+    return value, int(value), max(0, -exponent) if isinstance(exponent, int) else 0
+
+def _plural_en(n):
+    _, i, v = _operands(n)
+    return 'one' if i == 1 and v == 0 else 'other'
+
+def _plural_fr(n):
+    _, i, v = _operands(n)
+    if i in (0, 1):
+        return 'one'
+    if i != 0 and i % 1000000 == 0 and v == 0:
+        return 'many'
+    return 'other'
+
+def _plural_es(n):
+    value, i, v = _operands(n)
+    if value == 1:
+        return 'one'
+    if i != 0 and i % 1000000 == 0 and v == 0:
+        return 'many'
+    return 'other'
+
+def _plural_ar(n):
+    value, _, _ = _operands(n)
+    if value == 0:
+        return 'zero'
+    if value == 1:
+        return 'one'
+    if value == 2:
+        return 'two'
+    if value == value.to_integral_value():
+        mod100 = int(value) % 100
+        if 3 <= mod100 <= 10:
+            return 'few'
+        if 11 <= mod100 <= 99:
+            return 'many'
+    return 'other'
+
+def _plural_other(n):
+    return 'other'
+
+# CLDR cardinal plural rules by language
+PLURAL_RULES: Dict[str, Callable[[Any], str]] = {
+    'en': _plural_en,
+    'de': _plural_en,
+    'es': _plural_es,
+    'fr': _plural_fr,
+    'ar': _plural_ar,
+    'ja': _plural_other,
+}
+
+# CLDR number symbols and default currency per locale
+LOCALE_NUMBERS = {
+    'en-US': {'decimal': '.', 'group': ',', 'min_grouping': 1, 'digits': None, 'currency': 'USD'},
+    'de-DE': {'decimal': ',', 'group': '.', 'min_grouping': 1, 'digits': None, 'currency': 'EUR'},
+    'fr-FR': {'decimal': ',', 'group': ' ', 'min_grouping': 1, 'digits': None, 'currency': 'EUR'},
+    'es-ES': {'decimal': ',', 'group': '.', 'min_grouping': 2, 'digits': None, 'currency': 'EUR'},
+    'ja-JP': {'decimal': '.', 'group': ',', 'min_grouping': 1, 'digits': None, 'currency': 'JPY'},
+    'ar-SA': {'decimal': '٫', 'group': '٬', 'min_grouping': 1,
+              'digits': '٠١٢٣٤٥٦٧٨٩', 'currency': 'SAR'},
+}
+
+# ISO 4217 minor units and fallback symbols
+CURRENCIES = {
+    'USD': {'symbol': '$', 'fraction_digits': 2},
+    'EUR': {'symbol': '€', 'fraction_digits': 2},
+    'JPY': {'symbol': '¥', 'fraction_digits': 0},
+    'SAR': {'symbol': 'ر.س', 'fraction_digits': 2},
+}
+
+DEFAULT_DATE_PATTERN = 'YYYY-MM-DD'
+
+# Categories each language's rules can select (what a complete plural group needs)
+LANGUAGE_PLURAL_CATEGORIES: Dict[str, Tuple[str, ...]] = {
+    'en': ('one', 'other'),
+    'de': ('one', 'other'),
+    'es': ('one', 'many', 'other'),
+    'fr': ('one', 'many', 'other'),
+    'ar': ('zero', 'one', 'two', 'few', 'many', 'other'),
+    'ja': ('other',),
+}
+
+def plural_categories(locale: str) -> Tuple[str, ...]:
+    """CLDR plural categories of the locale's language"""
+    return LANGUAGE_PLURAL_CATEGORIES.get(locale.split('-')[0].lower(), ('one', 'other'))
+
+def plural_category(locale: str, n) -> str:
+    """CLDR plural category of n for the locale's language"""
+    language = locale.split('-')[0].lower()
+    return PLURAL_RULES.get(language, _plural_en)(n)
+
+def _number_symbols(locale: str) -> Dict:
+    return LOCALE_NUMBERS.get(locale, LOCALE_NUMBERS['en-US'])
+
+def format_number(locale: str, value, min_fraction: int = 0, max_fraction: int = 3) -> str:
+    """Locale grouping, decimal separator and digits; rounds half away from zero to max_fraction"""
+    symbols = _number_symbols(locale)
+    number = Decimal(str(value))
+    quantized = abs(number).quantize(Decimal(1).scaleb(-max_fraction), rounding=ROUND_HALF_UP)
+    sign = '-' if number < 0 and quantized else ''
+    integer, _, fraction = f"{quantized:f}".partition('.')
+    fraction = fraction.rstrip('0').ljust(min_fraction, '0')
+
+    if len(integer) >= 4 + symbols['min_grouping'] - 1:
+        groups = []
+        while len(integer) > 3:
+            integer, groups = integer[:-3], [integer[-3:]] + groups
+        integer = symbols['group'].join([integer] + groups)
+
+    text = sign + integer + (symbols['decimal'] + fraction if fraction else '')
+    if symbols['digits']:
+        text = text.translate(str.maketrans('0123456789', symbols['digits']))
+    return text
+
+def currency_symbol(locale: str) -> str:
+    """Symbol from the catalog, else the locale currency's default symbol"""
+    symbol = catalog.get(locale, 'currency.symbol') if _has_catalog(locale) else None
+    if isinstance(symbol, str):
+        return symbol
+    return CURRENCIES[_number_symbols(locale)['currency']]['symbol']
+
+def format_currency(locale: str, amount) -> str:
+    """Amount with the currency's minor units, placed by the catalog's currency.format"""
+    digits = CURRENCIES[_number_symbols(locale)['currency']]['fraction_digits']
+    formatted = format_number(locale, amount, digits, digits)
+    message = formatter(locale).format('currency.format', amount=formatted) if _has_catalog(locale) else None
+    return message if message is not None else f"{currency_symbol(locale)}{formatted}"
+
+def date_pattern(locale: str) -> str:
+    """Date pattern (e.g. DD.MM.YYYY) from the catalog"""
+    pattern = catalog.get(locale, 'date.format') if _has_catalog(locale) else None
+    return pattern if isinstance(pattern, str) else DEFAULT_DATE_PATTERN
+
+def format_date(locale: str, value: date) -> str:
+    """Render a date with the locale's pattern"""
+    return (date_pattern(locale).replace('YYYY', f"{value.year:04d}")
+                                .replace('MM', f"{value.month:02d}")
+                                .replace('DD', f"{value.day:02d}"))
+
+def _has_catalog(locale: str) -> bool:
+    return (catalog.locales_dir / locale / 'common.json').exists()
+
+def _compile_text(locale: str, text: str) -> Callable[..., str]:
+    """Split a template once; numbers are formatted for the locale at call time"""
+    parts = PLACEHOLDER_PATTERN.split(text)
+    literals, names = parts[0::2], parts[1::2]
+
+    def render(**args) -> str:
+        out = [literals[0]]
+        for name, literal in zip(names, literals[1:]):
+            value = args.get(name)
+            if value is None:
+                out.append(f"{{{{{name}}}}}")
+            elif isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+                out.append(format_number(locale, value))
+            else:
+                out.append(str(value))
+            out.append(literal)
+        return ''.join(out)
+    return render
+
+def _compile_plural(locale: str, branches: Mapping[str, str]) -> Callable[..., str]:
+    """
+    Pick a branch by `count`: an explicit zero branch wins for 0 (like ICU =0),
+    then the CLDR category, then other.
+    """
+    compiled = {form: _compile_text(locale, text) for form, text in branches.items()
+                if form in PLURAL_CATEGORIES and isinstance(text, str)}
+
+    def render(count=0, **args) -> str:
+        form = 'zero' if count == 0 and 'zero' in compiled else plural_category(locale, count)
+        return compiled.get(form, compiled.get('other'))(count=count, **args)
+    return render
+
+def _is_plural_group(value) -> bool:
+    return isinstance(value, dict) and 'other' in value and set(value) <= set(PLURAL_CATEGORIES)
+
+class MessageFormatter:
+    """Compiled, cached messages for one locale; recompiles when the catalog file changes"""
+
+    def __init__(self, locale: str, file: str = 'common.json'):
+        self.locale = locale
+        self.file = file
+        self._compiled: Dict[str, Callable[..., str]] = {}
+        self._version = None
+        self._lock = threading.Lock()
+
+    def compile(self, key: str) -> Optional[Callable[..., str]]:
+        """Callable rendering `key`, or None if the key is missing or not a message"""
+        version = catalog.version(self.locale, self.file)
+        with self._lock:
+            if version != self._version:
+                self._compiled.clear()
+                self._version = version
+            if key in self._compiled:
+                return self._compiled[key]
+
+        value = catalog.get(self.locale, key, self.file)
+        if isinstance(value, str):
+            compiled = _compile_text(self.locale, value)
+        elif _is_plural_group(value):
+            compiled = _compile_plural(self.locale, value)
+        else:
+            compiled = None
+        with self._lock:
+            self._compiled[key] = compiled
+        return compiled
+
+    def format(self, key: str, **args) -> Optional[str]:
+        """Rendered message, or None if the key is missing"""
+        compiled = self.compile(key)
+        return compiled(**args) if compiled else None
+
+    def format_many(self, items: Iterable[Tuple[str, Mapping]]) -> List[Optional[str]]:
+        """Render many (key, args) pairs; each key is compiled once for the batch"""
+        items = list(items)
+        compiled = {key: self.compile(key) for key in {key for key, _ in items}}
+        return [compiled[key](**args) if compiled[key] else None for key, args in items]
+
+@lru_cache(maxsize=None)
+def formatter(locale: str, file: str = 'common.json') -> MessageFormatter:
+    """Shared formatter per locale"""
+    return MessageFormatter(locale, file)
+
+def format_message(locale: str, key: str, **args) -> Optional[str]:
+    return formatter(locale).format(key, **args)
+
+def format_messages(locale: str, items: Iterable[Tuple[str, Mapping]]) -> List[Optional[str]]:
+    """Vectorized format_message for data-driven outlines"""
+    return formatter(locale).format_many(items)
+
+def format_matrix(items: Iterable[Tuple[str, Mapping]], locales: Iterable[str]) -> Dict[str, List[Optional[str]]]:
+    """The same (key, args) pairs rendered for several locales: {locale: [text, ...]}"""
+    items = list(items)
+    return {locale: format_messages(locale, items) for locale in locales}
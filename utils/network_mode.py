@@ -0,0 +1,168 @@
+"""
+Network Mode
+Records site traffic to HAR archives and replays it for offline runs
+
+Modes (NETWORK_MODE):
+    live    - real network (default)
+    record  - capture each context's traffic, merged into one hars/<site>.har
+              per host the run talked to (HAR_SITE puts everything in one archive)
+    replay  - serve requests from the hars/<site>.har of their host via route_from_har
+
+Replay misses are handled by HAR_NOT_FOUND:
+    abort        - fail the request
+    passthrough  - let it go to the real network
+    404          - answer with an empty 404
+"""
+import itertools
+import json
+import os
+import re
+import shutil
+from pathlib import Path
+from typing import List, Optional
+from urllib.parse import urlparse
+
+NETWORK_MODES = ('live', 'record', 'replay')
+NOT_FOUND_POLICIES = ('abort', 'passthrough', '404')
+
+def site_name(url: str) -> str:
+    """
+    HAR archive name for a site, e.g. demo.playwright.dev or localhost_3000
+    (':' is not allowed in Windows file names)
+    """
+    parsed = urlparse(url)
+    host = parsed.hostname or 'localhost'
+    return f"{host}_{parsed.port}" if parsed.port else host
+
+def site_host(name: str) -> str:
+    """Host (with port) an archive name stands for: localhost_3000 -> localhost:3000"""
+    return re.sub(r'_(\d+)$', r':\1', name)
+
+class NetworkMode:
+    def __init__(self, mode: str = 'live', site: Optional[str] = None, har_dir: str = 'hars',
+                 not_found: str = 'abort', url_pattern: Optional[str] = None):
+        if mode not in NETWORK_MODES:
+            raise ValueError(f"Unknown NETWORK_MODE '{mode}', expected one of {', '.join(NETWORK_MODES)}")
+        if not_found not in NOT_FOUND_POLICIES:
+            raise ValueError(f"Unknown HAR_NOT_FOUND '{not_found}', expected one of {', '.join(NOT_FOUND_POLICIES)}")
+        self.mode = mode
+        self.site = site
+        self.har_dir = Path(har_dir)
+        self.not_found = not_found
+        self.url_pattern = url_pattern
+        self._part_ids = itertools.count(1)
+
+    @classmethod
+    def from_env(cls) -> 'NetworkMode':
+        """Build the network mode from NETWORK_MODE / HAR_* variables"""
+        return cls(
+            mode=os.getenv('NETWORK_MODE', 'live').lower(),
+            site=os.getenv('HAR_SITE') or None,
+            har_dir=os.getenv('HAR_DIR', 'hars'),
+            not_found=os.getenv('HAR_NOT_FOUND', 'abort').lower(),
+            url_pattern=os.getenv('HAR_URL_PATTERN') or None,
+        )
+
+    def har_path(self, site: str) -> Path:
+        """Merged archive for a site"""
+        return self.har_dir / f"{self.site or site}.har"
+
+    def archives(self) -> List[Path]:
+        """Archives replay serves from: the HAR_SITE one, or one per recorded host"""
+        if self.site:
+            return [self.har_path(self.site)]
+        return sorted(self.har_dir.glob('*.har'))
+
+    @property
+    def parts_dir(self) -> Path:
+        """Per-context recordings of the current run waiting to be merged"""
+        return self.har_dir / '.parts'
+
+    def clear_parts(self):
+        """Start a record run without parts left over from an earlier one"""
+        if self.mode == 'record' and self.parts_dir.exists():
+            shutil.rmtree(self.parts_dir)
+
+    def apply(self, browser_context):
+        """Attach recording or replay routing to a new context"""
+        if self.mode == 'record':
+            self.parts_dir.mkdir(parents=True, exist_ok=True)
+            part = self.parts_dir / f"{os.getpid()}-{next(self._part_ids)}.har"
+            browser_context.route_from_har(
+                part, url=self.url_pattern, update=True, update_content='embed'
+            )
+        elif self.mode == 'replay':
+            archives = [path for path in self.archives() if path.exists()]
+            if not archives:
+                raise FileNotFoundError(
+                    f"No HAR archive found in {self.har_dir} (run once with NETWORK_MODE=record)"
+                )
+            # Routes run last-registered-first, so this only sees misses of every archive
+            if self.not_found == 'abort':
+                browser_context.route(self.url_pattern or '**/*', lambda route: route.abort())
+            elif self.not_found == '404':
+                browser_context.route(self.url_pattern or '**/*', lambda route: route.fulfill(status=404, body=''))
+            for archive in archives:
+                browser_context.route_from_har(
+                    archive,
+                    url=self.url_pattern if self.site else f"*://{site_host(archive.stem)}/**",
+                    not_found='fallback',
+                )
+
+    def finalize(self) -> List[Path]:
+        """Merge recorded parts into the site archives (record mode only)"""
+        if self.mode != 'record' or not self.parts_dir.exists():
+            return []
+        parts = sorted(self.parts_dir.glob('*.har'))
+        sites = [self.site] if self.site else har_sites(parts)
+        written = []
+        for site in sites:
+            if merge_har_files(parts, self.har_path(site), None if self.site else site):
+                written.append(self.har_path(site))
+        return written
+
+def _read_log(part) -> Optional[dict]:
+    try:
+        return json.loads(Path(part).read_text(encoding='utf-8'))['log']
+    except (ValueError, KeyError):
+        return None
+
+def har_sites(parts) -> List[str]:
+    """Hosts requested in the given HAR files"""
+    sites = set()
+    for part in parts:
+        log = _read_log(part) or {}
+        sites.update(site_name(entry['request']['url']) for entry in log.get('entries', []))
+    return sorted(sites)
+
+def merge_har_files(parts, output: Path, site: Optional[str] = None) -> int:
+    """
+    Merge HAR files (only `site`'s requests when given), keeping the latest
+    response per (method, url, body); entries end up in startedDateTime order.
+    Returns the number of entries written (nothing is written for 0).
+    """
+    log = None
+    recorded = []
+    for part in parts:
+        part_log = _read_log(part)
+        if part_log is None:
+            continue
+        if log is None:
+            log = dict(part_log, pages=[], entries=[])
+        recorded.extend(entry for entry in part_log.get('entries', [])
+                        if site is None or site_name(entry['request']['url']) == site)
+
+    entries = {}
+    for entry in sorted(recorded, key=lambda entry: entry.get('startedDateTime', '')):
+        request = entry['request']
+        post_data = (request.get('postData') or {}).get('text', '')
+        entries[(request['method'], request['url'], post_data)] = entry
+    if not entries:
+        return 0
+    log['entries'] = sorted(entries.values(), key=lambda entry: entry.get('startedDateTime', ''))
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp_output = output.with_suffix(f".{os.getpid()}.tmp")
+    tmp_output.write_text(json.dumps({'log': log}), encoding='utf-8')
+    os.replace(tmp_output, output)
+    return len(entries)
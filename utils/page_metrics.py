@@ -0,0 +1,237 @@
+"""
+Page Performance Metrics
+Collects Navigation Timing, paint, LCP and CLS entries from scenario pages,
+plus Chromium's CDP Performance.getMetrics (JS heap, layout and style recalc
+counters). Samples are kept per scenario, locale and viewport and appended to
+a time-series history so trends show up between runs.
+
+Collection costs an init script (and a CDP session on chromium) per page, so
+it only runs for @performance scenarios unless PERF_METRICS=true. Budgets
+for the budget steps come from PERF_BUDGET_* variables.
+
+Usage:
+    python utils/page_metrics.py trend
+    python utils/page_metrics.py trend --metric lcp_ms --threshold 0.25
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+sys.path.append('.')
+
+from utils.file_lock import file_lock
+
+HISTORY_FILE = Path('.cache/perf_history.json')
+HISTORY_WINDOW = 100
+PERFORMANCE_TAG = 'performance'
+# metric -> (environment variable, default budget)
+BUDGETS = {
+    'load_ms': ('PERF_BUDGET_LOAD_MS', 3000.0),
+    'lcp_ms': ('PERF_BUDGET_LCP_MS', 2500.0),
+    'layout_count': ('PERF_BUDGET_LAYOUT_COUNT', 50.0),
+}
+
+# Buffered observers registered before page scripts run (top frame only)
+_OBSERVER_JS = """
+(() => {
+    if (window.top !== window || window.__pageMetrics) {
+        return;
+    }
+    const metrics = window.__pageMetrics = { lcp: null, cls: 0 };
+    const supported = PerformanceObserver.supportedEntryTypes || [];
+    if (supported.includes('largest-contentful-paint')) {
+        new PerformanceObserver((list) => {
+            const entries = list.getEntries();
+            metrics.lcp = entries[entries.length - 1].startTime;
+        }).observe({ type: 'largest-contentful-paint', buffered: true });
+    }
+    if (supported.includes('layout-shift')) {
+        new PerformanceObserver((list) => {
+            for (const entry of list.getEntries()) {
+                if (!entry.hadRecentInput) {
+                    metrics.cls += entry.value;
+                }
+            }
+        }).observe({ type: 'layout-shift', buffered: true });
+    }
+})();
+"""
+
+_COLLECT_JS = """
+() => {
+    const nav = performance.getEntriesByType('navigation')[0];
+    const paint = Object.fromEntries(
+        performance.getEntriesByType('paint').map((entry) => [entry.name, entry.startTime])
+    );
+    const observed = window.__pageMetrics || {};
+    return {
+        url: location.href,
+        ttfb_ms: nav ? nav.responseStart - nav.startTime : null,
+        dom_content_loaded_ms: nav ? nav.domContentLoadedEventEnd - nav.startTime : null,
+        load_ms: nav && nav.loadEventEnd ? nav.loadEventEnd - nav.startTime : null,
+        transfer_bytes: nav ? nav.transferSize : null,
+        first_paint_ms: paint['first-paint'] ?? null,
+        fcp_ms: paint['first-contentful-paint'] ?? null,
+        lcp_ms: observed.lcp ?? null,
+        cls: observed.cls ?? null,
+        resources: performance.getEntriesByType('resource').length,
+    };
+}
+"""
+
+# CDP Performance.getMetrics name -> (sample key, scale); durations come in seconds
+CDP_METRICS = {
+    'JSHeapUsedSize': ('js_heap_used_bytes', 1),
+    'JSHeapTotalSize': ('js_heap_total_bytes', 1),
+    'LayoutCount': ('layout_count', 1),
+    'LayoutDuration': ('layout_duration_ms', 1000),
+    'RecalcStyleCount': ('recalc_style_count', 1),
+    'RecalcStyleDuration': ('recalc_style_duration_ms', 1000),
+    'ScriptDuration': ('script_duration_ms', 1000),
+    'TaskDuration': ('task_duration_ms', 1000),
+    'Nodes': ('dom_nodes', 1),
+}
+
+def series_key(scenario_name: str, locale: str, viewport: Optional[Dict]) -> str:
+    """Time-series key: one series per scenario, locale and viewport"""
+    size = f"{viewport['width']}x{viewport['height']}" if viewport else 'default'
+    return f"{scenario_name}|{locale}|{size}"
+
+class PageMetricsCollector:
+    """Performance observers (and a CDP session on Chromium) attached to one page"""
+
+    def __init__(self, page, cdp_session=None):
+        self.page = page
+        self.cdp_session = cdp_session
+
+    @classmethod
+    def attach(cls, page, browser_name: str) -> 'PageMetricsCollector':
+        page.add_init_script(_OBSERVER_JS)
+        cdp_session = None
+        if browser_name == 'chromium':
+            cdp_session = page.context.new_cdp_session(page)
+            cdp_session.send('Performance.enable')
+        return cls(page, cdp_session)
+
+    def cdp_metrics(self) -> Dict:
+        """Chromium renderer counters; empty on Firefox and WebKit"""
+        if self.cdp_session is None:
+            return {}
+        raw = {m['name']: m['value'] for m in self.cdp_session.send('Performance.getMetrics')['metrics']}
+        return {key: round(raw[name] * scale, 3)
+                for name, (key, scale) in CDP_METRICS.items() if name in raw}
+
+    def collect(self) -> Dict:
+        """Current page's metrics, after its load event"""
+        self.page.wait_for_load_state('load')
+        metrics = self.page.evaluate(_COLLECT_JS)
+        metrics.update(self.cdp_metrics())
+        return {key: round(value, 3) if isinstance(value, float) else value
+                for key, value in metrics.items()}
+
+class PerformanceRecorder:
+    """Run-wide store of page metrics samples, merged into the history at the end"""
+
+    def __init__(self, enabled: bool = False, history_path: Path = HISTORY_FILE,
+                 window: int = HISTORY_WINDOW, browser: str = 'chromium',
+                 budgets: Dict[str, float] = None):
+        self.enabled = enabled
+        self.history_path = Path(history_path)
+        self.window = window
+        self.browser = browser
+        self.budgets = dict(budgets or {metric: default for metric, (_, default) in BUDGETS.items()})
+        self.samples: Dict[str, Dict] = {}
+
+    @classmethod
+    def from_env(cls) -> 'PerformanceRecorder':
+        return cls(
+            enabled=os.getenv('PERF_METRICS', 'false').lower() == 'true',
+            history_path=Path(os.getenv('PERF_HISTORY', str(HISTORY_FILE))),
+            window=int(os.getenv('PERF_HISTORY_WINDOW', str(HISTORY_WINDOW))),
+            browser=os.getenv('BROWSER', 'chromium'),
+            budgets={metric: float(os.getenv(variable, str(default)))
+                     for metric, (variable, default) in BUDGETS.items()},
+        )
+
+    def collects(self, tags: Iterable[str]) -> bool:
+        """Whether a scenario's pages get the metrics collector"""
+        return self.enabled or PERFORMANCE_TAG in tags
+
+    def record(self, key: str, metrics: Dict):
+        """Keep the latest sample of a series for this run"""
+        self.samples[key] = dict(metrics, browser=self.browser)
+
+    def _read_history(self) -> Dict[str, List[Dict]]:
+        try:
+            return json.loads(self.history_path.read_text(encoding='utf-8'))
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def finish(self, report_path: Path) -> Dict:
+        """Write this run's samples and append them to the time-series history"""
+        if not self.samples:
+            return {'samples': 0}
+        timestamp = time.strftime('%Y-%m-%dT%H:%M:%S')
+        run = {'timestamp': timestamp, 'browser': self.browser, 'samples': self.samples}
+        report_path = Path(report_path)
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        report_path.write_text(json.dumps(run, indent=2), encoding='utf-8')
+
+        # Parallel workers append to the same file: re-read and merge under the lock
+        with file_lock(self.history_path):
+            history = self._read_history()
+            for key, sample in self.samples.items():
+                series = history.setdefault(f"{self.browser}|{key}", [])
+                series.append(dict(sample, timestamp=timestamp))
+                del series[:-self.window]
+            self.history_path.parent.mkdir(parents=True, exist_ok=True)
+            temp = self.history_path.with_suffix(f".{os.getpid()}.tmp")
+            temp.write_text(json.dumps(history, indent=2, sort_keys=True), encoding='utf-8')
+            os.replace(temp, self.history_path)
+        return {'samples': len(self.samples), 'report': str(report_path)}
+
+def trend(history: Dict[str, List[Dict]], metric: str, threshold: float) -> List[str]:
+    """Print latest vs. median of earlier samples per series; return regressions"""
+    regressions = []
+    for key in sorted(history):
+        values = [s[metric] for s in history[key] if s.get(metric) is not None]
+        if len(values) < 2:
+            continue
+        latest, baseline = values[-1], statistics.median(values[:-1])
+        ratio = latest / baseline if baseline else 1.0
+        marker = "❌" if ratio > 1 + threshold else "✓"
+        print(f"  {marker} {key:60s} {baseline:10.1f} -> {latest:10.1f} ({ratio - 1:+.1%}, n={len(values)})")
+        if ratio > 1 + threshold:
+            regressions.append(f"{key}: {metric} {baseline:.1f} -> {latest:.1f} ({ratio - 1:+.1%})")
+    return regressions
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Inspect page performance history')
+    parser.add_argument('command', choices=['trend'])
+    parser.add_argument('--history', default=os.getenv('PERF_HISTORY', str(HISTORY_FILE)))
+    parser.add_argument('--metric', default='load_ms', help='Sample key to compare (e.g. lcp_ms, layout_count)')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Allowed increase over the median (0.2 = 20%%)')
+    args = parser.parse_args(argv)
+
+    history_path = Path(args.history)
+    if not history_path.exists():
+        print(f"ℹ️  No performance history at {history_path}")
+        return 0
+    history = json.loads(history_path.read_text(encoding='utf-8'))
+    print(f"📈 {args.metric}: latest run vs. median of earlier runs (threshold {args.threshold:.0%}):")
+    regressions = trend(history, args.metric, args.threshold)
+    if regressions:
+        print("❌ Performance regressions:")
+        for regression in regressions:
+            print(f"  - {regression}")
+        return 1
+    print("✅ No regressions")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,392 @@
+"""
+Parallel Scenario Runner
+Splits scenarios (including individual Scenario Outline rows) across a pool
+of behave worker processes and merges their JUnit reports. With LOCALES set,
+every @i18n scenario contributes one `file:line@locale` item per locale, so
+the locale copies of one scenario run in different workers at the same time.
+
+Usage:
+    python utils/parallel_runner.py --workers 4 --tags=@i18n
+    python utils/parallel_runner.py --workers 2 --shard 1/3 features/
+    python utils/parallel_runner.py --shard 1/3 --shard-durations ci/durations.json
+    python utils/parallel_runner.py --list --shard 2/3
+    LOCALES=en-US,de-DE,ar-SA python utils/parallel_runner.py --workers 3 --tags=@i18n
+    python utils/parallel_runner.py --workers 4 --schedule round-robin
+    python utils/parallel_runner.py --workers 4 -- --no-capture
+"""
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+sys.path.append('.')
+
+from utils.artifacts import merge_indexes, reset_budget
+from utils.duration_scheduler import DurationDatabase, plan
+from utils.network_mode import NetworkMode
+from utils.resource_blocking import format_summary, merge_summaries
+from utils.reporting import RESULTS_FILE, merge_results, report_path
+
+REPORTS_DIR = Path('reports')
+WORKERS_DIR = REPORTS_DIR / 'workers'
+MERGED_REPORT = REPORTS_DIR / 'TESTS-merged.xml'
+SCHEDULE_REPORT = REPORTS_DIR / 'schedule.json'
+SCHEDULES = ('duration', 'round-robin')
+
+
+def load_behave_config(paths: List[str], tags: List[str]):
+    """Build a behave Configuration so behave.ini defaults (paths, default_tags) apply"""
+    from behave.configuration import Configuration
+
+    command_args = [f'--tags={tag}' for tag in tags] + list(paths)
+    return Configuration(command_args=command_args)
+
+
+def find_feature_files(paths: List[str]) -> List[Path]:
+    """Expand feature directories into a sorted list of .feature files"""
+    files = set()
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            files.update(path.rglob('*.feature'))
+        elif path.suffix == '.feature':
+            files.add(path)
+    return sorted(files)
+
+
+def _parse_locales(value: str) -> List[str]:
+    """Parse a comma separated LOCALES value"""
+    return [locale.strip() for locale in value.split(',') if locale.strip()]
+
+
+def _split_line_filters(paths: List[str]) -> Tuple[List[str], Dict[str, set]]:
+    """Separate `file.feature:line` arguments into plain paths and per-file line sets"""
+    plain, lines = [], {}
+    for path in paths:
+        match = re.match(r'^(.+\.feature):(\d+)$', path)
+        if match:
+            lines.setdefault(Path(match.group(1)).as_posix(), set()).add(int(match.group(2)))
+            path = match.group(1)
+        plain.append(path)
+    return plain, lines
+
+
+def _has_locale_column(scenario) -> bool:
+    """True for outlines whose Examples already pin a locale per row"""
+    examples = getattr(scenario, 'examples', None)
+    return bool(examples) and all(
+        example.table is not None and 'locale' in example.table.headings for example in examples
+    )
+
+
+def discover_scenarios(paths: List[str], tags: List[str], locales: List[str] = None) -> List[str]:
+    """
+    Return the `file:line` location of every selected scenario.
+    Scenario Outlines contribute one location per Examples row; `file:line`
+    paths select single scenarios or outlines.
+    With locales, @i18n scenarios become one `file:line@locale` item per
+    locale (the LOCALES fan-out), and rows of outlines with a locale column
+    outside locales are dropped.
+    """
+    from behave.parser import parse_file
+
+    paths, line_filters = _split_line_filters(paths)
+    config = load_behave_config(paths, tags)
+    items = []
+    for feature_file in find_feature_files(config.paths or ['features']):
+        feature = parse_file(str(feature_file))
+        if feature is None:
+            continue
+        lines = line_filters.get(feature_file.as_posix())
+        for scenario in feature.scenarios:
+            rows = getattr(scenario, 'scenarios', None) or [scenario]
+            for row in rows:
+                if config.tags and not config.tags.check(row.effective_tags):
+                    continue
+                if lines is not None and row.line not in lines and scenario.line not in lines:
+                    continue
+                location = f"{feature_file.as_posix()}:{row.line}"
+                if not locales or 'i18n' not in row.effective_tags:
+                    items.append(location)
+                elif _has_locale_column(scenario):
+                    if row._row.get('locale') in locales:
+                        items.append(location)
+                else:
+                    items.extend(f"{location}@{locale}" for locale in locales)
+    return sorted(items, key=_location_sort_key)
+
+
+def split_item(item: str) -> Tuple[str, Optional[str]]:
+    """`file:line` or `file:line@locale` -> (location, locale or None)"""
+    location, _, locale = item.partition('@')
+    return location, locale or None
+
+
+def _location_sort_key(item: str) -> Tuple[str, int, str]:
+    """Sort by file, then numerically by line, then locale"""
+    location, locale = split_item(item)
+    filename, line = location.rsplit(':', 1)
+    return filename, int(line), locale or ''
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """Parse a 1-based `INDEX/TOTAL` shard spec"""
+    try:
+        index, total = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid shard '{value}', expected INDEX/TOTAL")
+    if total < 1 or not 1 <= index <= total:
+        raise argparse.ArgumentTypeError(f"Shard index must be within 1..{total}")
+    return index, total
+
+
+def shard_items(items: List[str], total: int) -> List[List[str]]:
+    """
+    Deterministically split items into `total` buckets.
+    Items are dealt round-robin in sorted order, so every machine that sees
+    the same feature files computes the same assignment.
+    """
+    buckets = [[] for _ in range(total)]
+    for i, item in enumerate(items):
+        buckets[i % total].append(item)
+    return buckets
+
+
+def split_items(items: List[str], total: int, schedule: str) -> Tuple[List[List[str]], Optional[List[float]]]:
+    """
+    Split items into `total` buckets with the chosen schedule.
+    `duration` bin-packs by historical run time (predicted seconds per bucket
+    are returned too); `round-robin` deals items in order.
+    """
+    if schedule == 'duration':
+        return plan(items, total)
+    return shard_items(items, total), None
+
+
+def split_shards(items: List[str], total: int, durations: Optional[Path] = None) -> List[List[str]]:
+    """
+    Buckets for CI shards. Every machine must compute the same split, so only
+    shared inputs are used: round-robin, or LPT on a committed durations file
+    (never the per-machine .cache history).
+    """
+    if durations is None:
+        return shard_items(items, total)
+    return plan(items, total, DurationDatabase(durations))[0]
+
+
+def run_worker(worker_id: int, items: List[str], behave_args: List[str]) -> Dict:
+    """Run one behave process for a bucket of scenario locations / (location, locale) items"""
+    junit_dir = WORKERS_DIR / f'worker-{worker_id}'
+    if junit_dir.exists():
+        shutil.rmtree(junit_dir)
+    junit_dir.mkdir(parents=True)
+
+    locations: Dict[str, None] = {}
+    assignment: Dict[str, List[str]] = {}
+    for item in items:
+        location, locale = split_item(item)
+        locations.setdefault(location, None)
+        if locale:
+            assignment.setdefault(location, []).append(locale)
+    locations = list(locations)
+
+    command = [
+        sys.executable, '-m', 'behave',
+        '--junit', f'--junit-directory={junit_dir}',
+        *behave_args,
+        *locations,
+    ]
+    env = dict(os.environ, WORKER_ID=str(worker_id))
+    if assignment:
+        # The worker's environment.py only fans these locations out to these locales
+        assignment_file = junit_dir / 'locales.json'
+        assignment_file.write_text(json.dumps(assignment, indent=2), encoding='utf-8')
+        env['LOCALE_ASSIGNMENT'] = str(assignment_file)
+
+    start = time.time()
+    with open(junit_dir / 'output.log', 'w', encoding='utf-8') as log:
+        result = subprocess.run(command, stdout=log, stderr=subprocess.STDOUT, env=env)
+    duration = time.time() - start
+
+    status_icon = "✅" if result.returncode == 0 else "❌"
+    print(f"{status_icon} Worker {worker_id}: {len(items)} scenarios in {duration:.1f}s")
+    return {
+        'worker_id': worker_id,
+        'returncode': result.returncode,
+        'junit_dir': junit_dir,
+        'duration': duration,
+    }
+
+
+def merge_junit_reports(report_dirs: List[Path], output: Path = MERGED_REPORT) -> Dict[str, int]:
+    """Merge behave's per-feature JUnit files from every worker into one report"""
+    merged = ET.Element('testsuites')
+    totals = {'tests': 0, 'failures': 0, 'errors': 0, 'skipped': 0}
+    total_time = 0.0
+
+    for report_dir in report_dirs:
+        for xml_file in sorted(report_dir.glob('TESTS-*.xml')):
+            suite = ET.parse(xml_file).getroot()
+            suite.set('hostname', report_dir.name)
+            for key in totals:
+                totals[key] += int(suite.get(key, 0))
+            total_time += float(suite.get('time', 0))
+            merged.append(suite)
+
+    for key, value in totals.items():
+        merged.set(key, str(value))
+    merged.set('time', f"{total_time:.3f}")
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    ET.ElementTree(merged).write(output, encoding='utf-8', xml_declaration=True)
+    return totals
+
+
+def report_makespan(buckets: List[List[str]], predicted: Optional[List[float]], results: List[Dict],
+                    output: Path = SCHEDULE_REPORT) -> Dict:
+    """Predicted vs. actual per-worker time; the slowest worker is the makespan"""
+    workers = [{
+        'worker_id': result['worker_id'],
+        'scenarios': len(bucket),
+        'predicted_seconds': round(load, 3) if load is not None else None,
+        'actual_seconds': round(result['duration'], 3),
+    } for bucket, load, result in zip(buckets, predicted or [None] * len(buckets), results)]
+    actual = [worker['actual_seconds'] for worker in workers]
+    report = {
+        'predicted_makespan': round(max(predicted), 3) if predicted else None,
+        'actual_makespan': max(actual),
+        # Mean worker time over the slowest one: 1.0 means every worker finished together
+        'balance': round(sum(actual) / len(actual) / max(actual), 3) if max(actual) else 1.0,
+        'workers': workers,
+    }
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    return report
+
+
+def run_parallel(locations: List[str], workers: int, behave_args: List[str], schedule: str = 'duration') -> int:
+    """Run locations across a worker pool, merge reports, return exit code"""
+    buckets, predicted = split_items(locations, workers, schedule)
+    if predicted is not None:
+        predicted = [load for bucket, load in zip(buckets, predicted) if bucket]
+    buckets = [bucket for bucket in buckets if bucket]
+    if not buckets:
+        print("⚠️  No scenarios selected")
+        return 0
+
+    # Worker artifact indexes from a previous run must not be merged into this one
+    for stale in Path(os.getenv('ARTIFACTS_DIR', 'artifacts')).glob('index-worker-*.json'):
+        stale.unlink()
+    # Workers share one ARTIFACT_BUDGET_MB
+    reset_budget(Path(os.getenv('ARTIFACTS_DIR', 'artifacts')))
+    for stale in REPORTS_DIR.glob(f"{Path(report_path(str(RESULTS_FILE))).stem}-worker-*.jsonl"):
+        stale.unlink()
+    for stale in REPORTS_DIR.glob('blocking-worker-*.json'):
+        stale.unlink()
+    network_mode = NetworkMode.from_env()
+    network_mode.clear_parts()
+
+    print(f"🚀 Running {len(locations)} scenarios on {len(buckets)} workers...")
+    with ThreadPoolExecutor(max_workers=len(buckets)) as pool:
+        results = list(pool.map(
+            lambda args: run_worker(args[0], args[1], behave_args),
+            enumerate(buckets, start=1)
+        ))
+
+    makespan = report_makespan(buckets, predicted, results)
+    predicted_text = f"predicted {makespan['predicted_makespan']:.1f}s, " if predicted else ''
+    print(f"⏱️  Makespan: {predicted_text}actual {makespan['actual_makespan']:.1f}s "
+          f"(balance {makespan['balance']:.0%}, {SCHEDULE_REPORT})")
+
+    durations = DurationDatabase()
+    durations.ingest([r['junit_dir'] for r in results])
+    durations.save()
+
+    totals = merge_junit_reports([r['junit_dir'] for r in results])
+    print(f"📊 Merged report: {MERGED_REPORT} "
+          f"({totals['tests']} tests, {totals['failures']} failures, {totals['errors']} errors)")
+
+    results_file = merge_results()
+    if results_file:
+        print(f"📄 Results: {results_file}")
+
+    artifact_index = merge_indexes(Path(os.getenv('ARTIFACTS_DIR', 'artifacts')))
+    if artifact_index:
+        print(f"📦 Artifact index: {artifact_index}")
+
+    for har_path in network_mode.finalize():
+        print(f"🌐 HAR archive saved: {har_path}")
+
+    blocking = merge_summaries(sorted(REPORTS_DIR.glob('blocking-worker-*.json')))
+    if blocking:
+        print(f"🚫 All workers: {format_summary(blocking)}")
+
+    return 0 if all(r['returncode'] == 0 for r in results) else 1
+
+
+def main(argv: List[str] = None) -> int:
+    # Same settings as the workers see: NETWORK_MODE, LOCALES, REPORT_SUFFIX, ARTIFACTS_DIR...
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    argv = sys.argv[1:] if argv is None else argv
+    behave_args = []
+    if '--' in argv:
+        split = argv.index('--')
+        argv, behave_args = argv[:split], argv[split + 1:]
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('paths', nargs='*', help='Feature files, directories or file:line locations')
+    parser.add_argument('--workers', '-w', type=int, default=os.cpu_count() or 1,
+                        help='Number of worker processes (default: CPU count)')
+    parser.add_argument('--tags', '-t', action='append', default=[],
+                        help='behave tag expression (repeatable)')
+    parser.add_argument('--shard', type=parse_shard, default=(1, 1),
+                        help='Run only shard INDEX/TOTAL of the suite (for CI machines)')
+    parser.add_argument('--shard-durations', type=Path, default=None,
+                        help='Committed durations file to balance shards by (default: round-robin shards)')
+    parser.add_argument('--schedule', choices=SCHEDULES, default='duration',
+                        help='How this machine splits its scenarios over workers: by historical duration (LPT) or round-robin')
+    parser.add_argument('--list', action='store_true',
+                        help='Print the selected scenario locations and exit')
+    parser.add_argument('--local-app', action='store_true',
+                        help='Serve the bundled local app once and share it with all workers')
+    args = parser.parse_args(argv)
+
+    locations = discover_scenarios(args.paths, args.tags, _parse_locales(os.getenv('LOCALES', '')))
+    if args.shard_durations is not None and not args.shard_durations.is_file():
+        parser.error(f"--shard-durations: {args.shard_durations} not found (shards need a history every machine shares)")
+    shard_index, shard_total = args.shard
+    locations = split_shards(locations, shard_total, args.shard_durations)[shard_index - 1]
+
+    if args.list:
+        for location in locations:
+            print(location)
+        return 0
+
+    behave_args = [f'--tags={tag}' for tag in args.tags] + behave_args
+    if not args.local_app:
+        return run_parallel(locations, max(1, args.workers), behave_args, args.schedule)
+
+    from utils.local_app import LocalApp
+
+    # One threaded server for every worker; workers must not start their own
+    app = LocalApp().start()
+    os.environ.update(BASE_URL=app.url, LOCAL_APP='false')
+    print(f"🌐 Local app running at {app.url}")
+    try:
+        return run_parallel(locations, max(1, args.workers), behave_args, args.schedule)
+    finally:
+        app.stop()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
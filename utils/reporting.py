@@ -0,0 +1,218 @@
+"""
+Single-Pass Reporting
+One test run writes every report: JUnit (behave's --junit), HTML
+(behave-html-formatter) and a compact JSON Lines results file streamed to
+disk one scenario at a time. before_all adds the HTML and results formatters
+next to the console ones (REPORTS=false leaves them out); they are also
+registered in behave.ini for `-f html` / `-f results`.
+
+Report names get -<REPORT_SUFFIX> and -worker-<WORKER_ID> appended when
+those are set, so CI jobs and parallel workers never write the same file.
+
+Usage:
+    python utils/reporting.py summary reports/results.jsonl
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from behave.formatter.base import Formatter, StreamOpener
+from behave_html_formatter import HTMLFormatter
+from behave_html_formatter.html import ET_tostring
+
+sys.path.append('.')
+
+from utils.artifacts import junit_classname
+
+RESULTS_FILE = Path('reports/results.jsonl')
+HTML_REPORT = Path('reports/report.html')
+
+def report_path(name: str) -> str:
+    """Outfile name with the REPORT_SUFFIX / WORKER_ID markers added"""
+    path = Path(name)
+    suffix = ''.join(path.suffixes)
+    stem = path.name[:len(path.name) - len(suffix)] if suffix else path.name
+    if os.getenv('REPORT_SUFFIX'):
+        stem += f"-{os.getenv('REPORT_SUFFIX')}"
+    if os.getenv('WORKER_ID'):
+        stem += f"-worker-{os.getenv('WORKER_ID')}"
+    return str(path.with_name(stem + suffix))
+
+def _resolve_report_path(stream_opener):
+    """Add the report markers once, when the file is first opened (after .env is loaded)"""
+    if stream_opener.name and not getattr(stream_opener, 'report_path_resolved', False):
+        stream_opener.name = report_path(stream_opener.name)
+        stream_opener.report_path_resolved = True
+
+class HTMLReportFormatter(HTMLFormatter):
+    """
+    behave-html-formatter writing to a per-job / per-worker file.
+    The page is rewritten after every feature, so a crashed run keeps the
+    features that finished.
+    """
+    name = 'html'
+
+    def open(self):
+        # HTMLFormatter opens its stream in __init__; wait for the first write
+        return None
+
+    def _report_stream(self):
+        _resolve_report_path(self.stream_opener)
+        self.stream = Formatter.open(self)
+        if self.stream_opener.name:
+            self.stream.seek(0)
+            self.stream.truncate()
+        return self.stream
+
+    def eof(self):
+        if not self.stream_opener.name or not getattr(self, 'all_features', None):
+            return
+        stream = self._report_stream()
+        stream.write("<!DOCTYPE HTML>")
+        stream.write(ET_tostring(self.html, pretty_print=False))
+        stream.flush()
+
+    def close(self):
+        if not getattr(self, 'all_features', None):
+            return
+        self._report_stream()
+        super().close()
+        self.close_stream()
+
+class ResultsFormatter(Formatter):
+    """
+    One JSON line per scenario run, flushed as soon as the scenario ends,
+    so a crashed run still leaves every finished scenario on disk.
+    Retried scenarios get a line per attempt.
+    """
+    name = 'results'
+    description = 'Streams one JSON line per scenario run'
+
+    def __init__(self, stream_opener, config):
+        super().__init__(stream_opener, config)
+        self.current = None
+        self.attempt = 0
+
+    def open(self):
+        _resolve_report_path(self.stream_opener)
+        return super().open()
+
+    def scenario(self, scenario):
+        # Without the after_scenario call a scenario ends when the next one starts
+        self._write_current()
+        self.current = scenario
+        self.attempt = getattr(scenario, 'retry_attempt', 0)
+
+    def scenario_finished(self, scenario, hook_failed: bool = False):
+        """Write the record now; called from after_scenario with the final status"""
+        if scenario is self.current:
+            self._write_current(hook_failed)
+
+    def eof(self):
+        self._write_current()
+
+    def close(self):
+        self._write_current()
+        self.close_stream()
+
+    def _write_current(self, hook_failed: bool = False):
+        scenario, self.current = self.current, None
+        if scenario is None:
+            return
+        status = 'failed' if hook_failed else getattr(scenario.status, 'name', str(scenario.status))
+        if status == 'untested' or (status == 'skipped' and not self.config.show_skipped):
+            return
+        record = {
+            'classname': junit_classname(scenario.feature),
+            'name': scenario.name,
+            'location': f"{Path(scenario.filename).as_posix()}:{scenario.line}",
+            'status': status,
+            'attempt': self.attempt,
+            'duration': round(scenario.duration, 3),
+            'tags': list(scenario.effective_tags),
+            'finished': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+        failed_step = next((s for s in scenario.all_steps
+                            if getattr(s.status, 'name', None) in ('failed', 'undefined')), None)
+        if failed_step is not None:
+            record['failed_step'] = f"{failed_step.keyword} {failed_step.name}"
+            record['error'] = (failed_step.error_message or failed_step.status.name)[:2000]
+        elif hook_failed or scenario.hook_failed:
+            record['error'] = 'hook failed'
+
+        stream = self.open()
+        stream.write(json.dumps(record, ensure_ascii=False) + '\n')
+        stream.flush()
+
+def report_formatters(config) -> List[Formatter]:
+    """HTML report and streamed results, added to the run from before_all"""
+    return [
+        HTMLReportFormatter(StreamOpener(str(HTML_REPORT)), config),
+        ResultsFormatter(StreamOpener(str(RESULTS_FILE)), config),
+    ]
+
+def read_results(path: Path) -> Iterator[Dict]:
+    """Records of a results file; a line cut off by a crash is skipped"""
+    with open(path, encoding='utf-8') as results:
+        for line in results:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+def merge_results(output: Path = None) -> Optional[Path]:
+    """Concatenate the per-worker results files of this job into one, line by line"""
+    output = output or Path(report_path(str(RESULTS_FILE)))
+    parts = sorted(output.parent.glob(f"{output.name[:-len('.jsonl')]}-worker-*.jsonl"))
+    if not parts:
+        return None
+    with open(output, 'w', encoding='utf-8') as merged:
+        for part in parts:
+            with open(part, encoding='utf-8') as results:
+                for line in results:
+                    if line.endswith('\n'):
+                        merged.write(line)
+    return output
+
+def final_results(records: Iterator[Dict]) -> Dict[tuple, Dict]:
+    """
+    Last attempt of each scenario, keyed by (classname, name).
+    A skip (e.g. the same feature deselected in another worker) never hides a run.
+    """
+    final = {}
+    for record in records:
+        key = (record['classname'], record['name'])
+        if record['status'] != 'skipped' or key not in final:
+            final[key] = record
+    return final
+
+def summarize(records: Iterator[Dict]) -> Dict[str, int]:
+    """Counts by final status"""
+    counts: Dict[str, int] = {}
+    for record in final_results(records).values():
+        counts[record['status']] = counts.get(record['status'], 0) + 1
+    return counts
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Summarize a streamed results file')
+    parser.add_argument('command', choices=['summary'])
+    parser.add_argument('path', nargs='?', default=str(RESULTS_FILE))
+    args = parser.parse_args(argv)
+
+    records = list(read_results(Path(args.path)))
+    counts = summarize(records)
+    print(f"📊 {args.path}: {sum(counts.values())} scenarios, {len(records)} runs")
+    for status, count in sorted(counts.items()):
+        print(f"  {status:10s} {count}")
+    for record in final_results(records).values():
+        if record['status'] != 'failed':
+            continue
+        print(f"  ❌ {record['location']} {record['name']} (attempt {record['attempt']}): {record.get('error', '')[:200]}")
+    return 1 if counts.get('failed') else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""
+Resource Blocking
+Named request-blocking profiles applied through context-level routing
+
+Profiles (BLOCK_PROFILE):
+    full      - block nothing (default)
+    no-media  - block images, video and audio
+    minimal   - block media, web fonts and third-party analytics
+
+Per feature/scenario tags:
+    @block:<profile or category>  - additionally block, e.g. @block:media
+    @allow:<category>             - opt back in, e.g. @allow:fonts
+
+Bytes saved are an estimate: aborted requests are never downloaded, so
+each one counts a typical size for its resource type. Each run (or worker)
+writes reports/blocking[-worker-N].json; parallel_runner adds them up.
+"""
+import json
+import os
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set
+from urllib.parse import urlparse
+
+BLOCKING_REPORT = Path('reports/blocking.json')
+
+# Category -> Playwright resource types
+RESOURCE_CATEGORIES = {
+    'media': {'image', 'media'},
+    'fonts': {'font'},
+    'analytics': set(),  # matched by host, see ANALYTICS_HOSTS
+}
+
+BLOCK_PROFILES = {
+    'full': set(),
+    'no-media': {'media'},
+    'minimal': {'media', 'fonts', 'analytics'},
+}
+
+ANALYTICS_HOSTS = (
+    'google-analytics.com',
+    'googletagmanager.com',
+    'doubleclick.net',
+    'segment.io',
+    'segment.com',
+    'hotjar.com',
+    'connect.facebook.net',
+    'clarity.ms',
+    'newrelic.com',
+    'nr-data.net',
+)
+
+# Typical per-request transfer sizes used to estimate bytes saved
+ESTIMATED_BYTES = {
+    'image': 30_000,
+    'media': 500_000,
+    'font': 25_000,
+    'script': 40_000,
+}
+DEFAULT_ESTIMATED_BYTES = 5_000
+
+def _is_analytics(url: str) -> bool:
+    host = urlparse(url).hostname or ''
+    return any(host == h or host.endswith(f'.{h}') for h in ANALYTICS_HOSTS)
+
+class ResourceBlocker:
+    def __init__(self, profile: str = 'full'):
+        if profile not in BLOCK_PROFILES:
+            raise ValueError(f"Unknown BLOCK_PROFILE '{profile}', expected one of {', '.join(BLOCK_PROFILES)}")
+        self.profile = profile
+        self.blocked = Counter()
+        self.bytes_saved = 0
+
+    @classmethod
+    def from_env(cls) -> 'ResourceBlocker':
+        """Build the blocker from BLOCK_PROFILE"""
+        return cls(os.getenv('BLOCK_PROFILE', 'full').lower())
+
+    def categories_for(self, tags: Iterable[str]) -> Set[str]:
+        """Blocked categories for a scenario: run profile plus @block/@allow tags"""
+        categories = set(BLOCK_PROFILES[self.profile])
+        allowed = set()
+        for tag in tags:
+            kind, _, value = tag.partition(':')
+            if kind == 'block':
+                categories |= BLOCK_PROFILES.get(value, {value} & set(RESOURCE_CATEGORIES))
+            elif kind == 'allow':
+                allowed.add(value)
+        return categories - allowed
+
+    def apply(self, browser_context, categories: Set[str]):
+        """Route the context's requests through the blocking rules"""
+        if not categories:
+            return
+        type_categories = {
+            resource_type: category
+            for category in categories
+            for resource_type in RESOURCE_CATEGORIES.get(category, ())
+        }
+        block_analytics = 'analytics' in categories
+
+        def handle(route):
+            request = route.request
+            category = type_categories.get(request.resource_type)
+            if category:
+                self._record(category, request.resource_type)
+                return route.abort('blockedbyclient')
+            if block_analytics and _is_analytics(request.url):
+                self._record('analytics', request.resource_type)
+                return route.abort('blockedbyclient')
+            return route.fallback()
+
+        browser_context.route('**/*', handle)
+
+    def _record(self, category: str, resource_type: str):
+        self.blocked[category] += 1
+        self.bytes_saved += ESTIMATED_BYTES.get(resource_type, DEFAULT_ESTIMATED_BYTES)
+
+    def summary(self) -> Dict:
+        """Blocked request counts per category and estimated bytes saved"""
+        return {
+            'profile': self.profile,
+            'blocked': dict(self.blocked),
+            'total_blocked': sum(self.blocked.values()),
+            'estimated_bytes_saved': self.bytes_saved,
+        }
+
+    def write_summary(self, path: Path = BLOCKING_REPORT) -> Optional[Path]:
+        """Save the summary for parallel_runner to merge (nothing when nothing was blocked)"""
+        summary = self.summary()
+        if not summary['total_blocked']:
+            return None
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(summary, indent=2), encoding='utf-8')
+        return path
+
+def format_summary(summary: Dict) -> str:
+    """One-line console summary; the byte figure is labelled as the estimate it is"""
+    per_category = ', '.join(f"{k}: {v}" for k, v in sorted(summary['blocked'].items()))
+    return (f"Blocked {summary['total_blocked']} requests ({per_category}), "
+            f"estimated ~{summary['estimated_bytes_saved'] / 1024:.0f} KB saved "
+            f"(typical sizes per resource type, not measured)")
+
+def merge_summaries(parts: Iterable[Path], output: Path = BLOCKING_REPORT) -> Optional[Dict]:
+    """Add up the per-worker summaries of a parallel run into one report"""
+    merged = None
+    for part in parts:
+        summary = json.loads(Path(part).read_text(encoding='utf-8'))
+        if merged is None:
+            merged = dict(summary, blocked=Counter(), total_blocked=0, estimated_bytes_saved=0)
+        merged['blocked'].update(summary['blocked'])
+        merged['total_blocked'] += summary['total_blocked']
+        merged['estimated_bytes_saved'] += summary['estimated_bytes_saved']
+    if merged is None:
+        return None
+    merged['blocked'] = dict(merged['blocked'])
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(merged, indent=2), encoding='utf-8')
+    return merged
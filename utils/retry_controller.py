@@ -0,0 +1,234 @@
+"""
+Retry Controller
+Re-runs failed scenarios (and individual outline rows) in the same behave
+process, records passed / flaky / failed outcomes in a persistent history,
+and quarantines scenarios whose flake rate crosses a threshold.
+
+Flaky results are written into the JUnit files with the Surefire
+<flakyFailure>/<rerunFailure> elements CI servers understand.
+
+Usage:
+    python utils/retry_controller.py report
+    python utils/retry_controller.py quarantined
+"""
+import argparse
+import functools
+import json
+import os
+import sys
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.append('.')
+
+from utils.artifacts import junit_classname
+from utils.file_lock import file_lock
+
+HISTORY_FILE = Path('.cache/flaky_history.json')
+HISTORY_WINDOW = 50
+QUARANTINE_MODES = ('off', 'exclude', 'only')
+
+def scenario_id(scenario) -> str:
+    return f"{scenario.filename}:{scenario.name}"
+
+def _failure_message(scenario) -> str:
+    """Error of the first failed step (or hook) of a scenario run"""
+    for step in scenario.all_steps:
+        if getattr(step.status, 'name', None) in ('failed', 'undefined'):
+            return f"{step.keyword} {step.name}: {step.error_message or step.status.name}"
+    return getattr(scenario, 'error_message', None) or 'scenario failed'
+
+class FlakinessHistory:
+    """Outcome history per scenario id, stored as JSON between runs"""
+
+    def __init__(self, path: Path = HISTORY_FILE, window: int = HISTORY_WINDOW):
+        self.path = Path(path)
+        self.window = window
+        self.entries: Dict[str, Dict] = self._read()
+        self._recorded: Dict[str, Dict] = {}
+
+    def _read(self) -> Dict[str, Dict]:
+        try:
+            return json.loads(self.path.read_text(encoding='utf-8'))
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    @staticmethod
+    def _append(entries: Dict, key: str, outcomes: List[str], location: Optional[str], window: int):
+        entry = entries.setdefault(key, {'outcomes': []})
+        entry['outcomes'] = (entry['outcomes'] + outcomes)[-window:]
+        if location:
+            entry['location'] = location
+
+    def record(self, key: str, outcome: str, location: str = None):
+        self._append(self.entries, key, [outcome], location, self.window)
+        recorded = self._recorded.setdefault(key, {'outcomes': [], 'location': location})
+        recorded['outcomes'].append(outcome)
+
+    def flake_rate(self, key: str) -> float:
+        """Share of recent runs that only passed after a retry"""
+        outcomes = self.entries.get(key, {}).get('outcomes', [])
+        return outcomes.count('flaky') / len(outcomes) if outcomes else 0.0
+
+    def runs(self, key: str) -> int:
+        return len(self.entries.get(key, {}).get('outcomes', []))
+
+    def save(self):
+        """Merge this run's outcomes into the file (locked: parallel workers share it)"""
+        with file_lock(self.path):
+            entries = self._read()
+            for key, recorded in self._recorded.items():
+                self._append(entries, key, recorded['outcomes'], recorded['location'], self.window)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp = self.path.with_suffix(f".{os.getpid()}.tmp")
+            temp.write_text(json.dumps(entries, indent=2, sort_keys=True), encoding='utf-8')
+            os.replace(temp, self.path)
+        self.entries, self._recorded = entries, {}
+
+class RetryController:
+    def __init__(self, max_retries: int = 0, history: FlakinessHistory = None,
+                 threshold: float = 0.2, min_runs: int = 5, quarantine_mode: str = 'exclude'):
+        if quarantine_mode not in QUARANTINE_MODES:
+            raise ValueError(f"Unknown QUARANTINE_MODE '{quarantine_mode}' (expected one of {', '.join(QUARANTINE_MODES)})")
+        self.max_retries = max_retries
+        self.history = history or FlakinessHistory()
+        self.threshold = threshold
+        self.min_runs = min_runs
+        self.quarantine_mode = quarantine_mode
+        # scenario id -> {'classname', 'name', 'outcome', 'failures': [...]}
+        self.results: Dict[str, Dict] = {}
+
+    @classmethod
+    def from_env(cls) -> 'RetryController':
+        return cls(
+            max_retries=int(os.getenv('RETRIES', '0')),
+            history=FlakinessHistory(Path(os.getenv('FLAKY_HISTORY', str(HISTORY_FILE)))),
+            threshold=float(os.getenv('FLAKY_THRESHOLD', '0.2')),
+            min_runs=int(os.getenv('FLAKY_MIN_RUNS', '5')),
+            quarantine_mode=os.getenv('QUARANTINE_MODE', 'exclude'),
+        )
+
+    def is_quarantined(self, key: str) -> bool:
+        return (self.history.runs(key) >= self.min_runs
+                and self.history.flake_rate(key) >= self.threshold)
+
+    def quarantine_reason(self, scenario) -> Optional[str]:
+        """Why the scenario should be skipped in this run, if it should"""
+        if self.quarantine_mode == 'off':
+            return None
+        key = scenario_id(scenario)
+        quarantined = self.is_quarantined(key)
+        if self.quarantine_mode == 'exclude' and quarantined:
+            return f"quarantined (flaky in {self.history.flake_rate(key):.0%} of recent runs)"
+        if self.quarantine_mode == 'only' and not quarantined:
+            return "not quarantined"
+        return None
+
+    def patch(self, scenarios):
+        """Wrap Scenario.run of every scenario / outline row with the retry loop"""
+        for scenario in scenarios:
+            rows = getattr(scenario, 'scenarios', None)
+            for target in (rows if rows is not None else [scenario]):
+                target.run = functools.partial(self._run_with_retries, target, target.run)
+
+    def _run_with_retries(self, scenario, scenario_run, runner) -> bool:
+        failures = []
+        previously_failed = getattr(runner.context, 'failed', False)
+        for attempt in range(self.max_retries + 1):
+            scenario.retry_attempt = attempt
+            failed = scenario_run(runner)
+            if getattr(scenario.status, 'name', None) not in ('passed', 'failed'):
+                return failed  # skipped/undefined: nothing to retry or record
+            if not failed:
+                break
+            failures.append(_failure_message(scenario))
+            if attempt < self.max_retries:
+                print(f"🔁 Retrying scenario ({attempt + 1}/{self.max_retries}): {scenario.name}")
+
+        outcome = 'failed' if failed else 'flaky' if failures else 'passed'
+        if outcome == 'flaky':
+            # A later attempt passed: do not let the first failure stop the run
+            runner.context._set_root_attribute('failed', previously_failed)
+            print(f"⚠️  Flaky: passed on attempt {len(failures) + 1}: {scenario.name}")
+
+        key = scenario_id(scenario)
+        self.history.record(key, outcome, f"{Path(scenario.filename).as_posix()}:{scenario.line}")
+        self.results[key] = {
+            'classname': junit_classname(scenario.feature),
+            'name': scenario.name,
+            'outcome': outcome,
+            'failures': failures,
+        }
+        return failed
+
+    def annotate_junit(self, junit_dir: Path) -> int:
+        """Add flaky/rerun failures and attempt counts to behave's JUnit files"""
+        by_case = {(r['classname'], r['name']): r for r in self.results.values() if r['failures']}
+        annotated = 0
+        for xml_file in Path(junit_dir).glob('TESTS-*.xml'):
+            tree = ET.parse(xml_file)
+            changed = False
+            for case in tree.getroot().iter('testcase'):
+                result = by_case.get((case.get('classname'), case.get('name')))
+                if result is None:
+                    continue
+                properties = case.find('properties')
+                if properties is None:
+                    properties = ET.Element('properties')
+                    case.insert(0, properties)
+                ET.SubElement(properties, 'property', name='outcome', value=result['outcome'])
+                ET.SubElement(properties, 'property', name='attempts', value=str(len(result['failures']) + (result['outcome'] == 'flaky')))
+
+                # Surefire convention: flakyFailure for a passing test, rerunFailure for the
+                # earlier attempts of a failing one (behave's <failure> is the last attempt)
+                if result['outcome'] == 'flaky':
+                    reruns, element = result['failures'], 'flakyFailure'
+                else:
+                    reruns, element = result['failures'][:-1], 'rerunFailure'
+                for message in reruns:
+                    ET.SubElement(case, element, message=message[:500], type='AssertionError').text = message
+                changed = True
+                annotated += 1
+            if changed:
+                tree.write(xml_file, encoding='utf-8', xml_declaration=True)
+        return annotated
+
+    def summary(self) -> Dict[str, List[str]]:
+        outcomes = {'passed': [], 'flaky': [], 'failed': []}
+        for key, result in sorted(self.results.items()):
+            outcomes[result['outcome']].append(key)
+        return outcomes
+
+    def finish(self, junit_dir: Optional[Path]) -> Dict[str, List[str]]:
+        """Persist the history and annotate JUnit output"""
+        if self.results:
+            self.history.save()
+        if junit_dir is not None and Path(junit_dir).exists():
+            self.annotate_junit(junit_dir)
+        return self.summary()
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Inspect scenario flakiness history')
+    parser.add_argument('command', choices=['report', 'quarantined'])
+    parser.add_argument('--history', default=os.getenv('FLAKY_HISTORY', str(HISTORY_FILE)))
+    args = parser.parse_args(argv)
+
+    controller = RetryController(history=FlakinessHistory(Path(args.history)),
+                                 threshold=float(os.getenv('FLAKY_THRESHOLD', '0.2')),
+                                 min_runs=int(os.getenv('FLAKY_MIN_RUNS', '5')))
+    entries = controller.history.entries
+    if args.command == 'quarantined':
+        for key in sorted(entries):
+            if controller.is_quarantined(key):
+                print(entries[key].get('location', key))
+        return 0
+
+    print(f"{'flake rate':>10}  {'runs':>4}  scenario")
+    for key in sorted(entries, key=controller.history.flake_rate, reverse=True):
+        marker = '  [quarantined]' if controller.is_quarantined(key) else ''
+        print(f"{controller.history.flake_rate(key):>10.0%}  {controller.history.runs(key):>4}  {key}{marker}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,30 +4,109 @@ Common utilities for testing
 """
 import os
 import json
+import hashlib
+import threading
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, Dict, Iterable, Optional
+
+def flatten_translations(data: Dict, parent_key: str = '', sep: str = '.') -> Dict[str, Any]:
+    """
+    Flatten nested translations into a dotted-key index.
+    Intermediate sections are indexed too, so 'nav' maps to the nav dict.
+    """
+    index = {}
+    for k, v in data.items():
+        new_key = f"{parent_key}{sep}{k}" if parent_key else k
+        index[new_key] = v
+        if isinstance(v, dict):
+            index.update(flatten_translations(v, new_key, sep=sep))
+    return index
+
+class TranslationCatalog:
+    """
+    Process-wide translation cache.
+    Each locale/namespace file is parsed once and indexed by dotted key.
+    Entries are revalidated by mtime/size and reparsed only when the file
+    content hash actually changes.
+    """
+
+    def __init__(self, locales_dir: str = 'locales'):
+        self.locales_dir = Path(locales_dir)
+        self._entries: Dict[tuple, Dict] = {}
+        self._lock = threading.Lock()
+
+    def _entry(self, locale: str, file: str) -> Dict:
+        """Return the cached entry for a file, reloading it if it changed"""
+        filepath = self.locales_dir / locale / file
+        try:
+            stat = filepath.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Translation file not found: {filepath}")
+
+        key = (locale, file)
+        entry = self._entries.get(key)
+        if entry and entry['mtime'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            return entry
+
+        with self._lock:
+            raw = filepath.read_bytes()
+            digest = hashlib.sha256(raw).hexdigest()
+            if entry and entry['hash'] == digest:
+                entry['mtime'], entry['size'] = stat.st_mtime_ns, stat.st_size
+                return entry
+
+            data = json.loads(raw.decode('utf-8'))
+            entry = {
+                'mtime': stat.st_mtime_ns,
+                'size': stat.st_size,
+                'hash': digest,
+                'data': data,
+                'index': flatten_translations(data),
+            }
+            self._entries[key] = entry
+            return entry
+
+    def load(self, locale: str, file: str = 'common.json') -> Dict:
+        """Parsed translation data (shared, do not mutate)"""
+        return self._entry(locale, file)['data']
+
+    def get(self, locale: str, key: str, file: str = 'common.json') -> Optional[Any]:
+        """O(1) lookup of a dotted key"""
+        return self._entry(locale, file)['index'].get(key)
+
+    def version(self, locale: str, file: str = 'common.json') -> str:
+        """Content hash of a catalog file (changes whenever it is edited)"""
+        return self._entry(locale, file)['hash']
+
+    def get_many(self, keys: Iterable[str], locales: Iterable[str],
+                 file: str = 'common.json') -> Dict[str, Dict[str, Optional[Any]]]:
+        """Look up many keys across many locales: {locale: {key: value}}"""
+        keys = list(keys)
+        result = {}
+        for locale in locales:
+            index = self._entry(locale, file)['index']
+            result[locale] = {key: index.get(key) for key in keys}
+        return result
+
+    def clear(self):
+        """Drop every cached file"""
+        with self._lock:
+            self._entries.clear()
+
+# Shared catalog used by the helpers below and the step modules
+catalog = TranslationCatalog()
 
 def load_locale_data(locale: str, file: str = 'common.json') -> Dict:
-    """Load translation data for a specific locale"""
-    filepath = Path(f'locales/{locale}/{file}')
-    if not filepath.exists():
-        raise FileNotFoundError(f"Translation file not found: {filepath}")
-    
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    """Load translation data for a specific locale (cached)"""
+    return catalog.load(locale, file)
 
 def get_translation(locale: str, key: str) -> Optional[str]:
     """Get translation for a specific key"""
-    data = load_locale_data(locale)
-    keys = key.split('.')
-    
-    for k in keys:
-        if isinstance(data, dict):
-            data = data.get(k)
-        else:
-            return None
-    
-    return data
+    return catalog.get(locale, key)
+
+def get_translations(keys: Iterable[str], locales: Iterable[str]) -> Dict[str, Dict[str, Optional[str]]]:
+    """Get several translation keys for several locales in one call"""
+    return catalog.get_many(keys, locales)
 
 def get_env(key: str, default: str = '') -> str:
     """Get environment variable"""
@@ -39,25 +118,16 @@ def is_rtl_locale(locale: str) -> bool:
     return locale in rtl_locales
 
 def get_expected_date_format(locale: str) -> str:
-    """Get expected date format for locale"""
-    formats = {
-        'en-US': 'MM/DD/YYYY',
-        'es-ES': 'DD/MM/YYYY',
-        'fr-FR': 'DD/MM/YYYY',
-        'de-DE': 'DD.MM.YYYY',
-        'ja-JP': 'YYYY/MM/DD',
-        'ar-SA': 'DD/MM/YYYY'
-    }
-    return formats.get(locale, 'MM/DD/YYYY')
+    """Get expected date format for locale (from the catalog)"""
+    from utils.message_format import date_pattern
+    return date_pattern(locale)
 
 def get_expected_currency_symbol(locale: str) -> str:
     """Get expected currency symbol for locale"""
-    symbols = {
-        'en-US': '$',
-        'es-ES': '€',
-        'fr-FR': '€',
-        'de-DE': '€',
-        'ja-JP': '¥',
-        'ar-SA': 'ر.س'
-    }
-    return symbols.get(locale, '$')
+    from utils.message_format import currency_symbol
+    return currency_symbol(locale)
+
+def get_expected_text(locale: str, key: str, **params) -> Optional[str]:
+    """Rendered text of a catalog message, with plurals and numbers formatted for the locale"""
+    from utils.message_format import format_message
+    return format_message(locale, key, **params)
@@ -0,0 +1,89 @@
+"""
+Tracing Policy
+Decides which scenarios pay for Playwright tracing and which traces are kept
+
+Modes (TRACE_MODE):
+    off                - never trace
+    on                 - trace every scenario and keep every trace
+    retain-on-failure  - trace every scenario, keep traces of failures only
+    sampled            - trace TRACE_SAMPLE_PERCENT of scenarios and keep them
+    on-first-retry     - trace only the first retry of a failed scenario
+
+Traces are recorded as chunks (tracing.start_chunk/stop_chunk) so a context
+that is reused across scenarios only starts the tracing session once.
+"""
+import os
+import weakref
+import zlib
+from typing import Optional
+
+TRACE_MODES = ('off', 'on', 'retain-on-failure', 'sampled', 'on-first-retry')
+
+class TracingPolicy:
+    def __init__(self, mode: str = 'retain-on-failure', sample_percent: float = 10.0,
+                 screenshots: bool = True, snapshots: bool = True):
+        if mode not in TRACE_MODES:
+            raise ValueError(f"Unknown TRACE_MODE '{mode}', expected one of {', '.join(TRACE_MODES)}")
+        self.mode = mode
+        self.sample_percent = sample_percent
+        self.screenshots = screenshots
+        self.snapshots = snapshots
+        self._started = weakref.WeakSet()
+        self._recording = weakref.WeakSet()
+
+    @classmethod
+    def from_env(cls) -> 'TracingPolicy':
+        """Build the policy from TRACE_MODE (falls back to TRACE_ON_FAILURE)"""
+        mode = os.getenv('TRACE_MODE')
+        if not mode:
+            trace_on_failure = os.getenv('TRACE_ON_FAILURE', 'true').lower() == 'true'
+            mode = 'retain-on-failure' if trace_on_failure else 'off'
+        return cls(
+            mode=mode.lower(),
+            sample_percent=float(os.getenv('TRACE_SAMPLE_PERCENT', '10')),
+            screenshots=os.getenv('TRACE_SCREENSHOTS', 'true').lower() == 'true',
+            snapshots=os.getenv('TRACE_SNAPSHOTS', 'true').lower() == 'true',
+        )
+
+    def should_trace(self, scenario_id: str, attempt: int = 0) -> bool:
+        """Whether a scenario (attempt 0 = first run) should be recorded"""
+        if self.mode == 'off':
+            return False
+        if self.mode == 'on-first-retry':
+            return attempt == 1
+        if self.mode == 'sampled':
+            # Deterministic per scenario, so the same scenarios are sampled every run
+            bucket = zlib.crc32(scenario_id.encode('utf-8')) % 10000
+            return bucket < self.sample_percent * 100
+        return True
+
+    def should_keep(self, failed: bool) -> bool:
+        """Whether a recorded trace is written to disk"""
+        if self.mode in ('on', 'sampled'):
+            return True
+        return failed
+
+    def start(self, browser_context, title: str = None):
+        """Start recording a chunk on a context"""
+        if browser_context not in self._started:
+            browser_context.tracing.start(screenshots=self.screenshots, snapshots=self.snapshots)
+            self._started.add(browser_context)
+        browser_context.tracing.start_chunk(title=title)
+        self._recording.add(browser_context)
+
+    def stop(self, browser_context, failed: bool, path: str) -> Optional[str]:
+        """Finish the current chunk; returns the trace path if it was kept"""
+        if browser_context not in self._recording:
+            return None
+        self._recording.discard(browser_context)
+        if self.should_keep(failed):
+            browser_context.tracing.stop_chunk(path=path)
+            return path
+        browser_context.tracing.stop_chunk()
+        return None
+
+    def discard(self, browser_context):
+        """Drop the current chunk without saving (context is being replaced)"""
+        if browser_context in self._recording:
+            self._recording.discard(browser_context)
+            browser_context.tracing.stop_chunk()
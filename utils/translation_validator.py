@@ -1,12 +1,34 @@
 """
 Translation Key Validator
-Ensures all locales have consistent translation keys
+Ensures all locales have consistent translation keys, placeholders and
+plural forms across every namespace file
+
+Usage:
+    python utils/translation_validator.py
+    python utils/translation_validator.py --base en-US --workers 8
+    python utils/translation_validator.py --report reports/translations.json --no-cache
 """
+import argparse
+import hashlib
 import json
 import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Set
 
+sys.path.append('.')
+
+from utils.message_format import plural_categories
+
+CACHE_FILE = Path('.cache/translation_validator.json')
+CACHE_VERSION = 1
+DEFAULT_REPORT = Path('reports/translation_validation.json')
+PLACEHOLDER_PATTERN = re.compile(r'\{\{\s*(\w+)\s*\}\}')
+PLURAL_FORMS = {'zero', 'one', 'two', 'few', 'many', 'other'}
+
 def load_translation(filepath: Path) -> Dict:
     """Load translation JSON file"""
     with open(filepath, 'r', encoding='utf-8') as f:
@@ -23,53 +45,227 @@ def flatten_keys(data: Dict, parent_key: str = '', sep: str = '.') -> Set[str]:
             keys.add(new_key)
     return keys
 
+def find_plural_groups(data: Dict, parent_key: str = '', sep: str = '.') -> Dict[str, List[str]]:
+    """Find sections whose keys are all CLDR plural categories, e.g. items.zero/one/other"""
+    groups = {}
+    for k, v in data.items():
+        if not isinstance(v, dict):
+            continue
+        new_key = f"{parent_key}{sep}{k}" if parent_key else k
+        if v and set(v) <= PLURAL_FORMS:
+            groups[new_key] = sorted(v)
+        else:
+            groups.update(find_plural_groups(v, new_key, sep=sep))
+    return groups
+
+def find_placeholders(data: Dict, parent_key: str = '', sep: str = '.') -> Dict[str, List[str]]:
+    """Map each string key to the sorted {{placeholder}} names it uses"""
+    placeholders = {}
+    for k, v in data.items():
+        new_key = f"{parent_key}{sep}{k}" if parent_key else k
+        if isinstance(v, dict):
+            placeholders.update(find_placeholders(v, new_key, sep=sep))
+        elif isinstance(v, str):
+            names = PLACEHOLDER_PATTERN.findall(v)
+            if names:
+                placeholders[new_key] = sorted(set(names))
+    return placeholders
+
+def analyze_file(filepath: str) -> Dict:
+    """Parse one namespace file into the facts the validator compares"""
+    data = load_translation(Path(filepath))
+    return {
+        'keys': sorted(flatten_keys(data)),
+        'placeholders': find_placeholders(data),
+        'plurals': find_plural_groups(data),
+    }
+
+def file_hash(filepath: Path) -> str:
+    """Content hash used as the analysis cache key"""
+    return hashlib.sha256(filepath.read_bytes()).hexdigest()
+
+def load_cache(cache_file: Path = CACHE_FILE) -> Dict:
+    """Load cached analyses keyed by content hash"""
+    try:
+        cache = json.loads(cache_file.read_text(encoding='utf-8'))
+    except (FileNotFoundError, ValueError):
+        return {}
+    if cache.get('version') != CACHE_VERSION:
+        return {}
+    return cache.get('files', {})
+
+def save_cache(entries: Dict, cache_file: Path = CACHE_FILE):
+    """Persist analyses keyed by content hash"""
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    cache_file.write_text(json.dumps({'version': CACHE_VERSION, 'files': entries}), encoding='utf-8')
+
+def discover_namespaces(locales_dir: Path) -> Dict[str, List[str]]:
+    """Map each locale to its namespace files (paths relative to the locale dir)"""
+    namespaces = {}
+    for locale_dir in sorted(locales_dir.iterdir()):
+        if locale_dir.is_dir():
+            namespaces[locale_dir.name] = sorted(
+                path.relative_to(locale_dir).as_posix() for path in locale_dir.rglob('*.json')
+            )
+    return namespaces
+
+def analyze_all(files: List[Path], workers: int, use_cache: bool) -> Dict:
+    """
+    Analyze every file, skipping those whose content hash is cached.
+    Returns {'analyses': {path: analysis}, 'parsed': n, 'cached': n}
+    """
+    cache = load_cache() if use_cache else {}
+    hashes = {path: file_hash(path) for path in files}
+    todo = sorted({str(path) for path, digest in hashes.items() if digest not in cache})
+
+    if len(todo) > 1 and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            fresh = dict(zip(todo, pool.map(analyze_file, todo, chunksize=8)))
+    else:
+        fresh = {path: analyze_file(path) for path in todo}
+
+    analyses = {}
+    for path, digest in hashes.items():
+        if str(path) in fresh:
+            cache[digest] = fresh[str(path)]
+        analyses[str(path)] = cache[digest]
+
+    if use_cache:
+        live_hashes = set(hashes.values())
+        save_cache({digest: a for digest, a in cache.items() if digest in live_hashes})
+
+    return {'analyses': analyses, 'parsed': len(todo), 'cached': len(files) - len(todo)}
+
+def compare_namespace(base: Dict, other: Dict, locale: str) -> Dict:
+    """Compare one locale's namespace analysis against the base locale"""
+    base_plurals, other_plurals = base['plurals'], other['plurals']
+    plural_keys = {f"{group}.{form}" for plurals in (base_plurals, other_plurals)
+                   for group, forms in plurals.items() for form in forms}
+    base_keys = set(base['keys']) - plural_keys
+    other_keys = set(other['keys']) - plural_keys
+
+    result = {
+        'missing_keys': sorted(base_keys - other_keys),
+        'extra_keys': sorted(other_keys - base_keys),
+        'placeholder_mismatches': {},
+        'plural_mismatches': {},
+    }
+
+    other_placeholders = other['placeholders']
+    for key in sorted(set(base['keys']) & set(other['keys'])):
+        expected = base['placeholders'].get(key, [])
+        actual = other_placeholders.get(key, [])
+        if expected != actual:
+            result['placeholder_mismatches'][key] = {'expected': expected, 'actual': actual}
+
+    # Each plural group needs every CLDR category of its own locale (ja only
+    # 'other', ar all six); an explicit 'zero' is optional where CLDR has none
+    expected = sorted(plural_categories(locale))
+    for group in base_plurals:
+        actual = other_plurals.get(group, [])
+        missing = sorted(set(expected) - set(actual))
+        if missing:
+            result['plural_mismatches'][group] = {'expected': expected, 'actual': actual, 'missing': missing}
+
+    return result
+
+def validate_translations(base_locale: str = 'en-US', locales_dir: str = 'locales',
+                          workers: int = None, use_cache: bool = True) -> Dict:
+    """
+    Validate every locale namespace against the base locale
+    Returns a machine-readable report
+    """
+    start = time.time()
+    locales_dir = Path(locales_dir)
+    report = {'base_locale': base_locale, 'errors': [], 'locales': {}}
+
+    namespaces = discover_namespaces(locales_dir) if locales_dir.is_dir() else {}
+    base_namespaces = namespaces.get(base_locale, [])
+    if not base_namespaces:
+        report['errors'].append(f"Base locale file not found: {locales_dir / base_locale / 'common.json'}")
+        return report
+
+    files = [locales_dir / locale / ns for locale, names in namespaces.items() for ns in names]
+    result = analyze_all(files, workers or os.cpu_count() or 1, use_cache)
+    analyses = result['analyses']
+
+    for locale, names in namespaces.items():
+        if locale == base_locale:
+            continue
+        locale_report = report['locales'][locale] = {}
+
+        for namespace in base_namespaces:
+            locale_file = locales_dir / locale / namespace
+            if namespace not in names:
+                report['errors'].append(f"Missing translation file: {locale_file}")
+                continue
+
+            base_analysis = analyses[str(locales_dir / base_locale / namespace)]
+            comparison = compare_namespace(base_analysis, analyses[str(locale_file)], locale)
+            locale_report[namespace] = comparison
+
+            label = locale if namespace == 'common.json' else f"{locale}/{namespace}"
+            if comparison['missing_keys']:
+                report['errors'].append(f"{label} missing keys: {comparison['missing_keys']}")
+            if comparison['extra_keys']:
+                report['errors'].append(f"{label} extra keys: {comparison['extra_keys']}")
+            for key, mismatch in comparison['placeholder_mismatches'].items():
+                report['errors'].append(
+                    f"{label} placeholder mismatch in '{key}': "
+                    f"expected {mismatch['expected']}, got {mismatch['actual']}"
+                )
+            for group, mismatch in comparison['plural_mismatches'].items():
+                report['errors'].append(f"{label} plural forms missing in '{group}': {mismatch['missing']}")
+
+        for namespace in sorted(set(names) - set(base_namespaces)):
+            report['errors'].append(f"Extra translation file: {locales_dir / locale / namespace}")
+
+    report['summary'] = {
+        'locales': len(namespaces),
+        'files': len(files),
+        'parsed': result['parsed'],
+        'cached': result['cached'],
+        'errors': len(report['errors']),
+        'duration_seconds': round(time.time() - start, 3),
+    }
+    return report
+
 def validate_translation_keys(base_locale: str = 'en-US') -> List[str]:
     """
     Validate all locales have same keys as base locale
     Returns list of errors
     """
-    locales_dir = Path('locales')
-    base_file = locales_dir / base_locale / 'common.json'
-    
-    if not base_file.exists():
-        return [f"Base locale file not found: {base_file}"]
-    
-    base_data = load_translation(base_file)
-    base_keys = flatten_keys(base_data)
-    
-    errors = []
-    
-    for locale_dir in locales_dir.iterdir():
-        if not locale_dir.is_dir() or locale_dir.name == base_locale:
-            continue
-        
-        locale_file = locale_dir / 'common.json'
-        if not locale_file.exists():
-            errors.append(f"Missing translation file: {locale_file}")
-            continue
-        
-        locale_data = load_translation(locale_file)
-        locale_keys = flatten_keys(locale_data)
-        
-        # Find missing and extra keys
-        missing = base_keys - locale_keys
-        extra = locale_keys - base_keys
-        
-        if missing:
-            errors.append(f"{locale_dir.name} missing keys: {sorted(missing)}")
-        
-        if extra:
-            errors.append(f"{locale_dir.name} extra keys: {sorted(extra)}")
-    
-    return errors
+    return validate_translations(base_locale)['errors']
 
-if __name__ == '__main__':
-    errors = validate_translation_keys()
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Validate translation catalogs')
+    parser.add_argument('--base', default='en-US', help='Base locale (default: en-US)')
+    parser.add_argument('--locales-dir', default='locales', help='Locales directory')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--report', default=str(DEFAULT_REPORT), help='JSON report path')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore the content-hash cache')
+    args = parser.parse_args(argv)
+
+    report = validate_translations(args.base, args.locales_dir, args.workers, not args.no_cache)
+
+    report_path = Path(args.report)
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    report_path.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding='utf-8')
+
+    errors = report['errors']
     if errors:
         print("❌ Translation validation failed:")
         for error in errors:
             print(f"  - {error}")
-        exit(1)
     else:
         print("✅ All translations are valid!")
-        exit(0)
+
+    summary = report.get('summary')
+    if summary:
+        print(f"📊 {summary['files']} files in {summary['locales']} locales "
+              f"({summary['parsed']} parsed, {summary['cached']} cached) "
+              f"in {summary['duration_seconds']}s - report: {report_path}")
+    return 1 if errors else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
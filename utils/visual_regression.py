@@ -0,0 +1,273 @@
+"""
+Visual Regression
+Baseline store and NumPy diff engine for localized screenshots
+
+Images are compared as arrays: per-channel differences within `tolerance`
+are ignored, ignore regions are masked out, and a diff image is written only
+when the mismatch ratio is above `max_diff_ratio`. Byte-identical images
+exit before the pixel diff. A missing baseline is skipped with a warning
+(VISUAL_STRICT=true fails it, VISUAL_UPDATE=true creates it). Steps compare
+inline; deferred checks and directory batches go to a process pool.
+
+Usage:
+    python utils/visual_regression.py reports/visual/actual/chromium
+    python utils/visual_regression.py reports/visual/actual/chromium --update
+    python utils/visual_regression.py reports/visual/actual/chromium --strict
+"""
+import argparse
+import json
+import os
+import re
+import shutil
+import sys
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image
+
+BASELINE_DIR = Path('visual-baselines')
+OUTPUT_DIR = Path('reports/visual')
+DEFAULT_REPORT = OUTPUT_DIR / 'visual_regression.json'
+
+# (x, y, width, height) in device pixels, i.e. pixels of the screenshot image
+Region = Tuple[int, int, int, int]
+
+def slugify(value: str) -> str:
+    """File-safe name component"""
+    return re.sub(r'[^A-Za-z0-9._-]+', '_', value).strip('_')
+
+def load_rgb(path: Path) -> np.ndarray:
+    """Decode an image as an (h, w, 3) uint8 array"""
+    with Image.open(path) as image:
+        return np.asarray(image.convert('RGB'))
+
+def build_mask(shape: Tuple[int, int], regions: Iterable[Region]) -> np.ndarray:
+    """Boolean mask of pixels that take part in the comparison"""
+    mask = np.ones(shape, dtype=bool)
+    for x, y, width, height in regions:
+        x0, y0 = max(int(x), 0), max(int(y), 0)
+        mask[y0:max(int(y + height), y0), x0:max(int(x + width), x0)] = False
+    return mask
+
+def write_diff_image(baseline: np.ndarray, changed: np.ndarray, path: Path):
+    """Dimmed baseline with changed pixels painted red"""
+    diff = (baseline // 3 + 170).astype(np.uint8)
+    diff[changed] = (255, 0, 0)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    Image.fromarray(diff).save(path)
+
+def compare_images(actual_path: str, baseline_path: str, diff_path: str = None,
+                   tolerance: int = 0, max_diff_ratio: float = 0.0,
+                   ignore_regions: Sequence[Region] = ()) -> Dict:
+    """
+    Compare two screenshots and return a result dict.
+    Also runs in worker processes, so it only takes and returns plain data.
+    """
+    result = {
+        'actual': str(actual_path),
+        'baseline': str(baseline_path),
+        'diff': None,
+        'passed': False,
+        'diff_ratio': 0.0,
+        'diff_pixels': 0,
+        'reason': None,
+    }
+    actual = load_rgb(Path(actual_path))
+    baseline = load_rgb(Path(baseline_path))
+
+    if actual.shape != baseline.shape:
+        result.update(reason=f"size {actual.shape[1]}x{actual.shape[0]} != "
+                             f"baseline {baseline.shape[1]}x{baseline.shape[0]}", diff_ratio=1.0)
+        return result
+
+    # Early exit: identical pixels pass whatever the tolerance and masks
+    if np.array_equal(actual, baseline):
+        result['passed'] = True
+        return result
+
+    mask = build_mask(actual.shape[:2], ignore_regions)
+    delta = np.abs(actual.astype(np.int16) - baseline.astype(np.int16)).max(axis=2)
+    changed = (delta > tolerance) & mask
+    diff_pixels = int(np.count_nonzero(changed))
+    compared = int(np.count_nonzero(mask)) or 1
+    ratio = diff_pixels / compared
+
+    result.update(diff_pixels=diff_pixels, diff_ratio=round(ratio, 6), passed=ratio <= max_diff_ratio)
+    if not result['passed']:
+        result['reason'] = f"{diff_pixels} pixels differ ({ratio:.3%})"
+        if diff_path:
+            write_diff_image(baseline, changed, Path(diff_path))
+            result['diff'] = str(diff_path)
+    return result
+
+class BaselineStore:
+    """Baselines at <root>/<browser>/<name>.png"""
+
+    def __init__(self, root: Path = BASELINE_DIR, browser: str = 'chromium'):
+        self.root = Path(root)
+        self.browser = browser
+
+    def path(self, name: str) -> Path:
+        return self.root / self.browser / f"{name}.png"
+
+    def exists(self, name: str) -> bool:
+        return self.path(name).exists()
+
+    def save(self, name: str, image_path: Path) -> Path:
+        target = self.path(name)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(image_path, target)
+        return target
+
+    def names(self) -> List[str]:
+        base = self.root / self.browser
+        return sorted(p.relative_to(base).with_suffix('').as_posix() for p in base.rglob('*.png'))
+
+class VisualRegression:
+    """
+    Run-wide comparison service used by the behave steps.
+    check() compares inline; in deferred mode comparisons go to a process pool,
+    steps do not wait and results are collected in finish().
+    """
+
+    def __init__(self, store: BaselineStore, output_dir: Path = OUTPUT_DIR,
+                 tolerance: int = 0, max_diff_ratio: float = 0.0,
+                 update: bool = False, deferred: bool = False, workers: int = None,
+                 strict: bool = False):
+        self.store = store
+        self.output_dir = Path(output_dir)
+        self.tolerance = tolerance
+        self.max_diff_ratio = max_diff_ratio
+        self.update = update
+        self.deferred = deferred
+        self.strict = strict
+        self.workers = workers
+        self._pool = None
+        self._pending: List[Tuple[str, Future]] = []
+        self.results: Dict[str, Dict] = {}
+
+    @classmethod
+    def from_env(cls) -> 'VisualRegression':
+        return cls(
+            BaselineStore(os.getenv('VISUAL_BASELINE_DIR', str(BASELINE_DIR)), os.getenv('BROWSER', 'chromium')),
+            tolerance=int(os.getenv('VISUAL_TOLERANCE', '0')),
+            max_diff_ratio=float(os.getenv('VISUAL_MAX_DIFF_RATIO', '0')),
+            update=(os.getenv('VISUAL_UPDATE') or os.getenv('UPDATE_BASELINES', 'false')).lower() == 'true',
+            deferred=os.getenv('VISUAL_DEFERRED', 'false').lower() == 'true',
+            strict=os.getenv('VISUAL_STRICT', 'false').lower() == 'true',
+        )
+
+    @staticmethod
+    def snapshot_name(scenario_name: str, locale: str, viewport: Optional[Dict]) -> str:
+        """<scenario>/<locale>-<width>x<height>"""
+        size = f"{viewport['width']}x{viewport['height']}" if viewport else 'default'
+        return f"{slugify(scenario_name)}/{slugify(locale)}-{size}"
+
+    def actual_path(self, name: str) -> Path:
+        path = self.output_dir / 'actual' / self.store.browser / f"{name}.png"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def _known_result(self, name: str, actual: Path) -> Optional[Dict]:
+        """
+        Result that needs no comparison: with update on the screenshot becomes
+        the baseline; a missing baseline is skipped, or fails in strict mode
+        """
+        if self.update:
+            self.store.save(name, actual)
+            self.results[name] = {'actual': str(actual), 'baseline': str(self.store.path(name)),
+                                  'diff': None, 'passed': True, 'reason': 'baseline updated'}
+            return self.results[name]
+        if not self.store.exists(name):
+            self.results[name] = {'actual': str(actual), 'baseline': str(self.store.path(name)),
+                                  'diff': None, 'passed': not self.strict, 'missing': True,
+                                  'reason': 'missing baseline (run with VISUAL_UPDATE=true to create it)'}
+            return self.results[name]
+        return None
+
+    def _compare_args(self, name: str, actual: Path, ignore_regions: Sequence[Region]) -> Tuple:
+        return (str(actual), str(self.store.path(name)),
+                str(self.output_dir / 'diff' / self.store.browser / f"{name}.png"),
+                self.tolerance, self.max_diff_ratio, list(ignore_regions))
+
+    def submit(self, name: str, actual: Path, ignore_regions: Sequence[Region] = ()) -> Optional[Future]:
+        """Queue a comparison in the process pool; None when the result is already known"""
+        if self._known_result(name, actual) is not None:
+            return None
+        future = self._executor().submit(compare_images, *self._compare_args(name, actual, ignore_regions))
+        self._pending.append((name, future))
+        return future
+
+    def check(self, name: str, actual: Path, ignore_regions: Sequence[Region] = ()) -> Optional[Dict]:
+        """Compare now in this process, or only queue the comparison in deferred mode"""
+        if self.deferred:
+            return None if self.submit(name, actual, ignore_regions) else self.results[name]
+        known = self._known_result(name, actual)
+        if known is not None:
+            return known
+        self.results[name] = compare_images(*self._compare_args(name, actual, ignore_regions))
+        return self.results[name]
+
+    def finish(self, report: Path = DEFAULT_REPORT) -> Dict:
+        """Wait for queued comparisons, write the JSON report and shut the pool down"""
+        for name, future in self._pending:
+            self.results[name] = future.result()
+        self._pending = []
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+        failed = sorted(name for name, result in self.results.items() if not result['passed'])
+        missing = sorted(name for name, result in self.results.items() if result.get('missing'))
+        summary = {'compared': len(self.results), 'failed': failed, 'missing': missing,
+                   'results': self.results}
+        if self.results:
+            report.parent.mkdir(parents=True, exist_ok=True)
+            report.write_text(json.dumps(summary, indent=2), encoding='utf-8')
+        return summary
+
+def compare_directory(actual_dir: Path, store: BaselineStore, output_dir: Path = OUTPUT_DIR,
+                      tolerance: int = 0, max_diff_ratio: float = 0.0,
+                      workers: int = None, update: bool = False, strict: bool = False) -> Dict:
+    """Compare every PNG under actual_dir with its baseline in a process pool"""
+    visual = VisualRegression(store, output_dir, tolerance, max_diff_ratio, update=update,
+                              deferred=True, workers=workers, strict=strict)
+    for actual in sorted(Path(actual_dir).rglob('*.png')):
+        visual.submit(actual.relative_to(actual_dir).with_suffix('').as_posix(), actual)
+    return visual.finish()
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Compare screenshots with visual baselines')
+    parser.add_argument('actual_dir', help='Directory of screenshots named like their baselines')
+    parser.add_argument('--baselines', default=str(BASELINE_DIR), help='Baseline root directory')
+    parser.add_argument('--browser', default=os.getenv('BROWSER', 'chromium'))
+    parser.add_argument('--tolerance', type=int, default=0, help='Per-channel difference to ignore (0-255)')
+    parser.add_argument('--max-diff-ratio', type=float, default=0.0, help='Allowed share of differing pixels')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--update', action='store_true', help='Overwrite baselines with the screenshots')
+    parser.add_argument('--strict', action='store_true', help='Fail screenshots that have no baseline')
+    args = parser.parse_args(argv)
+
+    summary = compare_directory(
+        Path(args.actual_dir), BaselineStore(args.baselines, args.browser),
+        tolerance=args.tolerance, max_diff_ratio=args.max_diff_ratio,
+        workers=args.workers, update=args.update, strict=args.strict
+    )
+    for name in summary['missing']:
+        if name not in summary['failed']:
+            print(f"⚠️  {name}: no baseline, skipped")
+    for name in summary['failed']:
+        result = summary['results'][name]
+        print(f"❌ {name}: {result['reason']} (diff: {result['diff']})")
+    print(f"📊 {summary['compared']} compared, {len(summary['failed'])} mismatches")
+    return 1 if summary['failed'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())